@@ -0,0 +1,192 @@
+#! /usr/bin/env python3
+"""Benchmark build arguments matrix ordering with a synthetic 6 dimensions matrix.
+
+run "python benchmarks/args_matrix.py --help" for help.
+"""
+from collections import OrderedDict
+from itertools import product
+from os.path import abspath, dirname
+from sys import path
+from timeit import repeat as _repeat
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+from compilertools.compilers import CompilerBase  # noqa: E402
+from compilertools.compilers._core import (  # noqa: E402
+    _order_args_matrix,
+    clear_compile_args_cache,
+)
+
+#: Synthetic matrix dimensions: (name, values count)
+DIMENSIONS = (
+    ("opt", 3),
+    ("isa", 12),
+    ("width", 3),
+    ("tune", 4),
+    ("profile", 3),
+    ("abi", 2),
+)
+
+
+class Compiler(CompilerBase):
+    """Synthetic compiler
+
+    Parameters
+    ----------
+    incompatible : int
+        Number of values of each dimension that are not compatible with the
+        current machine."""
+
+    def __init__(self, incompatible=1):
+        CompilerBase.__init__(self)
+        self["incompatible"] = incompatible
+
+    def _compile_args_matrix(self, arch, cpu):
+        """Returns the synthetic matrix.
+
+        Parameters
+        ----------
+        arch : str
+            CPU Architecture.
+        cpu : compilertools.processors.ProcessorBase subclass
+            Processor instance
+
+        Returns
+        -------
+        list of CompilerBase.Arg
+            Arguments matrix."""
+        incompatible = self["incompatible"]
+        return [
+            [
+                self.Arg(
+                    args=[f"-f{name}={index}", f"-m{name}-{index}"],
+                    suffix=f"{name}{index}",
+                    import_if=index >= incompatible,
+                )
+                for index in range(count)
+            ]
+            + [self.Arg()]
+            for name, count in DIMENSIONS
+        ]
+
+
+def legacy_order_args_matrix(
+    args_matrix, current_machine=False, current_compiler=False
+):
+    """Converts args matrix to args ordered dict like compilertools 1.1 did: Each
+    combination of the full cartesian product is evaluated.
+
+    Parameters
+    ----------
+    args_matrix : list of CompilerBase.Arg
+        Arguments matrix.
+    current_machine : bool
+        If True, return only arguments compatibles with current machine.
+    current_compiler : bool
+        If True, return only arguments compatibles with current compiler.
+
+    Returns
+    -------
+    collections.OrderedDict with keys and values as str
+        Arguments matrix. Keys are suffixes, values are compiler arguments.
+    """
+    args_combinations = OrderedDict()
+    for args in product(*args_matrix):
+        args_list = []
+        suffix_list = []
+        is_compatible = True
+        for arg in args:
+            if current_machine:
+                is_compatible = not (not arg.import_if or not is_compatible)
+
+            if current_compiler:
+                is_compatible = not (not arg.build_if or not is_compatible)
+
+            if not is_compatible:
+                break
+
+            arg_arg = arg.args
+            if arg_arg:
+                if isinstance(arg_arg, str):
+                    args_list.append(arg_arg)
+                else:
+                    args_list.extend(arg_arg)
+
+            arg_suffix = arg.suffix
+            if arg_suffix:
+                suffix_list.append(arg_suffix.replace(".", "_").replace("-", "_"))
+
+        if is_compatible:
+            args_combinations["-".join(suffix_list)] = args_list
+
+    return args_combinations
+
+
+def best_time(function, number):
+    """Returns the best time of a function.
+
+    Parameters
+    ----------
+    function : callable
+        Function.
+    number : int
+        Number of calls by run.
+
+    Returns
+    -------
+    float
+        Time in milliseconds."""
+    return min(_repeat(function, number=number, repeat=5)) / number * 1e3
+
+
+def main(number=5, incompatible=1):
+    """Prints the benchmark result.
+
+    Parameters
+    ----------
+    number : int
+        Number of calls by run.
+    incompatible : int
+        Number of values of each dimension that are not compatible with the
+        current machine.
+    """
+    compiler = Compiler(incompatible)
+    matrix = compiler._compile_args_matrix(None, None)
+    size = 1
+    for args in matrix:
+        size *= len(args)
+
+    legacy = legacy_order_args_matrix(matrix, current_machine=True)
+    assert _order_args_matrix(matrix, current_machine=True) == legacy
+
+    legacy_time = best_time(
+        lambda: legacy_order_args_matrix(matrix, current_machine=True), number
+    )
+    pruned_time = best_time(
+        lambda: _order_args_matrix(matrix, current_machine=True), number
+    )
+    clear_compile_args_cache()
+    compiler.compile_args(current_machine=True)
+    memoized_time = best_time(
+        lambda: compiler.compile_args(current_machine=True), number
+    )
+
+    print(f"{len(matrix)} dimensions, {size} combinations, {len(legacy)} compatibles")
+    print(f"Cartesian product:        {legacy_time:>10.3f} ms")
+    print(f"Pruned prefixes:          {pruned_time:>10.3f} ms")
+    print(f"Memoized (compile_args):  {memoized_time:>10.3f} ms")
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=5, help="Calls by run")
+    parser.add_argument(
+        "--incompatible",
+        type=int,
+        default=1,
+        help="Incompatible values by dimension",
+    )
+    arguments = parser.parse_args()
+    main(arguments.number, arguments.incompatible)
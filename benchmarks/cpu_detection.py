@@ -0,0 +1,156 @@
+#! /usr/bin/env python3
+"""Benchmark current machine CPU detection time.
+
+run "python benchmarks/cpu_detection.py --help" for help.
+"""
+from os.path import abspath, dirname
+from sys import path, platform
+from timeit import repeat as _repeat
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+from compilertools._config import CONFIG  # noqa: E402
+from compilertools.processors import get_processor, x86_32  # noqa: E402
+from compilertools.processors.x86_32 import Cpuid  # noqa: E402
+
+#: CPUID leaves and registers read by a full detection
+DETECTION_REGISTERS = (
+    (0x80000000, 0, ("eax",)),
+    (0, 0, ("ebx", "edx", "ecx")),
+    (1, 0, ("edx", "ecx")),
+    (7, 0, ("ebx", "ecx", "edx")),
+    (0x80000001, 0, ("edx", "ecx")),
+    (0x80000002, 0, ("eax", "ebx", "ecx", "edx")),
+    (0x80000003, 0, ("eax", "ebx", "ecx", "edx")),
+    (0x80000004, 0, ("eax", "ebx", "ecx", "edx")),
+)
+
+
+def legacy_cpuid(eax_value, ecx_value, reg):
+    """Reads a CPUID register like compilertools 1.1 did: A new executable page is
+    allocated, called and freed for each register.
+
+    Parameters
+    ----------
+    eax_value : int
+        EAX register value
+    ecx_value : int
+        ECX register value
+    reg : str
+        Register name.
+
+    Returns
+    -------
+    int
+        Register value."""
+    from ctypes import cdll, c_void_p, c_size_t, c_uint32, c_int, CFUNCTYPE, memmove
+
+    reg_code = {"eax": 0, "ecx": 1, "edx": 2, "ebx": 3}[reg]
+    bytecode = b"".join(
+        (
+            b"\xb8",
+            eax_value.to_bytes(4, "little"),
+            b"\xb9",
+            ecx_value.to_bytes(4, "little"),
+            b"\x53\x0f\xa2",
+            (
+                b"\x89" + (0b11000000 | (reg_code << 3)).to_bytes(1, "little")
+                if reg_code
+                else b""
+            ),
+            b"\x5b\xc3",
+        )
+    )
+    lib = cdll.LoadLibrary(None)
+    valloc = lib.valloc
+    valloc.argtypes = [c_size_t]
+    valloc.restype = c_void_p
+    mprotect = lib.mprotect
+    mprotect.restype = c_int
+    mprotect.argtypes = [c_void_p, c_size_t, c_int]
+    address = valloc(c_size_t(0x1000))
+    try:
+        mprotect(address, 0x1000, 1 | 2 | 4)
+        memmove(address, bytecode, len(bytecode))
+        return CFUNCTYPE(c_uint32)(address)()
+    finally:
+        mprotect(address, 0x1000, 1 | 2)
+        lib.free(c_void_p(address))
+
+
+def legacy_detection():
+    """Reads all detection registers one by one, like compilertools 1.1 did."""
+    for eax_value, ecx_value, regs in DETECTION_REGISTERS:
+        for reg in regs:
+            legacy_cpuid(eax_value, ecx_value, reg)
+
+
+def batched_detection():
+    """Reads all detection registers in a single CPUID function call."""
+    Cpuid.batch(
+        (eax_value, ecx_value) for eax_value, ecx_value, _ in DETECTION_REGISTERS
+    )
+
+
+def detect():
+    """Detects all current machine CPU information like a new process does."""
+    x86_32._linux_cpuinfo.cache_clear()
+    cpu = get_processor(None, current_machine=True)
+    for name in ("vendor", "brand", "features", "os_supports_xsave"):
+        getattr(cpu, name)
+
+
+def detection_time(number=100, repeat=5, function=detect):
+    """Returns the best detection time.
+
+    Parameters
+    ----------
+    number : int
+        Number of detections by run.
+    repeat : int
+        Number of runs.
+    function : callable
+        Detection function.
+
+    Returns
+    -------
+    float
+        Time in milliseconds.
+    """
+    return min(_repeat(function, number=number, repeat=repeat)) / number * 1e3
+
+
+def main(number=100):
+    """Prints the benchmark result.
+
+    Parameters
+    ----------
+    number : int
+        Number of detections by run.
+    """
+    if platform != "win32":
+        legacy = detection_time(number, function=legacy_detection)
+        print(f"CPUID registers, one call per register: {legacy:.3f} ms")
+    batched = detection_time(number, function=batched_detection)
+    print(f"CPUID registers, single batched call:   {batched:.3f} ms")
+    print(f"Detection, JIT CPUID (Not cached):      {detection_time(number):.3f} ms")
+
+    if not platform.startswith("linux"):
+        return
+
+    # Without executable memory: "/dev/cpu/*/cpuid" device or Linux kernel backends
+    x86_32._cpuid_function = lambda: None
+    CONFIG["cache"] = False
+    print(f"Detection, fallback without cache:      {detection_time(number):.3f} ms")
+
+    CONFIG["cache"] = True
+    detect()
+    print(f"Detection, fallback with cache:         {detection_time(number):.3f} ms")
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100, help="Detections by run")
+    main(parser.parse_args().number)
@@ -0,0 +1,145 @@
+#! /usr/bin/env python3
+"""Benchmark import hook file system calls with many "sys.path" entries.
+
+run "python benchmarks/finder_stat_calls.py --help" for help.
+"""
+from os import mkdir, stat
+from os.path import abspath, dirname, join
+from sys import path
+from tempfile import TemporaryDirectory
+from timeit import repeat as _repeat
+
+path.insert(0, dirname(dirname(abspath(__file__))))
+
+import compilertools.imports as imports  # noqa: E402
+from compilertools._config import CONFIG  # noqa: E402
+from compilertools.imports import ARCH_SUFFIXES, _ExtensionFileFinder  # noqa: E402
+
+#: Number of files in each "sys.path" entry
+FILES = 50
+
+
+class Counter:
+    """Counts calls of a function
+
+    Parameters
+    ----------
+    function : callable
+        Function to count calls."""
+
+    def __init__(self, function):
+        self.function = function
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.function(*args, **kwargs)
+
+
+def legacy_find_spec(fullname, paths, isfile):
+    """Finds a module like compilertools 1.1 did: A "stat" call by file to test.
+
+    Parameters
+    ----------
+    fullname : str
+        Module name.
+    paths : list of str
+        "sys.path" entries.
+    isfile : callable
+        "os.path.isfile" function.
+
+    Returns
+    -------
+    str or None
+        Module file path."""
+    file_name = f"{fullname}.compilertools"
+    for sys_path in paths:
+        if isfile(join(sys_path, file_name)):
+            paths = [sys_path]
+            break
+
+    for suffix in ARCH_SUFFIXES:
+        file_name = f"{fullname}{suffix}"
+        for sys_path in paths:
+            file_path = join(sys_path, file_name)
+            if isfile(file_path):
+                return file_path
+    return None
+
+
+def main(paths=40, modules=200):
+    """Prints the benchmark result.
+
+    Parameters
+    ----------
+    paths : int
+        Number of "sys.path" entries.
+    modules : int
+        Number of modules to find.
+    """
+    from os.path import isfile
+
+    imports._init_extensions_suffixes()
+    names = [f"module_{index}" for index in range(modules)]
+
+    with TemporaryDirectory() as tmp:
+        directories = []
+        for index in range(paths):
+            directory = join(tmp, str(index))
+            directories.append(directory)
+            mkdir(directory)
+            for file_index in range(FILES):
+                with open(join(directory, f"file_{file_index}.py"), "wt") as file:
+                    file.write("")
+
+        # Legacy lookup
+        counter = Counter(isfile)
+        for name in names:
+            legacy_find_spec(name, directories, counter)
+        legacy_calls = counter.calls
+        legacy_time = min(
+            _repeat(
+                lambda: [legacy_find_spec(n, directories, isfile) for n in names],
+                number=1,
+                repeat=5,
+            )
+        )
+
+        # Cached directories listings lookup
+        sys_path = path[:]
+        path[:] = directories
+        imports_stat = imports._stat
+        counter = Counter(stat)
+        imports._stat = counter
+        CONFIG["imports_global"] = True
+        finder = _ExtensionFileFinder()
+        try:
+            for name in names:
+                finder.find_spec(name)
+            calls = counter.calls
+            imports._stat = imports_stat
+            cached_time = min(
+                _repeat(
+                    lambda: [finder.find_spec(n) for n in names], number=1, repeat=5
+                )
+            )
+        finally:
+            imports._stat = imports_stat
+            CONFIG["imports_global"] = False
+            path[:] = sys_path
+
+    print(f"{modules} modules, {paths} sys.path entries, {len(ARCH_SUFFIXES)} suffixes")
+    print(f"stat calls, one call per file:       {legacy_calls:>8}")
+    print(f"stat calls, cached directories:      {calls:>8}")
+    print(f"lookup time, one call per file:      {legacy_time * 1e3:>8.3f} ms")
+    print(f"lookup time, cached directories:     {cached_time * 1e3:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=40, help="sys.path entries")
+    parser.add_argument("--modules", type=int, default=200, help="Modules to find")
+    arguments = parser.parse_args()
+    main(arguments.paths, arguments.modules)
@@ -0,0 +1,77 @@
+#! /usr/bin/env python3
+"""Benchmark "import compilertools" cost against the import of an empty module.
+
+run "python benchmarks/import_time.py --help" for help.
+"""
+from os.path import abspath, dirname, join
+from subprocess import run, PIPE
+from sys import executable
+from tempfile import TemporaryDirectory
+
+REPOSITORY_DIR = dirname(dirname(abspath(__file__)))
+
+
+def import_time(module, paths, repeat=20):
+    """Returns the best cumulative import time of a module in a fresh interpreter.
+
+    Parameters
+    ----------
+    module : str
+        Module name.
+    paths : list of str
+        Paths to add to "sys.path".
+    repeat : int
+        Number of interpreters to run.
+
+    Returns
+    -------
+    int
+        Import time in microseconds.
+    """
+    best = None
+    code = f"import sys; sys.path[:0] = {paths!r}; import {module}"
+    for _ in range(repeat):
+        stderr = run(
+            [executable, "-X", "importtime", "-c", code],
+            stdout=PIPE,
+            stderr=PIPE,
+            universal_newlines=True,
+            check=True,
+        ).stderr
+        for line in stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                cumulative = int(fields[1])
+                best = cumulative if best is None else min(best, cumulative)
+    return best
+
+
+def main(repeat=20):
+    """Prints the benchmark result.
+
+    Parameters
+    ----------
+    repeat : int
+        Number of interpreters to run.
+    """
+    with TemporaryDirectory() as tmp:
+        with open(join(tmp, "empty_module.py"), "wt") as file:
+            file.write('"""Empty module"""\n')
+
+        # Warm-up bytecode caches
+        import_time("compilertools", [REPOSITORY_DIR], 1)
+        import_time("empty_module", [tmp], 1)
+
+        empty = import_time("empty_module", [tmp], repeat)
+        compilertools = import_time("compilertools", [REPOSITORY_DIR], repeat)
+
+    print(f"import empty_module:  {empty:>8} us")
+    print(f"import compilertools: {compilertools:>8} us")
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="Interpreters to run")
+    main(parser.parse_args().repeat)
@@ -0,0 +1,123 @@
+#! /usr/bin/env python3
+"""Benchmark import hook time on imports of many packages without variants.
+
+run "python benchmarks/registered_imports.py --help" for help.
+"""
+from os import mkdir
+from os.path import abspath, dirname, join
+from subprocess import run, PIPE
+from sys import executable
+from tempfile import TemporaryDirectory
+
+REPOSITORY_DIR = dirname(dirname(abspath(__file__)))
+
+#: Number of "sys.path" entries
+PATHS = 10
+
+#: Import test script, prints time spent in the import hook
+SCRIPT = """
+import sys
+from time import perf_counter
+sys.path[:0] = {paths!r}
+import compilertools
+compilertools._config.CONFIG["imports_global"] = {mode!r} == "global"
+finder = sys.meta_path[0]
+find_spec = finder.find_spec
+spent = 0.0
+
+def timed_find_spec(*args, **kwargs):
+    global spent
+    start = perf_counter()
+    try:
+        return find_spec(*args, **kwargs)
+    finally:
+        spent += perf_counter() - start
+
+finder.find_spec = timed_find_spec
+for index in range({packages}):
+    __import__(f"package_{{index}}.module")
+print(spent, end="")
+"""
+
+
+def hook_time(paths, packages, mode, repeat=10):
+    """Returns the best time spent in the import hook to import all packages in a
+    fresh interpreter.
+
+    Parameters
+    ----------
+    paths : list of str
+        Paths to add to "sys.path".
+    packages : int
+        Number of packages.
+    mode : str
+        "global" or "registered".
+    repeat : int
+        Number of interpreters to run.
+
+    Returns
+    -------
+    float
+        Time in milliseconds.
+    """
+    code = SCRIPT.format(paths=paths, packages=packages, mode=mode)
+    return (
+        min(
+            float(
+                run(
+                    [executable, "-c", code],
+                    stdout=PIPE,
+                    universal_newlines=True,
+                    check=True,
+                ).stdout
+            )
+            for _ in range(repeat)
+        )
+        * 1e3
+    )
+
+
+def main(packages=300, repeat=10):
+    """Prints the benchmark result.
+
+    Parameters
+    ----------
+    packages : int
+        Number of installed packages.
+    repeat : int
+        Number of interpreters to run.
+    """
+    with TemporaryDirectory() as tmp:
+        paths = [join(tmp, str(index)) for index in range(PATHS)]
+        for path in paths:
+            mkdir(path)
+
+        # Packages are in the last "sys.path" entry, like in "site-packages"
+        for index in range(packages):
+            package = join(paths[-1], f"package_{index}")
+            mkdir(package)
+            for name in ("__init__.py", "module.py"):
+                with open(join(package, name), "wt") as file:
+                    file.write("")
+
+        paths.append(REPOSITORY_DIR)
+        hook_time(paths, packages, "global", 1)
+
+        results = {
+            mode: hook_time(paths, packages, mode, repeat)
+            for mode in ("global", "registered")
+        }
+
+    print(f"Importing {packages} packages and submodules, {PATHS} sys.path entries")
+    print(f"Import hook time, global mode:     {results['global']:>8.3f} ms")
+    print(f"Import hook time, registered mode: {results['registered']:>8.3f} ms")
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=300, help="Packages count")
+    parser.add_argument("--repeat", type=int, default=10, help="Interpreters to run")
+    arguments = parser.parse_args()
+    main(arguments.packages, arguments.repeat)
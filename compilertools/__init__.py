@@ -10,9 +10,6 @@ from compilertools._version import __version__  # noqa: E402
 
 from compilertools import imports  # noqa: E402
 
-from compilertools.processors import get_processor as _get_processor  # noqa: E402
-from compilertools.compilers import get_compiler as _get_compiler  # noqa: E402
-
 
 def get_compiler():
     """
@@ -23,6 +20,8 @@ def get_compiler():
     compilertools.processors.ProcessorBase subclass instance
         Processor
     """
+    from compilertools.compilers import get_compiler as _get_compiler
+
     return _get_compiler(current_compiler=True)
 
 
@@ -35,6 +34,8 @@ def get_processor():
     compilertools.compilers.CompilerBase subclass instance
         Compiler
     """
+    from compilertools.processors import get_processor as _get_processor
+
     return _get_processor(arch=None, current_machine=True)
 
 
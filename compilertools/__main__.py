@@ -0,0 +1,437 @@
+"""Command line interface
+
+run "python -m compilertools --help" for help.
+"""
+from time import perf_counter as _perf_counter
+
+
+def _cpu(arguments):
+    """Detects the current machine processor.
+
+    Parameters
+    ----------
+    arguments : argparse.Namespace
+        Command line arguments.
+
+    Returns
+    -------
+    dict
+        Processor properties and detection time."""
+    from compilertools.processors import get_processor
+
+    start = _perf_counter()
+    cpu = get_processor(None, current_machine=True)
+    cls = type(cpu)
+    processor = {
+        name: cpu[name]
+        for name in sorted(dir(cls))
+        if isinstance(getattr(cls, name, None), property)
+    }
+    return {"processor": processor, "time": _perf_counter() - start}
+
+
+def _cpu_text(data):
+    """Formats "cpu" command result.
+
+    Parameters
+    ----------
+    data : dict
+        Command result.
+
+    Returns
+    -------
+    list of str
+        Lines."""
+    lines = []
+    for name, value in data["processor"].items():
+        if isinstance(value, (set, frozenset)):
+            value = " ".join(sorted(str(item) for item in value))
+        elif isinstance(value, (list, tuple)):
+            # Ordered values, like microarchitectures from the most specific
+            value = " ".join(str(item) for item in value)
+        lines.append(f"{name}: {value}")
+    lines.append(f"detection time: {data['time'] * 1e3:.3f} ms")
+    return lines
+
+
+def _suffixes(arguments):
+    """Computes file extensions suffixes compatibles with the current machine.
+
+    Parameters
+    ----------
+    arguments : argparse.Namespace
+        Command line arguments.
+
+    Returns
+    -------
+    dict
+        Suffixes, overrides and detection times."""
+    from compilertools import imports
+
+    imports.enable_statistics()
+    start = _perf_counter()
+    imports.update_extensions_suffixes(arguments.compiler)
+    elapsed = _perf_counter() - start
+    return {
+        "suffixes": list(imports.ARCH_SUFFIXES),
+        "overrides": imports._overrides(),
+        "detection": imports.get_statistics()["detection"],
+        "time": elapsed,
+    }
+
+
+def _suffixes_text(data):
+    """Formats "suffixes" command result.
+
+    Parameters
+    ----------
+    data : dict
+        Command result.
+
+    Returns
+    -------
+    list of str
+        Lines."""
+    lines = data["suffixes"][:]
+    for name, value in data["overrides"].items():
+        if value:
+            lines.append(f"override {name}: {value}")
+    for name, times in data["detection"].items():
+        lines.append(
+            f"{name}: compiler detection {times['compiler_time'] * 1e3:.3f} ms, "
+            f"suffixes {times['suffixes_time'] * 1e3:.3f} ms"
+        )
+    return lines
+
+
+def _matrix(arguments):
+    """Computes the build arguments matrix of the current compiler.
+
+    Parameters
+    ----------
+    arguments : argparse.Namespace
+        Command line arguments.
+
+    Returns
+    -------
+    dict
+        Compiler name and version, and arguments by suffix for each architecture."""
+    from compilertools.compilers import get_compiler
+    from compilertools.processors import get_arch
+
+    start = _perf_counter()
+    compiler = get_compiler(arguments.compiler, current_compiler=True)
+    matrices = {}
+    for arch in arguments.arch or [None]:
+        arch = get_arch(arch)
+        matrices[arch] = dict(compiler.compile_args(arch))
+    return {
+        "compiler": {"name": compiler.name, "version": compiler.version},
+        "matrix": matrices,
+        "time": _perf_counter() - start,
+    }
+
+
+def _matrix_text(data):
+    """Formats "matrix" command result.
+
+    Parameters
+    ----------
+    data : dict
+        Command result.
+
+    Returns
+    -------
+    list of str
+        Lines."""
+    compiler = data["compiler"]
+    lines = [f"compiler: {compiler['name']} {compiler['version']}"]
+    for arch, matrix in data["matrix"].items():
+        lines.append(f"{arch}:")
+        for suffix, args in matrix.items():
+            lines.append(f"  {suffix or '(generic)'}: {' '.join(args)}")
+    return lines
+
+
+def _explain(arguments):
+    """Explains which variant optimized modules would load.
+
+    Parameters
+    ----------
+    arguments : argparse.Namespace
+        Command line arguments.
+
+    Returns
+    -------
+    dict
+        Import hook statistics record (See "compilertools.imports.get_statistics")
+        by module full name. Record is replaced by an "error" key if the module
+        parent package can't be imported."""
+    from importlib import import_module
+    from compilertools import imports
+
+    if arguments.module:
+        modules = [arguments.module]
+    else:
+        # All modules from variants manifests
+        modules = set()
+        for paths in imports._marked_names().values():
+            for path in paths:
+                manifest = imports._load_manifest(path)
+                if manifest:
+                    modules.update(manifest["modules"])
+        modules = sorted(modules)
+
+    imports.enable_statistics()
+    finder = imports._ExtensionFileFinder()
+    explained = {}
+    for fullname in modules:
+        imports.register(fullname)
+        parent = fullname.rpartition(".")[0]
+        try:
+            path = import_module(parent).__path__ if parent else None
+        except (ImportError, AttributeError) as exception:
+            explained[fullname] = {"error": str(exception)}
+            continue
+        finder.find_spec(fullname, path)
+        explained[fullname] = imports.get_statistics()["modules"].get(fullname)
+    return explained
+
+
+def _explain_text(data):
+    """Formats "explain" command result.
+
+    Parameters
+    ----------
+    data : dict
+        Command result.
+
+    Returns
+    -------
+    list of str
+        Lines."""
+    if not data:
+        return ["No optimized modules found"]
+
+    lines = []
+    for fullname, record in data.items():
+        if "error" in record:
+            lines.append(f"{fullname}: error: {record['error']}")
+            continue
+        lines.append(
+            f"{fullname}: {record['variant'] or 'generic module'} ({record['reason']})"
+        )
+        lines.append(
+            f"  time: {record['time'] * 1e3:.3f} ms, probes: {record['probes']}"
+        )
+        for suffix, reason in record["rejected"].items():
+            lines.append(f"  {suffix}: {reason}")
+    return lines
+
+
+def _timing(arguments):
+    """Measures detection stages times.
+
+    Parameters
+    ----------
+    arguments : argparse.Namespace
+        Command line arguments.
+
+    Returns
+    -------
+    dict
+        Times in seconds by stage."""
+    from compilertools._config import CONFIG
+    from compilertools._core import get_compile_args, suffix_from_args
+    from compilertools.compilers import get_compiler
+    from compilertools.processors import get_processor
+    from importlib.machinery import EXTENSION_SUFFIXES
+
+    if arguments.no_cache:
+        CONFIG["cache"] = False
+
+    times = {}
+    start = _perf_counter()
+    cpu = get_processor(None, current_machine=True)
+    for name in ("vendor", "brand", "features"):
+        cpu[name]
+    times["processor"] = _perf_counter() - start
+
+    start = _perf_counter()
+    compiler = get_compiler(arguments.compiler)
+    times["compiler"] = _perf_counter() - start
+
+    start = _perf_counter()
+    get_compiler(arguments.compiler, current_compiler=True).version
+    times["compiler_version"] = _perf_counter() - start
+
+    start = _perf_counter()
+    args = get_compile_args(compiler, current_machine=True)
+    suffix_from_args(args, EXTENSION_SUFFIXES)
+    times["suffixes"] = _perf_counter() - start
+    return {"times": times, "persistent_cache": CONFIG.get("cache", True)}
+
+
+def _timing_text(data):
+    """Formats "timing" command result.
+
+    Parameters
+    ----------
+    data : dict
+        Command result.
+
+    Returns
+    -------
+    list of str
+        Lines."""
+    lines = [f"{name}: {time * 1e3:.3f} ms" for name, time in data["times"].items()]
+    cache = "enabled" if data["persistent_cache"] else "disabled"
+    lines.append(f"persistent cache: {cache}")
+    return lines
+
+
+def _autotune(arguments):
+    """Shows or runs variants autotuning.
+
+    Parameters
+    ----------
+    arguments : argparse.Namespace
+        Command line arguments.
+
+    Returns
+    -------
+    dict
+        Autotuning results (See "compilertools.imports.get_autotune_results")."""
+    from compilertools.imports import get_autotune_results, run_autotune
+
+    if arguments.run:
+        if not arguments.module:
+            raise SystemExit("A module is required to run autotuning")
+        run_autotune(arguments.module, arguments.benchmark)
+
+    results = get_autotune_results()
+    return {
+        fullname: results[fullname]
+        for fullname in sorted(results)
+        if not arguments.module or fullname == arguments.module
+    }
+
+
+def _autotune_text(data):
+    """Formats "autotune" command result.
+
+    Parameters
+    ----------
+    data : dict
+        Command result.
+
+    Returns
+    -------
+    list of str
+        Lines."""
+    lines = []
+    for fullname, result in data.items():
+        lines.append(f"{fullname} ({result['benchmark']})")
+        timings = result["timings"]
+        for suffix in sorted(
+            timings, key=lambda key: (timings[key] is None, timings[key] or 0.0)
+        ):
+            timing = timings[suffix]
+            timing = "failed" if timing is None else f"{timing * 1e3:.3f} ms"
+            lines.append(f"  {suffix}: {timing}")
+    return lines
+
+
+def _json_default(obj):
+    """JSON default function that encodes sets as sorted lists and other objects as
+    str.
+
+    Parameters
+    ----------
+    obj : object
+        Object that is not natively JSON serializable.
+
+    Returns
+    -------
+    list or str
+        Encoded object."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    return str(obj)
+
+
+def main(args=None):
+    """Runs the command line interface.
+
+    Parameters
+    ----------
+    args : list of str
+        Command line arguments. Default to "sys.argv"."""
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(prog="compilertools", description=__doc__.splitlines()[0])
+    common = ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="JSON output")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    command = commands.add_parser(
+        "cpu", parents=[common], help="Show current machine processor"
+    )
+    command.set_defaults(function=_cpu, text=_cpu_text)
+
+    command = commands.add_parser(
+        "suffixes", parents=[common], help="Show current machine compatible suffixes"
+    )
+    command.add_argument("--compiler", help="Compiler name")
+    command.set_defaults(function=_suffixes, text=_suffixes_text)
+
+    command = commands.add_parser(
+        "matrix", parents=[common], help="Show current compiler build matrix"
+    )
+    command.add_argument("--compiler", help="Compiler name")
+    command.add_argument(
+        "--arch", action="append", help="Architecture (Default to current one)"
+    )
+    command.set_defaults(function=_matrix, text=_matrix_text)
+
+    command = commands.add_parser(
+        "explain", parents=[common], help="Explain which variant a module loads"
+    )
+    command.add_argument(
+        "module", nargs="?", help="Module full name (Default to all in manifests)"
+    )
+    command.set_defaults(function=_explain, text=_explain_text)
+
+    command = commands.add_parser(
+        "timing", parents=[common], help="Show detection stages times"
+    )
+    command.add_argument("--compiler", help="Compiler name")
+    command.add_argument(
+        "--no-cache", action="store_true", help="Disable the persistent cache"
+    )
+    command.set_defaults(function=_timing, text=_timing_text)
+
+    command = commands.add_parser(
+        "autotune", parents=[common], help="Show or run variants autotuning results"
+    )
+    command.add_argument("module", nargs="?", help="Module full name")
+    command.add_argument(
+        "--run", action="store_true", help="Run autotuning, replacing results"
+    )
+    command.add_argument("--benchmark", help='Benchmark "module:function"')
+    command.set_defaults(function=_autotune, text=_autotune_text)
+
+    arguments = parser.parse_args(args)
+    data = arguments.function(arguments)
+    if arguments.json:
+        from json import dumps
+
+        print(dumps(data, indent=2, default=_json_default))
+    else:
+        for line in arguments.text(data):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Persistent cache"""
+
+from os import environ, getpid
+from os.path import expanduser, join
+from compilertools._config import CONFIG
+
+__all__ = ["get_cache_dir", "load_cache", "dump_cache"]
+
+
+def get_cache_dir():
+    """Returns the user cache directory.
+
+    Uses "$COMPILERTOOLS_CACHE_DIR" if set, else "$XDG_CACHE_HOME/compilertools" on
+    Unix, "~/Library/Caches/compilertools" on macOS and "%LOCALAPPDATA%/compilertools"
+    on Windows.
+
+    Returns
+    -------
+    str
+        Cache directory path.
+    """
+    from sys import platform
+
+    try:
+        return environ["COMPILERTOOLS_CACHE_DIR"]
+    except KeyError:
+        pass
+
+    if platform == "win32":
+        root = environ.get("LOCALAPPDATA") or expanduser("~")
+    elif platform == "darwin":
+        root = expanduser(join("~", "Library", "Caches"))
+    else:
+        root = environ.get("XDG_CACHE_HOME") or expanduser(join("~", ".cache"))
+    return join(root, "compilertools")
+
+
+def _decode(obj):
+    """JSON object hook that decodes sets.
+
+    Parameters
+    ----------
+    obj : dict
+        JSON object.
+
+    Returns
+    -------
+    dict or set
+        Decoded object."""
+    if len(obj) == 1 and "__set__" in obj:
+        return set(obj["__set__"])
+    return obj
+
+
+def _encode(obj):
+    """JSON default function that encodes sets.
+
+    Parameters
+    ----------
+    obj : object
+        Object that is not natively JSON serializable.
+
+    Returns
+    -------
+    dict
+        Encoded object."""
+    if isinstance(obj, (set, frozenset)):
+        return {"__set__": sorted(obj)}
+    raise TypeError(f"{obj!r} is not JSON serializable")
+
+
+def load_cache(name):
+    """Loads a cache file content.
+
+    Parameters
+    ----------
+    name : str
+        Cache name.
+
+    Returns
+    -------
+    dict or None
+        Cache content. None if cache is disabled, missing or corrupted.
+    """
+    if not CONFIG.get("cache", True):
+        return None
+
+    from json import load
+
+    try:
+        with open(join(get_cache_dir(), f"{name}.json"), "rt") as file:
+            content = load(file, object_hook=_decode)
+    except (OSError, ValueError):
+        return None
+    return content if isinstance(content, dict) else None
+
+
+def dump_cache(name, content):
+    """Dumps a cache file content.
+
+    The file is written atomically and errors are ignored: The cache is only an
+    optimization.
+
+    Parameters
+    ----------
+    name : str
+        Cache name.
+    content : dict
+        Cache content.
+    """
+    if not CONFIG.get("cache", True):
+        return
+
+    from json import dump
+    from os import makedirs, replace, remove
+    from threading import get_ident
+
+    cache_dir = get_cache_dir()
+    path = join(cache_dir, f"{name}.json")
+    tmp_path = f"{path}.{getpid()}-{get_ident()}.tmp"
+    try:
+        makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "wt") as file:
+            dump(content, file, default=_encode)
+        replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            remove(tmp_path)
+        except OSError:
+            pass
@@ -44,4 +44,22 @@ CONFIG = {
     },
     # Logging: If False, don't log exceptions on stdout
     "logging": True,
+    # Persistent cache: If False, don't store detection results in the user cache
+    # directory (See "compilertools._cache.get_cache_dir")
+    "cache": True,
+    # Import hook: If False, only look for optimized variants of modules from
+    # registered packages (See "compilertools.imports.register"), else look for
+    # optimized variants of all imported modules
+    "imports_global": False,
+    # Import hook: If True, the first time a variant is selected on a machine, import
+    # it in a subprocess (And call its "_compilertools_selftest" function if any) and
+    # skip it if this fails (Like on "illegal instruction"). Results are stored in the
+    # persistent cache
+    "imports_selftest": False,
+    # Compilers probes: Timeout in seconds of each compiler subprocess run to detect
+    # its identity and version
+    "probe_timeout": 30.0,
+    # Compilers probes: If True, arguments support of the current compiler is checked
+    # by test compilation instead of only relying on the compiler version (GCC/Clang)
+    "probe_arguments": True,
 }
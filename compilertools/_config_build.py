@@ -32,10 +32,37 @@ class ConfigBuild:
         "amd",
     }
 
+    #: Builds x86-64 psABI microarchitecture levels variants ("x86_64_v2",
+    #: "x86_64_v3", "x86_64_v4") instead of single instructions set variants ("avx",
+    #: "avx2", "avx512", "avx512_skx").
+    #: This does not affect current machine builds and is ignored if
+    #: 'suffixes_includes' is not empty.
+    x86_64_levels = False
+
+    #: Profile-guided optimization training command (GCC and Clang only).
+    #: If set, each variant is built instrumented, then trained by running this
+    #: command (str run in a shell, or list of str), then rebuilt using the
+    #: generated profile. The command runs with the built extensions in
+    #: "PYTHONPATH" and the trained variant forced with
+    #: "$COMPILERTOOLS_FORCE_VARIANT".
+    pgo_training = None
+
+    #: Profile-guided optimization profiles directory. Each variant uses its own
+    #: sub-directory. If None, uses a "compilertools_pgo" directory in the build
+    #: temporary directory.
+    pgo_profile_dir = None
+
     #: Enables compilers options
     option = {
         # Enables Fast floating point math
-        "fast_fpmath": False
+        "fast_fpmath": False,
+        # Passes build machine CPU caches sizes and cores count to the compiler as
+        # optimizer parameters (GCC only) and "COMPILERTOOLS_*" preprocessor macros
+        "cpu_cache": False,
+        # Prefers 256-bit vectors in AVX-512 variants (And current machine builds), to
+        # avoid CPU frequency drop on some Intel processors with 512-bit vectors (GCC
+        # and Clang only)
+        "prefer_vector_width_256": False,
     }
 
     #: Specific API are auto-enabled when compiling and linking if following
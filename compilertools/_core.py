@@ -77,15 +77,43 @@ def log_exception():
         from logging import getLogger
         import platform
 
+        system, machine = _system_info()
         getLogger("compilertools").exception(
             "\n".join(
                 (
                     "Compilertools: Exception when trying to enable optimization, "
                     "Back to compatible mode.",
-                    f"  OS: {platform.platform()}",
-                    f"  CPU: {platform.processor()}",
+                    f"  OS: {system}",
+                    f"  CPU: {machine}",
                     f"  Python: {platform.python_version()} "
                     f"[{platform.python_compiler()}]",
                 )
             )
         )
+
+
+def _system_info():
+    """Returns OS and CPU information without running subprocesses, unlike
+    "platform.platform" and "platform.processor" that may run "uname".
+
+    Returns
+    -------
+    str
+        OS name and release.
+    str
+        Machine architecture."""
+    try:
+        from os import uname
+    except ImportError:
+        # Windows
+        from os import environ
+        from sys import getwindowsversion
+
+        version = getwindowsversion()
+        return (
+            f"Windows {version.major}.{version.minor}.{version.build}",
+            environ.get("PROCESSOR_ARCHITECTURE", ""),
+        )
+
+    system = uname()
+    return f"{system.sysname} {system.release}", system.machine
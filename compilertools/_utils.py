@@ -123,6 +123,300 @@ class BaseClass(MutableMapping):
         return self._items.__iter__()
 
 
+#: Compiler launchers that may prefix the "CC" environment variable
+_LAUNCHERS = {"ccache", "sccache", "distcc"}
+
+
+def build_commands():
+    """Returns compilers commands that distutils invokes on Unix: From the "CC" and
+    "CXX" environment variables, else from the ones used to build Python.
+
+    Returns
+    -------
+    list of str
+        Compilers commands (Without compiler launcher and arguments).
+    """
+    from os import environ
+    from os.path import basename
+    from shlex import split
+    from sysconfig import get_config_var
+
+    commands = []
+    for name in ("CC", "CXX"):
+        for part in split(environ.get(name) or get_config_var(name) or ""):
+            if basename(part) not in _LAUNCHERS:
+                if part not in commands:
+                    commands.append(part)
+                break
+    return commands
+
+
+def resolve_executable(command):
+    """Resolves the real path of a compiler executable.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command name or path.
+
+    Returns
+    -------
+    str or None
+        Executable real path (Symbolic links resolved). None if not found.
+    """
+    from os.path import realpath
+    from shutil import which
+
+    path = which(command)
+    return realpath(path) if path else None
+
+
+def probe_compiler(command):
+    """Probes GCC/Clang compiler identity and version.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command name or path.
+
+    Returns
+    -------
+    dict or None
+        Probe result (See "probe_compiler_async").
+    """
+    return probe_compilers((command,))[command]
+
+
+def probe_compilers(commands):
+    """Probes many GCC/Clang compilers concurrently.
+
+    Synchronous wrapper of "probe_all".
+
+    Parameters
+    ----------
+    commands : iterable of str
+        Compilers commands names or paths.
+
+    Returns
+    -------
+    dict
+        Probe result (See "probe_compiler_async") by command.
+    """
+    return run_coroutine(probe_all(commands))
+
+
+async def probe_all(commands):
+    """Probes many GCC/Clang compilers concurrently.
+
+    All compilers subprocesses are started at once, so the probing time is bounded
+    by the slowest compiler.
+
+    Parameters
+    ----------
+    commands : iterable of str
+        Compilers commands names or paths.
+
+    Returns
+    -------
+    dict
+        Probe result (See "probe_compiler_async") by command.
+    """
+    from asyncio import gather
+
+    commands = list(dict.fromkeys(commands))
+    probes = await gather(*(probe_compiler_async(command) for command in commands))
+    return dict(zip(commands, probes))
+
+
+async def probe_compiler_async(command):
+    """Probes GCC/Clang compiler identity and version.
+
+    Results are stored in the persistent cache by executable path and are reused
+    while the executable modification time and size do not change. Each subprocess
+    run is bounded by the "probe_timeout" configuration.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command name or path.
+
+    Returns
+    -------
+    dict or None
+        Compiler "family" ("gcc", "clang" or None if unknown), "version" (float or
+        None if not found) and "path". None if the compiler is not found or timed
+        out.
+    """
+    from compilertools._cache import load_cache, dump_cache
+
+    path = resolve_executable(command)
+    if path is None:
+        return await _run_probe(command)
+
+    signature = _executable_signature(path)
+    if signature is None:
+        return None
+
+    cached = (load_cache("compilers") or {}).get(path)
+    if isinstance(cached, dict) and cached.get("signature") == signature:
+        return cached["probe"]
+
+    probe = await _run_probe(path)
+    if probe is not None:
+        # Reloads the cache to keep results from concurrent probes and processes
+        cache = load_cache("compilers") or {}
+        cache[path] = {"signature": signature, "probe": probe}
+        dump_cache("compilers", cache)
+    return probe
+
+
+async def _run_probe(command):
+    """Runs compiler subprocesses concurrently to detect its identity and version.
+
+    Parameters
+    ----------
+    command : str
+        Compiler command name or path.
+
+    Returns
+    -------
+    dict or None
+        Probe result (See "probe_compiler_async").
+    """
+    from asyncio import gather
+
+    results = await gather(
+        *(
+            _run_async([command, argument])
+            for argument in ("--version", "-dumpversion", "-dumpfullversion")
+        ),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            # Not found or timed out
+            return None
+
+    (returncode, output), *versions = results
+    probe = {"family": None, "version": None, "path": command}
+    if returncode:
+        return probe
+
+    output = output.lower()
+    if "clang" in output:
+        probe["family"] = "clang"
+    elif "gcc" in output or "free software foundation" in output:
+        probe["family"] = "gcc"
+    else:
+        return probe
+
+    for returncode, output in versions:
+        if not returncode and "." in output:
+            probe["version"] = float(".".join(output.split(".", 2)[:2]))
+            break
+    return probe
+
+
+async def _run_async(args):
+    """Runs a subprocess, bounded by the "probe_timeout" configuration.
+
+    Parameters
+    ----------
+    args : list of str
+        Command line arguments.
+
+    Returns
+    -------
+    int
+        Return code.
+    str
+        Standard output.
+    """
+    from asyncio import create_subprocess_exec, wait_for, TimeoutError
+    from asyncio.subprocess import PIPE
+    from compilertools._config import CONFIG
+
+    process = await create_subprocess_exec(*args, stdout=PIPE, stderr=PIPE)
+    try:
+        stdout, _ = await wait_for(process.communicate(), CONFIG.get("probe_timeout"))
+    except TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, stdout.decode(errors="replace")
+
+
+def run_coroutine(coroutine):
+    """Runs a coroutine until completion from synchronous code.
+
+    The coroutine runs in a new thread if an event loop is already running in the
+    current one.
+
+    Parameters
+    ----------
+    coroutine : coroutine
+        Coroutine.
+
+    Returns
+    -------
+    object
+        Coroutine result.
+    """
+    import asyncio
+
+    # "asyncio.get_running_loop" requires Python 3.7
+    if asyncio._get_running_loop() is not None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(1) as executor:
+            return executor.submit(run_coroutine, coroutine).result()
+
+    if sys.platform == "win32":
+        # Subprocesses requires the proactor event loop on Python < 3.8
+        loop = asyncio.ProactorEventLoop()
+    else:
+        loop = asyncio.new_event_loop()
+
+    # Subprocesses child watcher must be attached to the event loop on Python < 3.8
+    set_loop = sys.version_info < (3, 8)
+    if set_loop:
+        asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        if set_loop:
+            asyncio.set_event_loop(None)
+        loop.close()
+
+
+async def find_compiler(command):
+    """Finds the compiler of a GCC/Clang family.
+
+    The compilers invoked by distutils (See "build_commands") and the command itself
+    are probed concurrently. The first one from the command family is used.
+
+    Parameters
+    ----------
+    command : str
+        Compiler family command ("gcc" or "clang").
+
+    Returns
+    -------
+    dict or None
+        Probe result (See "probe_compiler_async"). None if not found.
+    """
+    commands = build_commands()
+    if command not in commands:
+        commands.append(command)
+
+    probes = await probe_all(commands)
+    for executable in commands:
+        probe = probes[executable]
+        if probe is not None and probe["family"] == command:
+            return probe
+    return None
+
+
 def dump_version(command):
     """
     Dump version for GCC/Clang compilers
@@ -130,36 +424,144 @@ def dump_version(command):
     Parameters
     ----------
     command : str
-        Compiler command.
+        Compiler family command ("gcc" or "clang").
 
     Returns
     -------
         float or None: version if found else None
     """
-    from subprocess import run, PIPE, CalledProcessError
+    probe = run_coroutine(find_compiler(command))
+    if probe is not None:
+        return probe["version"]
+
+
+#: C source file test compiled to probe compilers arguments. The loop is vectorized
+#: with instructions sets arguments, so the assembler support is also tested.
+_PROBE_SOURCE = """
+void compilertools_probe(float *__restrict__ a, const float *__restrict__ b, int n)
+{
+    int i;
+    for (i = 0; i < n; i++)
+        a[i] += b[i] * b[i];
+}
+"""
+
+
+def probe_arguments(command, arguments):
+    """Probes GCC/Clang compiler support of arguments by test compilation.
+
+    Synchronous wrapper of "probe_arguments_async".
+
+    Parameters
+    ----------
+    command : str
+        Compiler family command ("gcc" or "clang").
+    arguments : iterable of str
+        Arguments to probe. Each str is a space separated arguments combination.
+
+    Returns
+    -------
+    dict
+        Keys are arguments, values are True if the compilation succeeded.
+    """
+    return run_coroutine(probe_arguments_async(command, arguments))
+
+
+async def probe_arguments_async(command, arguments):
+    """Probes GCC/Clang compiler support of arguments by test compilation.
+
+    A small C source file is compiled and assembled with each arguments
+    combination, concurrently. Results are stored in the persistent cache by
+    compiler executable path and are reused while the executable modification time
+    and size do not change.
+
+    Parameters
+    ----------
+    command : str
+        Compiler family command ("gcc" or "clang").
+    arguments : iterable of str
+        Arguments to probe. Each str is a space separated arguments combination.
+
+    Returns
+    -------
+    dict
+        Keys are arguments, values are True if the compilation succeeded. Arguments
+        are missing if the compiler is not found or the compilation timed out.
+    """
+    from asyncio import gather, Semaphore
+    from os import cpu_count
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools._cache import load_cache, dump_cache
+
+    compiler = await find_compiler(command)
+    if compiler is None:
+        return {}
+
+    path = compiler["path"]
+    signature = _executable_signature(path)
+    cached = (load_cache("arguments") or {}).get(path)
+    if isinstance(cached, dict) and cached.get("signature") == signature:
+        results = cached["results"]
+    else:
+        results = {}
+
+    arguments = list(dict.fromkeys(arguments))
+    missing = [args for args in arguments if args not in results]
+    if missing:
+        semaphore = Semaphore(cpu_count() or 1)
+
+        async def compile_source(index, args):
+            """Compiles the source file with arguments"""
+            async with semaphore:
+                return await _run_async(
+                    [path, "-O3", "-c", source, "-o", join(tmp, f"{index}.o")]
+                    + args.split()
+                )
+
+        with TemporaryDirectory() as tmp:
+            source = join(tmp, "probe.c")
+            with open(source, "wt") as file:
+                file.write(_PROBE_SOURCE)
+
+            outcomes = await gather(
+                *(compile_source(index, args) for index, args in enumerate(missing)),
+                return_exceptions=True,
+            )
+
+        for args, outcome in zip(missing, outcomes):
+            if not isinstance(outcome, Exception):
+                results[args] = not outcome[0]
+
+        if signature is not None:
+            # Reloads the cache to keep results from concurrent processes
+            cache = load_cache("arguments") or {}
+            cache[path] = {"signature": signature, "results": results}
+            dump_cache("arguments", cache)
+
+    return {args: results[args] for args in arguments if args in results}
+
+
+def _executable_signature(path):
+    """Returns an executable signature, used to invalidate the persistent cache.
+
+    Parameters
+    ----------
+    path : str
+        Executable real path.
+
+    Returns
+    -------
+    list of int or None
+        Modification time and size. None if not found.
+    """
+    from os import stat
 
     try:
-        if (
-            command
-            not in run(
-                [command, "--version"],
-                stdout=PIPE,
-                stderr=PIPE,
-                universal_newlines=True,
-                check=True,
-            ).stdout
-        ):
-            # Command is linked to another compiler
-            return
-    except (FileNotFoundError, CalledProcessError):
-        return
-
-    for method in ("-dumpversion", "-dumpfullversion"):
-        process = run(
-            [command, method], stdout=PIPE, stderr=PIPE, universal_newlines=True
-        )
-        if not process.returncode and "." in process.stdout:
-            return float(".".join(process.stdout.split(".", 2)[:2]))
+        status = stat(path)
+    except OSError:
+        return None
+    return [status.st_mtime_ns, status.st_size]
 
 
 def python_version(name):
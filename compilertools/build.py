@@ -67,6 +67,15 @@ def get_build_compile_args(
     build_args = {}
     compiler = get_compiler(compiler, current_compiler=True)
 
+    # Options restricted to some variants
+    variants_options = {}
+    if not current_machine:
+        for name in use_option or ():
+            parts = compiler["option"].get(name, {}).get("suffixes")
+            if parts:
+                variants_options[name] = parts
+        use_option = [name for name in use_option or () if name not in variants_options]
+
     if current_machine:
         try:
             build_args[ext_suffix] = [compiler.compile_args_current_machine()]
@@ -81,7 +90,11 @@ def get_build_compile_args(
     else:
         include = ConfigBuild.suffixes_includes
         if not include:
-            exclude = ConfigBuild.suffixes_excludes
+            exclude = set(ConfigBuild.suffixes_excludes)
+            if ConfigBuild.x86_64_levels:
+                exclude.update(("avx", "avx2", "avx512", "avx512_skx"))
+            else:
+                exclude.update(("x86_64_v2", "x86_64_v3", "x86_64_v4"))
 
             def filter_suffix(suffix_to_test):
                 """Filter by exclusion"""
@@ -101,8 +114,16 @@ def get_build_compile_args(
                     del args[suffixes]
                     break
 
-        for arg, suffix in zip(args.values(), suffix_from_args(args, ext_suffix, True)):
-            build_args[suffix] = arg
+        for suffixes, suffix in zip(args, suffix_from_args(args, ext_suffix, True)):
+            build_args[suffix] = args[suffixes]
+            parts = set(suffixes.split("-"))
+            _add_args(
+                compiler,
+                build_args[suffix],
+                "option",
+                "compile",
+                [name for name in variants_options if parts & variants_options[name]],
+            )
 
     arg_ext = []
 
@@ -152,9 +173,16 @@ def _add_args(compiler, arg_list, arg_cat, arg_type, args_names):
     if args_names:
         for name in args_names:
             try:
-                arg_list.append(compiler[arg_cat][name][arg_type])
+                args = compiler[arg_cat][name][arg_type]
             except KeyError:
                 continue
+            if callable(args):
+                # Lazily computed arguments
+                args = args()
+            if isinstance(args, str):
+                arg_list.append(args)
+            else:
+                arg_list.extend(args)
 
 
 def _find_if_current_machine():
@@ -276,6 +304,130 @@ def _update_extension(self, ext):
     return exts
 
 
+def _build_extension(self, ext, build_extension):
+    """Builds an extension, with profile-guided optimization if enabled.
+
+    Parameters
+    ----------
+    self : build_ext instance
+        Patched build_ext.
+    ext : Extension instance
+        Extension from build_ext.extensions.
+    build_extension : function
+        Original build_ext.build_extension."""
+    if ConfigBuild.pgo_training and hasattr(ext, "compilertools_updated"):
+        return _build_extension_pgo(self, ext, build_extension)
+    return build_extension(self, ext)
+
+
+def _build_extension_pgo(self, ext, build_extension):
+    """Builds an extension variant with profile-guided optimization.
+
+    The variant is built instrumented, trained with the "ConfigBuild.pgo_training"
+    command, then rebuilt with the generated profile. On failure, the variant is
+    rebuilt without profile.
+
+    Parameters
+    ----------
+    self : build_ext instance
+        Patched build_ext.
+    ext : Extension instance
+        Extension from build_ext.extensions.
+    build_extension : function
+        Original build_ext.build_extension."""
+    if hasattr(ext, "compilertools_pgo_dir"):
+        # Already built with profile
+        return build_extension(self, ext)
+
+    from os import makedirs
+    from os.path import join
+    from shutil import rmtree
+
+    compiler = get_compiler(self.compiler.compiler_type, current_compiler=True)
+    fullname = self.get_ext_fullname(ext.name)
+    suffix = getattr(ext, "compilertools_extended_suffix", "")
+    profile_dir = ext.compilertools_pgo_dir = join(
+        ConfigBuild.pgo_profile_dir or join(self.build_temp, "compilertools_pgo"),
+        f"{fullname}{suffix}",
+    )
+
+    extra_compile_args = ext.extra_compile_args or []
+    extra_link_args = ext.extra_link_args or []
+    force = self.force
+    # Profiles are only valid for objects built in the same stage
+    self.force = True
+    try:
+        try:
+            generate_args = compiler.pgo_args("generate", profile_dir)
+            if generate_args is None:
+                raise RuntimeError(
+                    f"Profile-guided optimization not supported by {compiler.name}"
+                )
+            rmtree(profile_dir, ignore_errors=True)
+            makedirs(profile_dir)
+            ext.extra_compile_args = extra_compile_args + generate_args["compile"]
+            ext.extra_link_args = extra_link_args + generate_args["link"]
+            build_extension(self, ext)
+
+            _pgo_train(self, fullname, suffix)
+            compiler.pgo_merge(profile_dir)
+            use_args = compiler.pgo_args("use", profile_dir)
+
+        except Exception:
+            # Compilertools should not break compilation, the variant is built
+            # without profile.
+            _log_exception()
+            use_args = {"compile": [], "link": []}
+
+        ext.extra_compile_args = extra_compile_args + use_args["compile"]
+        ext.extra_link_args = extra_link_args + use_args["link"]
+        build_extension(self, ext)
+
+    finally:
+        ext.extra_compile_args = extra_compile_args
+        ext.extra_link_args = extra_link_args
+        self.force = force
+
+
+def _pgo_train(self, fullname, suffix):
+    """Runs the profile-guided optimization training command on a built variant.
+
+    Parameters
+    ----------
+    self : build_ext instance
+        Patched build_ext.
+    fullname : str
+        Extension full name.
+    suffix : str
+        Variant suffix.
+
+    Raises
+    ------
+    subprocess.CalledProcessError
+        Training command failed."""
+    from os import environ, pathsep
+    from os.path import abspath, dirname
+    from subprocess import run
+
+    # Extensions root directory, added to "PYTHONPATH"
+    root = dirname(abspath(self.get_ext_fullpath(fullname)))
+    for _ in range(fullname.count(".")):
+        root = dirname(root)
+
+    env = environ.copy()
+    env["PYTHONPATH"] = pathsep.join(
+        path for path in (root, env.get("PYTHONPATH")) if path
+    )
+
+    # Imports the trained variant, even if not compatible with the build machine
+    variant = f"{fullname}:{suffix.lstrip('.') or 'generic'}"
+    forced = env.get("COMPILERTOOLS_FORCE_VARIANT")
+    env["COMPILERTOOLS_FORCE_VARIANT"] = f"{forced},{variant}" if forced else variant
+
+    training = ConfigBuild.pgo_training
+    run(training, shell=isinstance(training, str), env=env, check=True)
+
+
 # Distutils "distutils.command.build_ext.build_ext" Monkey-Patches with wrapping
 
 
@@ -289,10 +441,10 @@ def _patch_build_extension(build_extension):
     def patched(self, ext):
         """Patched build_extension"""
         if hasattr(ext, "compilertools_updated"):
-            return build_extension(self, ext)
+            return _build_extension(self, ext, build_extension)
 
         for updated_ext in _update_extension(self, ext):
-            build_extension(self, updated_ext)
+            _build_extension(self, updated_ext, build_extension)
 
     patched.__module__ = f"compilertools.{patched.__module__}"
     return patched
@@ -342,8 +494,79 @@ def _patch_get_ext_fullname(get_ext_fullname):
     return patched
 
 
+def _variants_manifests(self):
+    """Returns optimized variants manifests of built extensions.
+
+    Parameters
+    ----------
+    self : build_ext instance
+        Patched build_ext.
+
+    Returns
+    -------
+    dict
+        Keys are top level packages names, values are manifests. Manifests are dicts
+        with "compiler" (Compiler name) and "modules" keys. "modules" keys are modules
+        full names, values are dicts of files paths (Relative to the top level
+        package parent directory) by files suffixes.
+
+        Variants required CPU features are not stored: The import hook evaluates
+        compatibility with the "compiler" arguments matrix ("Arg.import_if"), so
+        build and runtime rely on a single definition."""
+    manifests = {}
+    for ext in self.extensions:
+        if not hasattr(ext, "compilertools_updated"):
+            continue
+        full_name = self.get_ext_fullname(ext.name)
+        file_name = self.get_ext_filename(full_name).replace("\\", "/")
+        full_name = str(full_name)
+        top_name = full_name.split(".", 1)[0]
+        suffix = file_name[len(full_name) :]
+
+        try:
+            manifest = manifests[top_name]
+        except KeyError:
+            manifest = manifests[top_name] = {
+                "compiler": self.compilertools_compiler_name,
+                "modules": {},
+            }
+        manifest["modules"].setdefault(full_name, {})[suffix] = file_name
+    return manifests
+
+
+def _manifest_file_name(self, top_name):
+    """Returns the variants manifest file name of a top level package.
+
+    The distribution name is part of the file name, so distributions sharing a
+    namespace package do not overwrite each other's manifest.
+
+    Parameters
+    ----------
+    self : build_ext instance
+        Patched build_ext.
+    top_name : str
+        Top level package or module name.
+
+    Returns
+    -------
+    str
+        File name."""
+    try:
+        distribution = self.distribution.get_name()
+    except AttributeError:
+        distribution = None
+    if not distribution or distribution == "UNKNOWN":
+        return f"{top_name}.compilertools.json"
+
+    from re import sub
+
+    # Normalized like in wheels file names
+    return f"{top_name}.{sub(r'[-_.]+', '_', distribution).lower()}.compilertools.json"
+
+
 def _patch_get_outputs(get_outputs):
-    """Decorates build_ext.get_outputs for compiler memorization"""
+    """Decorates build_ext.get_outputs for compiler memorization and variants
+    manifests writing"""
     if get_outputs.__module__.startswith("compilertools."):
         return get_outputs
 
@@ -352,19 +575,26 @@ def _patch_get_outputs(get_outputs):
         """Patched get_outputs"""
         outputs = get_outputs(self)
 
-        if (
-            hasattr(self, "compilertools_store_compiler")
-            and self.compilertools_store_compiler
-        ):
-            extra_outputs = self.compilertools_extra_ouputs
-            if not self.inplace:
-                from os.path import join
+        if hasattr(self, "compilertools_extra_ouputs"):
+            from os.path import join
+
+            root = "" if self.inplace else self.build_lib
+            extra_outputs = []
+            if self.compilertools_store_compiler:
+                for path in self.compilertools_extra_ouputs:
+                    path = join(root, path)
+                    with open(path, "wt") as file:
+                        file.write(self.compilertools_compiler_name)
+                    extra_outputs.append(path)
 
-                extra_outputs = [join(self.build_lib, path) for path in extra_outputs]
+            # Variants manifests, also used to register packages for the import hook
+            from json import dump
 
-            for path in extra_outputs:
+            for top_name, manifest in _variants_manifests(self).items():
+                path = join(root, _manifest_file_name(self, top_name))
                 with open(path, "wt") as file:
-                    file.write(self.compilertools_compiler_name)
+                    dump(manifest, file, sort_keys=True)
+                extra_outputs.append(path)
 
             outputs.extend(extra_outputs)
         return outputs
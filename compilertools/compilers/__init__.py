@@ -1,5 +1,10 @@
 """Compilers"""
 
-from compilertools.compilers._core import CompilerBase, get_compiler
+from compilertools.compilers._core import (
+    CompilerBase,
+    clear_compile_args_cache,
+    get_compiler,
+)
+from compilertools._utils import probe_all
 
-__all__ = ["CompilerBase", "get_compiler"]
+__all__ = ["CompilerBase", "clear_compile_args_cache", "get_compiler", "probe_all"]
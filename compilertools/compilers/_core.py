@@ -1,11 +1,62 @@
 """Base class and functions for compilers"""
-from itertools import product
 from collections import namedtuple, OrderedDict
 from compilertools._utils import import_class, BaseClass
 from compilertools._config import CONFIG
 from compilertools.processors import get_processor, get_arch
 
-__all__ = ["CompilerBase", "get_compiler"]
+__all__ = ["CompilerBase", "clear_compile_args_cache", "get_compiler"]
+
+#: x86-64 psABI microarchitecture levels GCC/Clang arguments, for compilers without
+#: "-march=x86-64-v*" support: {level: args}
+#: ("args" are arguments in addition to previous level ones)
+_X86_64_LEVELS_ARGS = {
+    2: ["-mcx16", "-msahf", "-mpopcnt", "-msse3", "-msse4.1", "-msse4.2", "-mssse3"],
+    3: [
+        "-mavx",
+        "-mavx2",
+        "-mbmi",
+        "-mbmi2",
+        "-mf16c",
+        "-mfma",
+        "-mlzcnt",
+        "-mmovbe",
+        "-mxsave",
+    ],
+    4: ["-mavx512f", "-mavx512bw", "-mavx512cd", "-mavx512dq", "-mavx512vl"],
+}
+
+#: AVX-512 sub-families (GCC/Clang), in addition to x86-64-v4 and previous families:
+#: {name: {argument: feature}}
+_AVX512_FAMILIES = {
+    # Skylake-SP class: AVX512F, AVX512CD, AVX512VL, AVX512BW, AVX512DQ
+    "skx": {},
+    # Ice Lake class
+    "icl": {
+        "-mavx512vbmi": "AVX512VBMI",
+        "-mavx512vbmi2": "AVX512_VBMI2",
+        "-mavx512vnni": "AVX512_VNNI",
+        "-mavx512bitalg": "AVX512_BITALG",
+        "-mavx512vpopcntdq": "AVX512_VPOPCNTDQ",
+    },
+    # Sapphire Rapids class
+    "spr": {"-mavx512bf16": "AVX512_BF16", "-mavx512fp16": "AVX512_FP16"},
+}
+
+#: Suffixes of variants using AVX-512 instructions sets (GCC/Clang)
+_AVX512_SUFFIXES = frozenset(
+    ["avx512", "x86_64_v4"] + [f"avx512_{name}" for name in _AVX512_FAMILIES]
+)
+
+#: "CompilerBase.compile_args" results cache
+_COMPILE_ARGS_CACHE = {}
+
+
+def clear_compile_args_cache():
+    """Clears "CompilerBase.compile_args" results cache.
+
+    Called by "importlib.invalidate_caches", and needed if the compiler executable
+    is replaced in place."""
+    _COMPILE_ARGS_CACHE.clear()
 
 
 def get_compiler(compiler=None, current_compiler=False):
@@ -16,7 +67,9 @@ def get_compiler(compiler=None, current_compiler=False):
     compiler : str of CompilerBase subclass
         Compiler Name or instance
     current_compiler : bool
-        Compiler used to build
+        Compiler used to build. If False, no subprocess is run to detect the compiler:
+        The unspecified Unix compiler is assumed to be GCC, like at build time when
+        the compiler name is not stored in a sidecar file.
 
     Returns
     -------
@@ -26,20 +79,31 @@ def get_compiler(compiler=None, current_compiler=False):
         return compiler
 
     if compiler is None:
-        from distutils.ccompiler import get_default_compiler
-
-        compiler = get_default_compiler()
+        compiler = _default_compiler()
 
     alias = CONFIG.get("compilers", {}).get(compiler, compiler)
 
     if alias == "unix":
-        alias = _which_unix_compiler(compiler)
+        alias = _which_unix_compiler(compiler) if current_compiler else "gcc"
 
     return import_class("compilers", alias, "Compiler", CompilerBase)(
         current_compiler=current_compiler
     )
 
 
+def _default_compiler():
+    """Returns the default compiler name on current platform, like
+    "distutils.ccompiler.get_default_compiler" without importing distutils.
+
+    Returns
+    -------
+    str
+        Compiler name."""
+    from os import name
+
+    return "msvc" if name == "nt" else "unix"
+
+
 def _which_unix_compiler(compiler):
     """
     Find which Unix compiler is "cc", "c++".
@@ -49,29 +113,20 @@ def _which_unix_compiler(compiler):
     Parameters
     ----------
     compiler : str
-        Compiler Name
+        Compiler Name. If "unix", uses the compiler that distutils invokes.
 
     Returns
     -------
     str:
         Detected compiler Name
     """
-    from subprocess import Popen, PIPE
-
-    try:
-        version_str = (
-            Popen(
-                [compiler if compiler != "unix" else "cc", "--version"],
-                stdout=PIPE,
-                universal_newlines=True,
-            )
-            .stdout.read()
-            .lower()
-        )
-    except OSError:
-        return "gcc"
+    from compilertools._utils import build_commands, probe_compiler
+
+    if compiler == "unix":
+        compiler = (build_commands() or ["cc"])[0]
 
-    if "clang" in version_str:
+    probe = probe_compiler(compiler)
+    if probe is not None and probe["family"] == "clang":
         return "llvm"
 
     return "gcc"
@@ -117,34 +172,51 @@ def _order_args_matrix(args_matrix, current_machine=False, current_compiler=Fals
     collections.OrderedDict with keys and values as str
         Arguments matrix. Keys are suffixes, values are compiler arguments.
     """
-    args_combinations = OrderedDict()
-    for args in product(*args_matrix):
-        args_list = []
-        suffix_list = []
-        is_compatible = True
+    # Precomputes arguments and suffix once per argument, and prunes incompatible
+    # arguments: Combinations that contain them are never generated
+    dimensions = []
+    for args in args_matrix:
+        dimension = []
         for arg in args:
-            if current_machine:
-                is_compatible = not (not arg.import_if or not is_compatible)
-
-            if current_compiler:
-                is_compatible = not (not arg.build_if or not is_compatible)
-
-            if not is_compatible:
-                break
+            if (current_machine and not arg.import_if) or (
+                current_compiler and not arg.build_if
+            ):
+                continue
 
             arg_arg = arg.args
-            if arg_arg:
-                if isinstance(arg_arg, str):
-                    args_list.append(arg_arg)
-                else:
-                    args_list.extend(arg_arg)
+            if not arg_arg:
+                arg_arg = ()
+            elif isinstance(arg_arg, str):
+                arg_arg = (arg_arg,)
+            else:
+                arg_arg = tuple(arg_arg)
 
             arg_suffix = arg.suffix
             if arg_suffix:
-                suffix_list.append(arg_suffix.replace(".", "_").replace("-", "_"))
+                arg_suffix = (arg_suffix.replace(".", "_").replace("-", "_"),)
+            else:
+                arg_suffix = ()
+
+            dimension.append((arg_arg, arg_suffix))
+
+        if not dimension:
+            # No compatible combination
+            return OrderedDict()
+        dimensions.append(dimension)
+
+    # Extends combinations prefixes dimension by dimension: Each prefix is computed
+    # once, in the same order as "itertools.product"
+    combinations = [((), ())]
+    for dimension in dimensions:
+        combinations = [
+            (args_prefix + arg_arg, suffix_prefix + arg_suffix)
+            for args_prefix, suffix_prefix in combinations
+            for arg_arg, arg_suffix in dimension
+        ]
 
-        if is_compatible:
-            args_combinations["-".join(suffix_list)] = args_list
+    args_combinations = OrderedDict()
+    for args_list, suffix_list in combinations:
+        args_combinations["-".join(suffix_list)] = list(args_list)
 
     return args_combinations
 
@@ -170,6 +242,10 @@ class CompilerBase(BaseClass):
            Condition that must be True for compile file with this argument and the
            current compiler (Ex compiler version). Default value is True."""
 
+    #: Compiler family command used to probe arguments support by test compilation
+    #: (GCC/Clang only). None if not supported.
+    _probe_command = None
+
     def __init__(self, current_compiler=False):
         BaseClass.__init__(self)
         self["current_compiler"] = current_compiler
@@ -236,12 +312,144 @@ class CompilerBase(BaseClass):
         -------
         collections.OrderedDict with keys and values as str
             Arguments matrix. Keys are suffixes, values are compiler arguments."""
-        return _order_args_matrix(
-            self._compile_args_matrix(
-                *_get_arch_and_cpu(arch, current_machine=current_machine)
-            ),
+        arch, cpu = _get_arch_and_cpu(arch, current_machine=current_machine)
+        current_compiler = self["current_compiler"]
+
+        # Results are memoized by compiler identity, architecture, processor and
+        # configuration
+        key = (
+            type(self),
+            self["version"],
+            current_compiler,
+            self._probe_executables(),
+            arch,
             current_machine,
-            self["current_compiler"],
+            cpu["fingerprint"] if current_machine else "",
+            CONFIG.get("probe_arguments", True),
+        )
+        try:
+            args_combinations = _COMPILE_ARGS_CACHE[key]
+        except KeyError:
+            args_matrix = self._compile_args_matrix(arch, cpu)
+            if current_compiler:
+                args_matrix = self._probe_args_matrix(args_matrix)
+            args_combinations = _COMPILE_ARGS_CACHE[key] = _order_args_matrix(
+                args_matrix, current_machine, current_compiler
+            )
+
+        # Returns a copy, since the result may be modified by the caller
+        return OrderedDict(
+            (suffix, list(args)) for suffix, args in args_combinations.items()
+        )
+
+    def _probe_args_matrix(self, args_matrix):
+        """Updates arguments "build_if" conditions with the result of a test
+        compilation with the current compiler, instead of relying only on compiler
+        version.
+
+        Arguments are kept unchanged if they can't be probed (Compiler not found,
+        probe disabled with the "probe_arguments" configuration).
+
+        Parameters
+        ----------
+        args_matrix : list of list of CompilerBase.Arg
+            Arguments matrix.
+
+        Returns
+        -------
+        list of list of CompilerBase.Arg
+            Arguments matrix."""
+        if not self._probe_command or not CONFIG.get("probe_arguments", True):
+            return args_matrix
+
+        from compilertools._utils import always_str_list, probe_arguments
+
+        def key(arg):
+            """Returns arguments as str"""
+            return " ".join(always_str_list(arg.args))
+
+        supported = probe_arguments(
+            self._probe_command,
+            (key(arg) for args in args_matrix for arg in args if arg.args),
+        )
+        return [
+            [
+                arg._replace(build_if=supported[key(arg)])
+                if arg.args and key(arg) in supported
+                else arg
+                for arg in args
+            ]
+            for args in args_matrix
+        ]
+
+    def pgo_args(self, stage, profile_dir):
+        """Returns profile-guided optimization arguments.
+
+        Override to support profile-guided optimization.
+
+        Parameters
+        ----------
+        stage : {'generate', 'use'}
+            "generate" for the instrumented build, "use" for the optimized build.
+        profile_dir : str
+            Profile directory of the built variant.
+
+        Returns
+        -------
+        dict or None
+            Keys are {'link', 'compile'}, values are list of str. None if
+            profile-guided optimization is not supported."""
+        return None
+
+    def pgo_merge(self, profile_dir):
+        """Merges raw profiles generated by the training of an instrumented build.
+
+        Override if the compiler needs it. Does nothing by default.
+
+        Parameters
+        ----------
+        profile_dir : str
+            Profile directory of the built variant."""
+
+    def _pgo_atomic_args(self, min_version):
+        """Returns arguments for atomic profile counters updates, needed to get
+        consistent profiles from multi-threaded training (GCC/Clang).
+
+        Parameters
+        ----------
+        min_version : float
+            Minimum compiler version with "-fprofile-update=atomic" support, used if
+            the argument can't be probed.
+
+        Returns
+        -------
+        list of str
+            Arguments."""
+        args = "-fprofile-update=atomic"
+        if self._probe_command and CONFIG.get("probe_arguments", True):
+            from compilertools._utils import probe_arguments
+
+            supported = probe_arguments(self._probe_command, [args]).get(args)
+            if supported is not None:
+                return [args] if supported else []
+        return [args] if self["version"] >= min_version else []
+
+    def _probe_executables(self):
+        """Returns executables that "_probe_args_matrix" may probe.
+
+        Returns
+        -------
+        tuple of str
+            Executables real paths (None if not found). Empty if arguments are not
+            probed."""
+        if not self["current_compiler"] or not self._probe_command:
+            return ()
+
+        from compilertools._utils import build_commands, resolve_executable
+
+        return tuple(
+            resolve_executable(command)
+            for command in build_commands() + [self._probe_command]
         )
 
     def compile_args_current_machine(self):
@@ -255,6 +463,151 @@ class CompilerBase(BaseClass):
             *_get_arch_and_cpu(current_machine=True)
         )
 
+    def _x86_64_levels(self, cpu, march_version, build_versions):
+        """Returns x86-64 psABI microarchitecture levels arguments (GCC/Clang).
+
+        Parameters
+        ----------
+        cpu : compilertools.processors.ProcessorBase subclass
+            Processor instance.
+        march_version : float
+            Minimum compiler version with "-march=x86-64-v*" support. Older versions
+            use the equivalent instructions sets arguments.
+        build_versions : dict
+            Keys are levels, values are minimum compiler versions to build the level.
+
+        Returns
+        -------
+        dict
+            Keys are levels (2, 3, 4), values are CompilerBase.Arg."""
+        version = self["version"]
+        levels = {}
+        args = []
+        for level, level_args in _X86_64_LEVELS_ARGS.items():
+            args = args + level_args
+            levels[level] = self.Arg(
+                args=f"-march=x86-64-v{level}" if version >= march_version else args,
+                suffix=f"x86_64_v{level}",
+                import_if=cpu["x86_64_level"] >= level,
+                build_if=version >= build_versions[level],
+            )
+        return levels
+
+    def _avx512_families(self, cpu, build_versions):
+        """Returns AVX-512 sub-families arguments (GCC/Clang).
+
+        Families are built over x86-64-v4 instructions sets.
+
+        Parameters
+        ----------
+        cpu : compilertools.processors.ProcessorBase subclass
+            Processor instance.
+        build_versions : dict
+            Keys are families names, values are minimum compiler versions to build the
+            family.
+
+        Returns
+        -------
+        dict
+            Keys are families names ("skx", "icl", "spr"), values are
+            CompilerBase.Arg."""
+        version = self["version"]
+        cpu_features = cpu["features"]
+        args = [arg for args in _X86_64_LEVELS_ARGS.values() for arg in args]
+        features = set()
+        families = {}
+        for name, family in _AVX512_FAMILIES.items():
+            args = args + list(family)
+            features.update(family.values())
+            families[name] = self.Arg(
+                args=args,
+                suffix=f"avx512_{name}",
+                import_if=(
+                    cpu["x86_64_level"] >= 4 and features.issubset(cpu_features)
+                ),
+                build_if=version >= build_versions[name],
+            )
+        return families
+
+    def _microarchitecture(self, cpu, versions):
+        """Returns the most specific current machine microarchitecture supported by
+        the compiler.
+
+        Parameters
+        ----------
+        cpu : compilertools.processors.ProcessorBase subclass
+            Processor instance.
+        versions : dict
+            Keys are microarchitectures names, values are minimum compiler versions.
+
+        Returns
+        -------
+        str or None
+            Microarchitecture name. None if unknown or not supported."""
+        version = self["version"]
+        for name in cpu["microarchitectures"]:
+            if name in versions and version >= versions[name]:
+                return name
+        return None
+
+    @staticmethod
+    def _cpu_cache_values():
+        """Returns current machine CPU caches and cores values.
+
+        Returns
+        -------
+        dict
+            Keys are values names ("L1_CACHE_SIZE", "L1_CACHE_LINE_SIZE",
+            "L2_CACHE_SIZE", "L3_CACHE_SIZE" in bytes, "PHYSICAL_CORES",
+            "LOGICAL_CORES", "THREADS_PER_CORE"), values are int. Unknown values are
+            not returned."""
+        cpu = _get_arch_and_cpu(current_machine=True)[1]
+        caches = cpu["caches"]
+        l1_cache = caches.get("L1d") or caches.get("L1") or {}
+        values = {
+            "L1_CACHE_SIZE": l1_cache.get("size"),
+            "L1_CACHE_LINE_SIZE": l1_cache.get("line_size"),
+            "L2_CACHE_SIZE": caches.get("L2", {}).get("size"),
+            "L3_CACHE_SIZE": caches.get("L3", {}).get("size"),
+            "PHYSICAL_CORES": cpu["physical_cores"],
+            "LOGICAL_CORES": cpu["logical_cores"],
+            "THREADS_PER_CORE": cpu["threads_per_core"],
+        }
+        return {name: value for name, value in values.items() if value}
+
+    def _cpu_cache_args(self):
+        """Returns current machine CPU caches and cores arguments (The "cpu_cache"
+        option).
+
+        Override to add compiler specific arguments.
+
+        Returns
+        -------
+        list of str
+            Arguments."""
+        return self._cpu_cache_macros(self._cpu_cache_values())
+
+    @staticmethod
+    def _cpu_cache_macros(values, define="-D"):
+        """Returns preprocessor macros arguments for CPU caches and cores values.
+
+        Macros are named "COMPILERTOOLS_<name>".
+
+        Parameters
+        ----------
+        values : dict
+            Values from "_cpu_cache_values".
+        define : str
+            Compiler macro definition argument.
+
+        Returns
+        -------
+        list of str
+            Arguments."""
+        return [
+            f"{define}COMPILERTOOLS_{name}={value}" for name, value in values.items()
+        ]
+
     @BaseClass._memoized_property
     def name(self):
         """Compiler type name
@@ -280,6 +633,12 @@ class CompilerBase(BaseClass):
     def option(self):
         """Compatibles Options
 
+        Arguments may also be functions returning them, only called if the option is
+        used (For arguments that require current machine detection).
+
+        An option with a "suffixes" key (set of str) only applies to variants with
+        one of these suffixes parts (And to current machine builds).
+
         Returns
         -------
         dict
@@ -2,6 +2,7 @@
 
 
 from compilertools.compilers import CompilerBase as _CompilerBase
+from compilertools.compilers._core import _AVX512_SUFFIXES
 from compilertools._utils import (
     dump_version as _dump_version,
     python_version as _python_version,
@@ -9,10 +10,56 @@ from compilertools._utils import (
 
 __all__ = ["Compiler"]
 
+#: Minimum GCC version for "-march" microarchitectures names
+_MARCH_VERSIONS = {
+    "nehalem": 4.9,
+    "westmere": 4.9,
+    "sandybridge": 4.9,
+    "ivybridge": 4.9,
+    "haswell": 4.9,
+    "broadwell": 4.9,
+    "skylake": 6.1,
+    "skylake-avx512": 6.1,
+    "cascadelake": 9.1,
+    "cooperlake": 10.1,
+    "cannonlake": 8.1,
+    "icelake-client": 8.1,
+    "icelake-server": 8.1,
+    "tigerlake": 10.1,
+    "rocketlake": 11.1,
+    "sapphirerapids": 11.1,
+    "emeraldrapids": 13.2,
+    "graniterapids": 13.1,
+    "alderlake": 11.1,
+    "raptorlake": 13.1,
+    "meteorlake": 13.1,
+    "bonnell": 4.9,
+    "silvermont": 4.9,
+    "goldmont": 9.1,
+    "goldmont-plus": 9.1,
+    "tremont": 9.1,
+    "knl": 5.1,
+    "knm": 8.1,
+    "amdfam10": 4.3,
+    "btver1": 4.6,
+    "btver2": 4.8,
+    "bdver1": 4.6,
+    "bdver2": 4.7,
+    "bdver3": 4.8,
+    "bdver4": 4.9,
+    "znver1": 6.1,
+    "znver2": 9.1,
+    "znver3": 11.1,
+    "znver4": 13.1,
+    "znver5": 14.1,
+}
+
 
 class Compiler(_CompilerBase):
     """GNU Compiler Collection"""
 
+    _probe_command = "gcc"
+
     @_CompilerBase._memoized_property
     def option(self):
         """Compatibles Options
@@ -22,7 +69,35 @@ class Compiler(_CompilerBase):
         dict
             Keys are options names, values are dict of arguments with keys in
             {'link', 'compile'}."""
-        return {"fast_fpmath": {"compile": "-Ofast"}}
+        option = {
+            "fast_fpmath": {"compile": "-Ofast"},
+            "cpu_cache": {"compile": self._cpu_cache_args},
+        }
+        if self.version >= 8.1:
+            option["prefer_vector_width_256"] = {
+                "compile": "-mprefer-vector-width=256",
+                "suffixes": _AVX512_SUFFIXES,
+            }
+        return option
+
+    def _cpu_cache_args(self):
+        """Returns current machine CPU caches and cores arguments: Preprocessor macros
+        and cache sizes optimizer parameters.
+
+        Returns
+        -------
+        list of str
+            Arguments."""
+        cpu_cache = self._cpu_cache_values()
+        args = self._cpu_cache_macros(cpu_cache)
+        for param, name, unit in (
+            ("l1-cache-size", "L1_CACHE_SIZE", 1024),
+            ("l1-cache-line-size", "L1_CACHE_LINE_SIZE", 1),
+            ("l2-cache-size", "L2_CACHE_SIZE", 1024),
+        ):
+            if name in cpu_cache:
+                args += ["--param", f"{param}={cpu_cache[name] // unit}"]
+        return args
 
     @_CompilerBase._memoized_property
     def api(self):
@@ -67,6 +142,31 @@ class Compiler(_CompilerBase):
             Version."""
         return _python_version("gcc")
 
+    def pgo_args(self, stage, profile_dir):
+        """Returns profile-guided optimization arguments.
+
+        Parameters
+        ----------
+        stage : {'generate', 'use'}
+            "generate" for the instrumented build, "use" for the optimized build.
+        profile_dir : str
+            Profile directory of the built variant.
+
+        Returns
+        -------
+        dict
+            Keys are {'link', 'compile'}, values are list of str."""
+        if stage == "generate":
+            args = [f"-fprofile-generate={profile_dir}"] + self._pgo_atomic_args(7.0)
+            return {"compile": args, "link": args}
+
+        # "-fprofile-correction" accepts inconsistent counters of multi-threaded
+        # training built without atomic updates
+        return {
+            "compile": [f"-fprofile-use={profile_dir}", "-fprofile-correction"],
+            "link": [f"-fprofile-use={profile_dir}"],
+        }
+
     def _compile_args_matrix(self, arch, cpu):
         """Returns available GCC compiler options for the specified CPU architecture.
 
@@ -86,28 +186,35 @@ class Compiler(_CompilerBase):
 
         # Architecture specific optimisations
         if arch == "x86_64":
+            levels = self._x86_64_levels(cpu, 11.1, {2: 4.3, 3: 4.8, 4: 5.1})
+            avx512 = self._avx512_families(cpu, {"skx": 5.1, "icl": 8.1, "spr": 12.1})
             args += [
                 # CPU Generic optimisations
                 [self.Arg(args="-m64")],
                 # CPU Instructions sets
                 [
+                    avx512["spr"],
+                    avx512["icl"],
+                    avx512["skx"],
+                    levels[4],
                     self.Arg(
                         args=["-mavx512cd", "-mavx512f"],
                         suffix="avx512",
                         import_if=(
                             "AVX512F" in cpu.features
                             and "AVX512CD" in cpu.features
-                            and cpu.os_supports_xsave
+                            and cpu.os_supports_avx512
                         ),
                         build_if=self.version >= 4.9,
                     ),
+                    levels[3],
                     self.Arg(
                         args="-mavx2",
                         suffix="avx2",
                         import_if=(
                             self.version >= 4.7
                             and "AVX2" in cpu.features
-                            and cpu.os_supports_xsave
+                            and cpu.os_supports_avx
                         ),
                     ),
                     self.Arg(
@@ -116,9 +223,10 @@ class Compiler(_CompilerBase):
                         import_if=(
                             self.version >= 4.4
                             and "AVX" in cpu.features
-                            and cpu.os_supports_xsave
+                            and cpu.os_supports_avx
                         ),
                     ),
+                    levels[2],
                     self.Arg(),
                 ],
                 # CPU Generic vendor/brand optimisations
@@ -145,7 +253,7 @@ class Compiler(_CompilerBase):
                         import_if=(
                             self.version >= 4.7
                             and "AVX2" in cpu.features
-                            and cpu.os_supports_xsave
+                            and cpu.os_supports_avx
                         ),
                     ),
                     self.Arg(
@@ -154,7 +262,7 @@ class Compiler(_CompilerBase):
                         import_if=(
                             self.version >= 4.4
                             and "AVX" in cpu.features
-                            and cpu.os_supports_xsave
+                            and cpu.os_supports_avx
                         ),
                     ),
                     self.Arg(
@@ -234,7 +342,11 @@ class Compiler(_CompilerBase):
         -------
         str
             Best compiler arguments for current machine."""
-        args = ["-O3 -march=native -flto"]
+        march = self._microarchitecture(cpu, _MARCH_VERSIONS)
+        if march:
+            args = [f"-O3 -march={march} -mtune={march} -flto"]
+        else:
+            args = ["-O3 -march=native -flto"]
 
         if arch == "x86_32":
             args.append("-m32")
@@ -2,6 +2,7 @@
 
 
 from compilertools.compilers import CompilerBase as _CompilerBase
+from compilertools.compilers._core import _AVX512_SUFFIXES
 from compilertools._utils import (
     dump_version as _dump_version,
     python_version as _python_version,
@@ -9,10 +10,56 @@ from compilertools._utils import (
 
 __all__ = ["Compiler"]
 
+#: Minimum Clang version for "-march" microarchitectures names
+_MARCH_VERSIONS = {
+    "nehalem": 3.4,
+    "westmere": 3.4,
+    "sandybridge": 3.4,
+    "ivybridge": 3.4,
+    "haswell": 3.4,
+    "broadwell": 3.6,
+    "skylake": 3.8,
+    "skylake-avx512": 3.9,
+    "cascadelake": 8.0,
+    "cooperlake": 9.0,
+    "cannonlake": 5.0,
+    "icelake-client": 7.0,
+    "icelake-server": 7.0,
+    "tigerlake": 10.0,
+    "rocketlake": 13.0,
+    "sapphirerapids": 12.0,
+    "emeraldrapids": 16.0,
+    "graniterapids": 16.0,
+    "alderlake": 12.0,
+    "raptorlake": 15.0,
+    "meteorlake": 15.0,
+    "bonnell": 3.4,
+    "silvermont": 3.4,
+    "goldmont": 5.0,
+    "goldmont-plus": 7.0,
+    "tremont": 7.0,
+    "knl": 3.9,
+    "knm": 6.0,
+    "amdfam10": 3.4,
+    "btver1": 3.4,
+    "btver2": 3.4,
+    "bdver1": 3.4,
+    "bdver2": 3.4,
+    "bdver3": 3.4,
+    "bdver4": 3.5,
+    "znver1": 4.0,
+    "znver2": 9.0,
+    "znver3": 12.0,
+    "znver4": 16.0,
+    "znver5": 19.1,
+}
+
 
 class Compiler(_CompilerBase):
     """LLVM Clang"""
 
+    _probe_command = "clang"
+
     @_CompilerBase._memoized_property
     def option(self):
         """Compatibles Options
@@ -22,7 +69,16 @@ class Compiler(_CompilerBase):
         dict
             Keys are options names, values are dict of arguments with keys in
             {'link', 'compile'}."""
-        return {"fast_fpmath": {"compile": "-Ofast"}}
+        option = {
+            "fast_fpmath": {"compile": "-Ofast"},
+            "cpu_cache": {"compile": self._cpu_cache_args},
+        }
+        if self.version >= 7.0:
+            option["prefer_vector_width_256"] = {
+                "compile": "-mprefer-vector-width=256",
+                "suffixes": _AVX512_SUFFIXES,
+            }
+        return option
 
     @_CompilerBase._memoized_property
     def api(self):
@@ -60,6 +116,84 @@ class Compiler(_CompilerBase):
             Version."""
         return _python_version("clang")
 
+    def pgo_args(self, stage, profile_dir):
+        """Returns profile-guided optimization arguments.
+
+        Parameters
+        ----------
+        stage : {'generate', 'use'}
+            "generate" for the instrumented build, "use" for the optimized build.
+        profile_dir : str
+            Profile directory of the built variant.
+
+        Returns
+        -------
+        dict
+            Keys are {'link', 'compile'}, values are list of str."""
+        from os.path import join
+
+        if stage == "generate":
+            # One raw profile by training process ("%p" is the process ID)
+            args = [
+                f"-fprofile-instr-generate={join(profile_dir, 'default-%p.profraw')}"
+            ] + self._pgo_atomic_args(13.0)
+            return {"compile": args, "link": args}
+
+        args = [f"-fprofile-instr-use={join(profile_dir, 'default.profdata')}"]
+        return {"compile": args, "link": args}
+
+    def pgo_merge(self, profile_dir):
+        """Merges raw profiles generated by the training of an instrumented build
+        with "llvm-profdata".
+
+        Parameters
+        ----------
+        profile_dir : str
+            Profile directory of the built variant."""
+        from glob import glob
+        from os.path import join
+        from subprocess import run
+
+        raw_profiles = sorted(glob(join(profile_dir, "*.profraw")))
+        if not raw_profiles:
+            raise RuntimeError(f"No raw profile generated in {profile_dir}")
+
+        run(
+            self._llvm_profdata()
+            + ["merge", f"-output={join(profile_dir, 'default.profdata')}"]
+            + raw_profiles,
+            check=True,
+        )
+
+    def _llvm_profdata(self):
+        """Finds the "llvm-profdata" command matching the current Clang.
+
+        Returns
+        -------
+        list of str
+            Command."""
+        from os.path import dirname, join
+        from shutil import which
+        from compilertools._utils import find_compiler, run_coroutine
+
+        commands = []
+        probe = run_coroutine(find_compiler("clang"))
+        if probe is not None:
+            commands.append(join(dirname(probe["path"]), "llvm-profdata"))
+        if self.version:
+            commands.append(f"llvm-profdata-{int(self.version)}")
+        commands.append("llvm-profdata")
+
+        for command in commands:
+            path = which(command)
+            if path:
+                return [path]
+
+        if which("xcrun"):
+            # macOS: Clang tools are not in "PATH"
+            return ["xcrun", "llvm-profdata"]
+        raise RuntimeError('"llvm-profdata" not found')
+
     def _compile_args_matrix(self, arch, cpu):
         """Returns available Clang compiler options for the specified CPU architecture.
 
@@ -79,31 +213,39 @@ class Compiler(_CompilerBase):
 
         # Architecture specific optimisations
         if arch == "x86_64":
+            levels = self._x86_64_levels(cpu, 12.0, {2: 0.0, 3: 0.0, 4: 3.9})
+            avx512 = self._avx512_families(cpu, {"skx": 3.9, "icl": 6.0, "spr": 14.0})
             args += [
                 # CPU Generic optimisations
                 [self.Arg(args="-m64")],
                 # CPU Instructions sets
                 [
+                    avx512["spr"],
+                    avx512["icl"],
+                    avx512["skx"],
+                    levels[4],
                     self.Arg(
                         args=["-mavx512cd", "-mavx512f"],
                         suffix="avx512",
                         import_if=(
                             "AVX512F" in cpu.features
                             and "AVX512CD" in cpu.features
-                            and cpu.os_supports_xsave
+                            and cpu.os_supports_avx512
                         ),
                         build_if=self.version >= 3.9,
                     ),
+                    levels[3],
                     self.Arg(
                         args="-mavx2",
                         suffix="avx2",
-                        import_if=("AVX2" in cpu.features and cpu.os_supports_xsave),
+                        import_if=("AVX2" in cpu.features and cpu.os_supports_avx),
                     ),
                     self.Arg(
                         args="-mavx",
                         suffix="avx",
-                        import_if=("AVX" in cpu.features and cpu.os_supports_xsave),
+                        import_if=("AVX" in cpu.features and cpu.os_supports_avx),
                     ),
+                    levels[2],
                     self.Arg(),
                 ],
             ]
@@ -117,12 +259,12 @@ class Compiler(_CompilerBase):
                     self.Arg(
                         args=["-mfpmath=sse", "-mavx2"],
                         suffix="avx2",
-                        import_if=("AVX2" in cpu.features and cpu.os_supports_xsave),
+                        import_if=("AVX2" in cpu.features and cpu.os_supports_avx),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-mavx"],
                         suffix="avx",
-                        import_if=("AVX" in cpu.features and cpu.os_supports_xsave),
+                        import_if=("AVX" in cpu.features and cpu.os_supports_avx),
                     ),
                     self.Arg(
                         args=["-mfpmath=sse", "-msse4"],
@@ -183,7 +325,11 @@ class Compiler(_CompilerBase):
         -------
         str
             Best compiler arguments for current machine."""
-        args = ["-O3 -march=native -flto"]
+        march = self._microarchitecture(cpu, _MARCH_VERSIONS)
+        if march:
+            args = [f"-O3 -march={march} -mtune={march} -flto"]
+        else:
+            args = ["-O3 -march=native -flto"]
 
         if arch == "x86_32":
             args.append("-m32")
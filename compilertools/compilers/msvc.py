@@ -18,7 +18,19 @@ class Compiler(_CompilerBase):
         dict
             Keys are options names, values are dict of arguments with keys in
             {'link', 'compile'}."""
-        return {"fast_fpmath": {"compile": "/fp:fast"}}
+        return {
+            "fast_fpmath": {"compile": "/fp:fast"},
+            "cpu_cache": {"compile": self._cpu_cache_args},
+        }
+
+    def _cpu_cache_args(self):
+        """Returns current machine CPU caches and cores preprocessor macros arguments.
+
+        Returns
+        -------
+        list of str
+            Arguments."""
+        return self._cpu_cache_macros(self._cpu_cache_values(), "/D")
 
     @_CompilerBase._memoized_property
     def api(self):
@@ -83,7 +95,7 @@ class Compiler(_CompilerBase):
                     suffix="avx2",
                     import_if=(
                         "AVX2" in cpu.features
-                        and cpu.os_supports_xsave
+                        and cpu.os_supports_avx
                         and self.version >= 12.0
                     ),
                     build_if=self.version >= 12.0,
@@ -93,7 +105,7 @@ class Compiler(_CompilerBase):
                     suffix="avx",
                     import_if=(
                         "AVX" in cpu.features
-                        and cpu.os_supports_xsave
+                        and cpu.os_supports_avx
                         and self.version >= 10.0
                     ),
                     build_if=self.version >= 10.0,
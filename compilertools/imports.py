@@ -1,16 +1,430 @@
 """Import machinery"""
 
 import sys as _sys
-from os.path import join as _join
-from os.path import isfile as _isfile
-from importlib.abc import MetaPathFinder as _MetaPathFinder
+from os import environ as _environ, listdir as _listdir, stat as _stat
+from os.path import dirname as _dirname, join as _join
+from time import perf_counter as _perf_counter
 import importlib.machinery as _machinery
+from compilertools._config import CONFIG as _CONFIG
 
-__all__ = ["ARCH_SUFFIXES", "update_extensions_suffixes"]
+__all__ = [
+    "ARCH_SUFFIXES",
+    "update_extensions_suffixes",
+    "register",
+    "autotune",
+    "run_autotune",
+    "get_autotune_results",
+    "enable_statistics",
+    "get_statistics",
+    "dump_statistics",
+]
 
 #: Current arch compatibles suffixes
+#: (Lazily populated on the first import of an optimized module)
 ARCH_SUFFIXES = []
 _PROCESSED_COMPILERS = set()
+_INITIALIZED = False
+_DIRECTORIES_CACHE = {}
+_VARIANTS_NAMES_CACHE = {}
+_REGISTERED_NAMES = set()
+_MARKED_NAMES_CACHE = []
+_MANIFESTS_CACHE = {}
+_STATISTICS = None
+_OVERRIDES = None
+_EXCLUDED_SUFFIXES = set()
+_BAD_VARIANTS = None
+_FINGERPRINT = None
+_SELFTESTS = None
+_AUTOTUNE = None
+_AUTOTUNE_BENCHMARKS = {}
+
+#: True in subprocesses started to test or benchmark variants
+_VARIANT_SUBPROCESS = bool(_environ.get("COMPILERTOOLS_VARIANT_SUBPROCESS"))
+
+#: Imports a variant in a subprocess, from the module name, file path and "sys.path"
+_VARIANT_IMPORT_SCRIPT = """
+import sys
+from importlib.machinery import ExtensionFileLoader
+from importlib.util import spec_from_loader, module_from_spec
+
+fullname, path = sys.argv[1:3]
+sys.path[:] = sys.argv[4:]
+loader = ExtensionFileLoader(fullname, path)
+module = module_from_spec(spec_from_loader(fullname, loader))
+sys.modules[fullname] = module
+loader.exec_module(module)
+"""
+
+#: Variant self-test script
+_SELFTEST_SCRIPT = (
+    _VARIANT_IMPORT_SCRIPT
+    + """
+selftest = getattr(module, "_compilertools_selftest", None)
+if selftest is not None:
+    selftest()
+"""
+)
+
+#: Variant benchmark script, the benchmark "module:function" is the third argument
+_BENCHMARK_SCRIPT = (
+    _VARIANT_IMPORT_SCRIPT
+    + """
+from importlib import import_module
+from timeit import repeat
+
+module_name, _, function_name = sys.argv[3].partition(":")
+function = import_module(module_name)
+for name in function_name.split("."):
+    function = getattr(function, name)
+function(module)
+print(min(repeat(lambda: function(module), number=1, repeat=5)))
+"""
+)
+
+
+def register(*names):
+    """Registers packages with optimized variants, so the import hook looks for
+    optimized variants of their modules.
+
+    Packages built with "compilertools.build" are automatically registered from
+    the "<package>.<distribution>.compilertools.json" variants manifest written next
+    to them on build.
+
+    Other modules are ignored by the import hook, except if
+    'compilertools._config.CONFIG["imports_global"]' is True or if their variant is
+    forced (See "_overrides").
+
+    Parameters
+    ----------
+    *names : str
+        Top level packages or modules names."""
+    _REGISTERED_NAMES.update(name.partition(".")[0] for name in names)
+
+
+def autotune(fullname, benchmark):
+    """Enables variants autotuning for a module.
+
+    The first time the module is imported on a machine, each compatible variant is
+    imported in a subprocess and benchmarked. The fastest variant is then imported,
+    on this import and on next ones (Results are stored in the persistent cache by
+    machine fingerprint). Next processes import the fastest variant from stored
+    results even if they do not call this function, but only processes calling it
+    benchmark again new variants. The module package is registered (See
+    "register").
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    benchmark : str or callable
+        Benchmark function, or its "module:function" path. It is called with the
+        variant module as argument and must be importable in a subprocess."""
+    if callable(benchmark):
+        benchmark = f"{benchmark.__module__}:{benchmark.__qualname__}"
+    _AUTOTUNE_BENCHMARKS[fullname] = benchmark
+    register(fullname)
+
+
+def get_autotune_results():
+    """Returns variants autotuning results on current machine.
+
+    Returns
+    -------
+    dict
+        Keys are modules full names, values are dicts with "benchmark" (Benchmark
+        function path) and "timings" (Benchmark time in seconds by variant suffix, None
+        if the benchmark failed) keys."""
+    return _autotune_cache()["results"]
+
+
+def run_autotune(fullname, benchmark=None):
+    """Runs variants autotuning of a module, replacing previous results.
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    benchmark : str or callable
+        Benchmark function, or its "module:function" path (See "autotune"). Default
+        to the previous one.
+
+    Returns
+    -------
+    dict or None
+        Result (See "get_autotune_results"). None if the module has no variant."""
+    from importlib import import_module
+
+    results = _autotune_cache()["results"]
+    if benchmark is None:
+        benchmark = _AUTOTUNE_BENCHMARKS.get(fullname) or results.get(
+            fullname, {}
+        ).get("benchmark")
+        if not benchmark:
+            raise ValueError(f"No benchmark for {fullname}")
+    autotune(fullname, benchmark)
+    results.pop(fullname, None)
+    _dump_machine_cache_result("autotune", fullname, None)
+
+    parent = fullname.rpartition(".")[0]
+    _ExtensionFileFinder().find_spec(
+        fullname, import_module(parent).__path__ if parent else None
+    )
+    return results.get(fullname)
+
+
+def enable_statistics(enabled=True):
+    """Enables or disables import hook statistics recording.
+
+    Statistics can also be enabled on "compilertools" import by setting the
+    "COMPILERTOOLS_IMPORT_STATS" environment variable to a non empty value. In this
+    case, they are also written on "sys.stderr" at exit (See "dump_statistics").
+
+    Parameters
+    ----------
+    enabled : bool
+        If True, starts recording (Previous records are kept if already enabled). If
+        False, stops recording and clears records."""
+    global _STATISTICS
+    if not enabled:
+        _STATISTICS = None
+    elif _STATISTICS is None:
+        _STATISTICS = {
+            "modules": {},
+            "finder_calls": 0,
+            "finder_time": 0.0,
+            "probes": 0,
+            "detection": {},
+        }
+
+
+def get_statistics():
+    """Returns import hook statistics.
+
+    Returns
+    -------
+    dict or None
+        None if statistics are not enabled (See "enable_statistics"), else a dict with
+        following keys:
+        "modules": Dict of records by module full name, for modules from registered
+        packages. Each record is a dict with "time" (Time spent in the finder, in
+        seconds), "probes" (Number of file system calls), "candidates" (Compatible
+        suffixes with a variant file, by priority order), "suffix" and "variant"
+        (Selected suffix and file path, or None), "reason" (Selection result),
+        "rejected" (Reason by suffix for variants not selected), "selftest_time"
+        and "autotune_time" (Time spent in variants self-tests and benchmarks, in
+        seconds) keys.
+        "finder_calls": Number of modules searched by the import hook.
+        "finder_time": Total time spent in the import hook, in seconds.
+        "probes": Total number of file system calls.
+        "detection": Dict by compiler name of "compiler_time" (Compiler detection)
+        and "suffixes_time" (CPU detection and compatible suffixes computation) times,
+        in seconds.
+        "overrides": Variants selection overrides (See "_overrides"), None if not
+        loaded yet."""
+    if _STATISTICS is not None:
+        _STATISTICS["overrides"] = _OVERRIDES
+    return _STATISTICS
+
+
+def dump_statistics(file=None):
+    """Writes import hook statistics as text, like "python -X importtime" does.
+
+    Parameters
+    ----------
+    file : file-like object
+        Output file. Default to "sys.stderr"."""
+    statistics = _STATISTICS
+    if statistics is None:
+        return
+    file = file or _sys.stderr
+    prefix = "compilertools import:"
+
+    print(f"{prefix} time [us] | probes | module | variant", file=file)
+    for fullname, record in statistics["modules"].items():
+        variant = record["variant"] or f"({record['reason']})"
+        print(
+            f"{prefix} {record['time'] * 1e6:>9.0f} | {record['probes']:>6} | "
+            f"{fullname} | {variant}",
+            file=file,
+        )
+        for suffix, reason in record["rejected"].items():
+            print(f"{prefix} {'':>9} | {'':>6} |   {suffix}: {reason}", file=file)
+
+    print(f"{prefix} time [us] | detection", file=file)
+    for name, times in statistics["detection"].items():
+        for key in ("compiler_time", "suffixes_time"):
+            print(f"{prefix} {times[key] * 1e6:>9.0f} | {name} {key[:-5]}", file=file)
+
+    print(
+        f"{prefix} {statistics['finder_time'] * 1e6:>9.0f} | total "
+        f"({statistics['finder_calls']} lookups, {statistics['probes']} probes)",
+        file=file,
+    )
+
+
+def _add_probes(count=1):
+    """Counts file system calls, if statistics are enabled.
+
+    Parameters
+    ----------
+    count : int
+        Number of calls."""
+    if _STATISTICS is not None:
+        _STATISTICS["probes"] += count
+
+
+def _config_files():
+    """Returns import hook configuration files paths, by increasing priority.
+
+    The system file is "/etc/compilertools/config.json" ("%PROGRAMDATA%" on Windows).
+    The user file is "$COMPILERTOOLS_CONFIG" if set, else
+    "$XDG_CONFIG_HOME/compilertools/config.json" on Unix,
+    "~/Library/Application Support/compilertools/config.json" on macOS and
+    "%APPDATA%/compilertools/config.json" on Windows.
+
+    Returns
+    -------
+    list of str
+        Files paths."""
+    from os.path import expanduser
+
+    if _sys.platform == "win32":
+        system_dir = _environ.get("PROGRAMDATA")
+        user_dir = _environ.get("APPDATA") or expanduser("~")
+    elif _sys.platform == "darwin":
+        system_dir = "/etc"
+        user_dir = expanduser(_join("~", "Library", "Application Support"))
+    else:
+        system_dir = "/etc"
+        user_dir = _environ.get("XDG_CONFIG_HOME") or expanduser(_join("~", ".config"))
+
+    files = [_join(system_dir, "compilertools", "config.json")] if system_dir else []
+    files.append(
+        _environ.get("COMPILERTOOLS_CONFIG")
+        or _join(user_dir, "compilertools", "config.json")
+    )
+    return files
+
+
+def _overrides():
+    """Returns variants selection overrides.
+
+    Overrides are read once by process from configuration files (See "_config_files")
+    then from environment variables, that take precedence:
+
+    - "max_isa" ("$COMPILERTOOLS_MAX_ISA"): Instruction set ceiling (Like "avx2").
+      Variants of instruction sets ordered before it in the compiler arguments matrix
+      are not imported. A warning is logged if the compiler has no such instruction
+      set.
+    - "exclude_suffixes" ("$COMPILERTOOLS_EXCLUDE_SUFFIXES", comma separated):
+      Suffixes (Like "avx512_spr-intel") or suffixes parts (Like "avx512_spr") of
+      variants to not import.
+    - "force_variants" ("$COMPILERTOOLS_FORCE_VARIANT", comma separated
+      "module:suffix"): Suffix of the variant to import by module full name, even if
+      not compatible with current machine. "generic" imports the not optimized
+      module.
+
+    Returns
+    -------
+    dict
+        Overrides."""
+    global _OVERRIDES
+    if _OVERRIDES is not None:
+        return _OVERRIDES
+
+    # Modules imported while reading overrides are not overridden
+    _OVERRIDES = {"max_isa": None, "exclude_suffixes": [], "force_variants": {}}
+
+    overrides = {"max_isa": None, "exclude_suffixes": [], "force_variants": {}}
+    for path in _config_files():
+        try:
+            with open(path, "rt") as file:
+                # Not imported if there is no configuration file ("json" imports "re")
+                from json import load
+
+                content = load(file)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(content, dict):
+            continue
+        if isinstance(content.get("max_isa"), str):
+            overrides["max_isa"] = content["max_isa"]
+        if isinstance(content.get("exclude_suffixes"), list):
+            overrides["exclude_suffixes"] = [
+                str(suffix) for suffix in content["exclude_suffixes"]
+            ]
+        if isinstance(content.get("force_variants"), dict):
+            overrides["force_variants"].update(
+                (str(name), str(suffix))
+                for name, suffix in content["force_variants"].items()
+            )
+
+    max_isa = _environ.get("COMPILERTOOLS_MAX_ISA")
+    if max_isa is not None:
+        overrides["max_isa"] = max_isa.strip() or None
+
+    exclude_suffixes = _environ.get("COMPILERTOOLS_EXCLUDE_SUFFIXES")
+    if exclude_suffixes is not None:
+        overrides["exclude_suffixes"] = [
+            suffix.strip() for suffix in exclude_suffixes.split(",") if suffix.strip()
+        ]
+
+    for item in _environ.get("COMPILERTOOLS_FORCE_VARIANT", "").split(","):
+        name, _, suffix = item.partition(":")
+        if name.strip() and suffix.strip():
+            overrides["force_variants"][name.strip()] = suffix.strip()
+
+    _OVERRIDES = overrides
+    return overrides
+
+
+def _filter_args(compiler, args):
+    """Removes arguments excluded by overrides (See "_overrides").
+
+    Parameters
+    ----------
+    compiler : compilertools.compilers.CompilerBase subclass
+        Compiler.
+    args : collections.OrderedDict
+        Current machine compatibles arguments, by suffix.
+
+    Returns
+    -------
+    collections.OrderedDict
+        Arguments."""
+    overrides = _overrides()
+    excluded = set(overrides["exclude_suffixes"])
+    max_isa = overrides["max_isa"]
+    if max_isa:
+        # Instructions sets are ordered by decreasing priority in the matrix
+        names = list(compiler.compile_args())
+        for index, name in enumerate(names):
+            if max_isa in name.split("-"):
+                excluded.update(names[:index])
+                break
+        else:
+            if _CONFIG.get("logging", True):
+                from logging import getLogger
+
+                getLogger("compilertools").warning(
+                    "Compilertools: Unknown instruction set ceiling %r for compiler "
+                    "%r, ignored.",
+                    max_isa,
+                    compiler.name,
+                )
+
+    if not excluded:
+        return args
+
+    filtered = args.__class__()
+    for name, value in args.items():
+        if name in excluded or excluded.intersection(name.split("-")):
+            _EXCLUDED_SUFFIXES.update(
+                f".{name}{extension}" for extension in _machinery.EXTENSION_SUFFIXES
+            )
+        else:
+            filtered[name] = value
+    return filtered
 
 
 def update_extensions_suffixes(compiler):
@@ -28,15 +442,23 @@ def update_extensions_suffixes(compiler):
         log_exception,
     )
 
+    statistics = _STATISTICS
     try:
-
+        start = _perf_counter()
         compiler = get_compiler(compiler)
+        compiler_time = _perf_counter()
 
         suffixes = suffix_from_args(
-            get_compile_args(compiler, current_machine=True),
+            _filter_args(compiler, get_compile_args(compiler, current_machine=True)),
             _machinery.EXTENSION_SUFFIXES,
         )
 
+        if statistics is not None:
+            statistics["detection"][compiler.name] = {
+                "compiler_time": compiler_time - start,
+                "suffixes_time": _perf_counter() - compiler_time,
+            }
+
         suffixes_index = ARCH_SUFFIXES.index
         suffixes_insert = ARCH_SUFFIXES.insert
         index = 0
@@ -55,39 +477,1041 @@ def update_extensions_suffixes(compiler):
         log_exception()
 
 
-update_extensions_suffixes(None)
+def _init_extensions_suffixes(compiler=None):
+    """Updates file extensions suffixes with ones from the default compiler on first
+    call, and with ones from a compiler if not already processed.
+
+    This is deferred until an optimized module is imported, to not add CPU and compiler
+    detection cost on "compilertools" import.
+
+    Parameters
+    ----------
+    compiler : str or None
+        Compiler name from the module sidecar file or variants manifest. If None, uses
+        only default compiler name on current platform."""
+    global _INITIALIZED
+    if not _INITIALIZED:
+        _INITIALIZED = True
+        update_extensions_suffixes(None)
+
+    if compiler is not None and compiler not in _PROCESSED_COMPILERS:
+        update_extensions_suffixes(compiler)
+
+
+def _directory_entries(directory):
+    """Returns entries of a directory.
+
+    The result is cached and updated only if the directory modification time changed
+    or if "importlib.invalidate_caches" was called.
+
+    Parameters
+    ----------
+    directory : str
+        Directory path.
+
+    Returns
+    -------
+    frozenset of str
+        Entries names."""
+    directory = directory or "."
+    _add_probes()
+    try:
+        mtime = _stat(directory).st_mtime_ns
+    except OSError:
+        return frozenset()
+
+    try:
+        cached_mtime, entries = _DIRECTORIES_CACHE[directory]
+    except KeyError:
+        pass
+    else:
+        if cached_mtime == mtime:
+            return entries
+
+    _add_probes()
+    try:
+        entries = frozenset(_listdir(directory))
+    except OSError:
+        entries = frozenset()
+
+    _DIRECTORIES_CACHE[directory] = mtime, entries
+    return entries
+
+
+def _variants_names(directory, entries):
+    """Returns names of modules with optimized variants files in a directory.
+
+    The result is cached and updated only if the directory entries changed.
+
+    Parameters
+    ----------
+    directory : str
+        Directory path.
+    entries : frozenset of str
+        Directory entries, from "_directory_entries".
+
+    Returns
+    -------
+    set of str
+        Modules names."""
+    try:
+        cached_entries, names = _VARIANTS_NAMES_CACHE[directory]
+    except KeyError:
+        pass
+    else:
+        if cached_entries is entries:
+            return names
+
+    extensions = sorted(_machinery.EXTENSION_SUFFIXES, key=len, reverse=True)
+    names = set()
+    add_name = names.add
+    for entry in entries:
+        for extension in extensions:
+            if entry.endswith(extension):
+                # "name.suffix.ext" is a variant of "name"
+                parts = entry[: -len(extension)].split(".")
+                for index in range(1, len(parts)):
+                    add_name(".".join(parts[:index]))
+                break
+
+    _VARIANTS_NAMES_CACHE[directory] = entries, names
+    return names
+
+
+def _marked_names():
+    """Returns names of top level packages and modules with variants manifests
+    ("<name>.compilertools.json" or "<name>.<distribution>.compilertools.json") or a
+    compiler file ("<name>.compilertools") in "sys.path".
+
+    The result is cached and updated only if "sys.path" changed or if
+    "importlib.invalidate_caches" was called.
+
+    Returns
+    -------
+    dict
+        Keys are packages and modules names, values are lists of variants manifests
+        paths by "sys.path" priority order (Empty if no manifest)."""
+    try:
+        sys_path, names = _MARKED_NAMES_CACHE
+    except ValueError:
+        pass
+    else:
+        if sys_path == _sys.path:
+            return names
+
+    names = {}
+    for path_entry in _sys.path:
+        manifests = []
+        for entry in _directory_entries(path_entry):
+            if entry.endswith(".compilertools.json"):
+                # Namespace packages may have a manifest by distribution
+                manifests.append(entry)
+            elif entry.endswith(".compilertools"):
+                names.setdefault(entry[: -len(".compilertools")], [])
+        for entry in sorted(manifests):
+            names.setdefault(entry.partition(".")[0], []).append(
+                _join(path_entry or ".", entry)
+            )
+
+    _MARKED_NAMES_CACHE[:] = list(_sys.path), names
+    return names
+
+
+def _load_manifest(path):
+    """Returns a variants manifest content.
+
+    The result is cached until "importlib.invalidate_caches" is called.
+
+    Parameters
+    ----------
+    path : str
+        Manifest path.
+
+    Returns
+    -------
+    dict or None
+        Manifest content (See "compilertools.build._variants_manifests"). None if
+        the manifest is not readable."""
+    try:
+        return _MANIFESTS_CACHE[path]
+    except KeyError:
+        pass
+
+    from json import load
+
+    _add_probes()
+    try:
+        with open(path, "rt") as file:
+            manifest = load(file)
+    except (OSError, ValueError):
+        manifest = None
+    else:
+        if not (
+            isinstance(manifest, dict)
+            and isinstance(manifest.get("compiler"), str)
+            and isinstance(manifest.get("modules"), dict)
+        ):
+            manifest = None
+
+    _MANIFESTS_CACHE[path] = manifest
+    return manifest
+
+
+def _directory_variants(name, directories):
+    """Returns suffixes of all optimized variants files of a module.
+
+    Parameters
+    ----------
+    name : str
+        Module name.
+    directories : list of tuple
+        Directories paths and entries.
+
+    Returns
+    -------
+    set of str
+        Suffixes."""
+    extensions = _machinery.EXTENSION_SUFFIXES
+    prefix = f"{name}."
+    suffixes = set()
+    for _, entries in directories:
+        for entry in entries:
+            if entry.startswith(prefix):
+                suffix = entry[len(name) :]
+                if suffix not in extensions and suffix.endswith(tuple(extensions)):
+                    suffixes.add(suffix)
+    return suffixes
+
 
+def _record_selection(record, variants, suffix, forced=None):
+    """Records the variant selection result in import hook statistics.
 
-class _ExtensionFileFinder(_MetaPathFinder):
-    """Path finder for extensions with architecture specific optimizations"""
+    Parameters
+    ----------
+    record : dict
+        Module statistics record.
+    variants : iterable of str
+        Suffixes of all optimized variants of the module.
+    suffix : str or None
+        Selected suffix, None if no variant was selected.
+    forced : list of str or None
+        Forced variant suffixes (See "_overrides")."""
+    candidates = [candidate for candidate in ARCH_SUFFIXES if candidate in variants]
+    record["candidates"] = candidates
+    record["suffix"] = suffix
+    rejected = record["rejected"]
+    for variant in candidates:
+        if variant != suffix:
+            rejected.setdefault(variant, "lower priority")
+    for variant in sorted(set(variants).difference(candidates)):
+        if variant == suffix:
+            continue
+        elif variant in _EXCLUDED_SUFFIXES:
+            rejected[variant] = "excluded by overrides"
+        elif variant in _machinery.EXTENSION_SUFFIXES:
+            # Not optimized module, listed in variants manifests
+            rejected[variant] = "generic module"
+        else:
+            rejected[variant] = "not compatible with current machine"
 
-    def find_spec(self, fullname, *args, path=None, **kwargs):
+    if forced and suffix in forced:
+        record["reason"] = "forced variant"
+    elif suffix is not None:
+        record["reason"] = "highest priority compatible variant"
+    elif variants:
+        record["reason"] = "no compatible variant"
+    else:
+        record["reason"] = "no variant files"
+    if forced and suffix not in forced:
+        record["reason"] += " (forced variant not found)"
+
+
+def _bad_variants():
+    """Returns variants files that failed to load.
+
+    The result is read once by process from the persistent cache (See
+    "compilertools._cache").
+
+    Returns
+    -------
+    dict
+        Keys are files paths, values are files "[st_mtime_ns, st_size]" on failure."""
+    global _BAD_VARIANTS
+    if _BAD_VARIANTS is None:
+        from compilertools._cache import load_cache
+
+        _BAD_VARIANTS = load_cache("bad_variants") or {}
+    return _BAD_VARIANTS
+
+
+def _is_bad_variant(file_path):
+    """Returns True if a variant file failed to load and was not modified since.
+
+    Parameters
+    ----------
+    file_path : str
+        Variant file path.
+
+    Returns
+    -------
+    bool
+        True if bad variant."""
+    try:
+        signature = _bad_variants()[file_path]
+    except KeyError:
+        return False
+    _add_probes()
+    try:
+        stat = _stat(file_path)
+    except OSError:
+        return False
+    return signature == [stat.st_mtime_ns, stat.st_size]
+
+
+def _add_bad_variant(file_path):
+    """Stores a variant file that failed to load, so other processes skip it.
+
+    Parameters
+    ----------
+    file_path : str
+        Variant file path."""
+    from compilertools._cache import load_cache, dump_cache
+
+    try:
+        stat = _stat(file_path)
+    except OSError:
+        return
+    signature = [stat.st_mtime_ns, stat.st_size]
+    _bad_variants()[file_path] = signature
+
+    # Reloaded to keep files added by other processes
+    content = load_cache("bad_variants") or {}
+    content[file_path] = signature
+    dump_cache("bad_variants", content)
+
+
+def _fingerprint():
+    """Returns the current machine fingerprint.
+
+    Returns
+    -------
+    str
+        Fingerprint (See "compilertools.processors.ProcessorBase.fingerprint")."""
+    global _FINGERPRINT
+    if _FINGERPRINT is None:
+        from compilertools.processors import get_processor
+
+        _FINGERPRINT = get_processor(None, current_machine=True)["fingerprint"] or ""
+    return _FINGERPRINT
+
+
+def _load_machine_cache(name):
+    """Returns a persistent cache content, reset if the machine fingerprint changed.
+
+    Parameters
+    ----------
+    name : str
+        Cache name.
+
+    Returns
+    -------
+    dict
+        Cache content with "fingerprint" and "results" keys."""
+    from compilertools._cache import load_cache
+
+    fingerprint = _fingerprint()
+    cache = load_cache(name) or {}
+    if cache.get("fingerprint") != fingerprint or not isinstance(
+        cache.get("results"), dict
+    ):
+        cache = {"fingerprint": fingerprint, "results": {}}
+    return cache
+
+
+def _dump_machine_cache_result(name, key, value):
+    """Stores a result in a persistent cache, keeping results added by other
+    processes.
+
+    Parameters
+    ----------
+    name : str
+        Cache name.
+    key : str
+        Result key.
+    value : object
+        Result. If None, removes the result."""
+    from compilertools._cache import dump_cache
+
+    cache = _load_machine_cache(name)
+    if value is None:
+        cache["results"].pop(key, None)
+    else:
+        cache["results"][key] = value
+    dump_cache(name, cache)
+
+
+def _selftests():
+    """Returns variants self-tests results on current machine.
+
+    The result is read once by process from the persistent cache (See
+    "compilertools._cache") and is reset if the machine fingerprint changed.
+
+    Returns
+    -------
+    dict
+        Cache content. "results" keys are files paths, values are files
+        "[st_mtime_ns, st_size, passed, message]"."""
+    global _SELFTESTS
+    if _SELFTESTS is None:
+        _SELFTESTS = _load_machine_cache("selftests")
+    return _SELFTESTS
+
+
+def _run_variant_script(script, fullname, file_path, argument="", timeout=60):
+    """Runs a script that imports a variant in a Python subprocess.
+
+    Parameters
+    ----------
+    script : str
+        Script source (See "_VARIANT_IMPORT_SCRIPT").
+    fullname : str
+        Module full name.
+    file_path : str
+        Variant file path.
+    argument : str
+        Extra script argument.
+    timeout : float
+        Timeout in seconds.
+
+    Returns
+    -------
+    stdout : str or None
+        Subprocess standard output. None if the subprocess failed.
+    message : str
+        Failure description."""
+    from subprocess import run, DEVNULL, PIPE, TimeoutExpired
+
+    environ = dict(_environ)
+    environ["COMPILERTOOLS_VARIANT_SUBPROCESS"] = "1"
+    try:
+        process = run(
+            [_sys.executable, "-c", script, fullname, file_path, argument]
+            + _sys.path,
+            stdin=DEVNULL,
+            stdout=PIPE,
+            stderr=PIPE,
+            env=environ,
+            timeout=timeout,
+            universal_newlines=True,
+        )
+    except TimeoutExpired:
+        return None, f"timeout after {timeout}s"
+    except OSError as exception:
+        return None, str(exception)
+
+    returncode = process.returncode
+    if not returncode:
+        return process.stdout, ""
+    elif returncode < 0:
+        from signal import Signals
+
+        try:
+            return None, f"killed by {Signals(-returncode).name}"
+        except ValueError:
+            return None, f"killed by signal {-returncode}"
+    lines = process.stderr.strip().splitlines()
+    return None, lines[-1] if lines else f"exit code {returncode}"
+
+
+def _run_selftest(fullname, file_path):
+    """Imports a variant in a subprocess, then calls its "_compilertools_selftest"
+    function if any.
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    file_path : str
+        Variant file path.
+
+    Returns
+    -------
+    passed : bool
+        True if the subprocess exited successfully.
+    message : str
+        Failure description."""
+    stdout, message = _run_variant_script(_SELFTEST_SCRIPT, fullname, file_path)
+    return stdout is not None, message
+
+
+def _passes_selftest(fullname, file_path, record):
+    """Returns True if a variant passes the self-test on current machine.
+
+    The self-test runs only the first time a variant is selected on a machine, its
+    result is stored in the persistent cache.
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    file_path : str
+        Variant file path.
+    record : dict or None
+        Statistics record to update (See "get_statistics").
+
+    Returns
+    -------
+    bool
+        True if passed."""
+    _add_probes()
+    try:
+        stat = _stat(file_path)
+    except OSError:
+        return False
+    signature = [stat.st_mtime_ns, stat.st_size]
+
+    results = _selftests()["results"]
+    try:
+        result = results[file_path]
+    except KeyError:
+        result = None
+
+    if result is None or result[:2] != signature:
+        start = _perf_counter()
+        result = signature + list(_run_selftest(fullname, file_path))
+        if record is not None:
+            record["selftest_time"] += _perf_counter() - start
+        results[file_path] = result
+        _dump_machine_cache_result("selftests", file_path, result)
+
+    return result[2]
+
+
+def _autotune_cache():
+    """Returns variants autotuning results on current machine.
+
+    The result is read once by process from the persistent cache (See
+    "compilertools._cache") and is reset if the machine fingerprint changed.
+
+    Returns
+    -------
+    dict
+        Cache content (See "get_autotune_results" for "results")."""
+    global _AUTOTUNE
+    if _AUTOTUNE is None:
+        _AUTOTUNE = _load_machine_cache("autotune")
+    return _AUTOTUNE
+
+
+def _run_benchmark(fullname, file_path, benchmark):
+    """Benchmarks a variant in a subprocess.
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    file_path : str
+        Variant file path.
+    benchmark : str
+        Benchmark function "module:function" path.
+
+    Returns
+    -------
+    float or None
+        Best benchmark time in seconds. None if the benchmark failed."""
+    stdout, _ = _run_variant_script(
+        _BENCHMARK_SCRIPT, fullname, file_path, benchmark, timeout=600
+    )
+    try:
+        return float(stdout.strip().splitlines()[-1])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+def _autotuned_files(fullname, files, record):
+    """Returns variants files ordered by benchmark time.
+
+    If the module autotuning is enabled in this process (See "autotune"), variants
+    are benchmarked if the module has no autotuning result on current machine, if
+    the benchmark changed or if a variant was not benchmarked. Else, the stored
+    result is used as is.
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    files : iterator of tuple of str
+        Variants suffixes and files paths, by priority order.
+    record : dict or None
+        Statistics record to update (See "get_statistics").
+
+    Returns
+    -------
+    list of tuple of str
+        Suffixes and files paths. Variants with a failed benchmark or not
+        benchmarked are last."""
+    files = list(files)
+    benchmark = _AUTOTUNE_BENCHMARKS.get(fullname)
+    results = _autotune_cache()["results"]
+    result = results.get(fullname)
+    if benchmark is None:
+        if not isinstance(result, dict) or not isinstance(result.get("timings"), dict):
+            return files
+    elif (
+        not isinstance(result, dict)
+        or result.get("benchmark") != benchmark
+        or not isinstance(result.get("timings"), dict)
+        or any(suffix not in result["timings"] for suffix, _ in files)
+    ):
+        start = _perf_counter()
+        result = {
+            "benchmark": benchmark,
+            "timings": {
+                suffix: _run_benchmark(fullname, file_path, benchmark)
+                for suffix, file_path in files
+            },
+        }
+        if record is not None:
+            record["autotune_time"] += _perf_counter() - start
+        results[fullname] = result
+        _dump_machine_cache_result("autotune", fullname, result)
+
+    timings = result["timings"]
+    return sorted(
+        files,
+        key=lambda file: (timings.get(file[0]) is None, timings.get(file[0]) or 0.0),
+    )
+
+
+def _directory_files(name, directories, suffixes):
+    """Yields variants files of a module found in directories.
+
+    Parameters
+    ----------
+    name : str
+        Module name.
+    directories : list of tuple
+        Directories paths and entries.
+    suffixes : list of str
+        Suffixes by priority order.
+
+    Yields
+    ------
+    tuple of str
+        Suffix and file path."""
+    for suffix in suffixes:
+        file_name = f"{name}{suffix}"
+        for path_entry, entries in directories:
+            if file_name in entries:
+                yield suffix, _join(path_entry, file_name)
+
+
+def _manifest_files(variants, directory, suffixes, record):
+    """Yields existing variants files of a module from a variants manifest.
+
+    Parameters
+    ----------
+    variants : dict
+        Variants files relative paths by suffix, from the manifest.
+    directory : str
+        Directory containing the manifest.
+    suffixes : list of str
+        Suffixes by priority order.
+    record : dict or None
+        Statistics record to update (See "get_statistics").
+
+    Yields
+    ------
+    tuple of str
+        Suffix and file path."""
+    for suffix in suffixes:
+        try:
+            file_name = variants[suffix]
+        except KeyError:
+            continue
+        file_path = _join(directory, *file_name.split("/"))
+        _add_probes()
+        try:
+            _stat(file_path)
+        except OSError:
+            if record is not None:
+                record["rejected"][suffix] = "file not found"
+            continue
+        yield suffix, file_path
+
+
+def _usable_files(fullname, files, record):
+    """Yields variants files, skipping ones that failed to load previously or that
+    fail the self-test (If 'compilertools._config.CONFIG["imports_selftest"]' is
+    True).
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    files : iterator of tuple of str
+        Suffixes and files paths.
+    record : dict or None
+        Statistics record to update (See "get_statistics").
+
+    Yields
+    ------
+    tuple of str
+        Suffix and file path."""
+    for suffix, file_path in files:
+        if _is_bad_variant(file_path):
+            if record is not None:
+                record["rejected"][suffix] = "failed to load previously"
+            continue
+        if (
+            _CONFIG.get("imports_selftest", False)
+            and not _VARIANT_SUBPROCESS
+            and not _passes_selftest(fullname, file_path, record)
+        ):
+            if record is not None:
+                message = _selftests()["results"].get(file_path, [""] * 4)[3]
+                record["rejected"][suffix] = f"failed self-test: {message}"
+            continue
+        yield suffix, file_path
+
+
+class _VariantFileLoader(_machinery.ExtensionFileLoader):
+    """Extension file loader that falls back to the next compatible variant, then
+    to the generic module, if a variant file fails to load (Like a missing shared
+    library symbol or a corrupted file). Errors raised by the module itself on
+    initialization are raised.
+
+    Failing variants are stored in the persistent cache and skipped by next
+    processes until modified.
+
+    Parameters
+    ----------
+    fullname : str
+        Module full name.
+    path : str
+        Variant file path.
+    suffix : str
+        Variant suffix.
+    files : iterator of tuple of str
+        Next variants suffixes and files paths, by priority order.
+    parent_path : list of str or None
+        Parent package "__path__", None for top level modules.
+    record : dict or None
+        Statistics record to update (See "get_statistics")."""
+
+    def __init__(self, fullname, path, suffix, files, parent_path, record):
+        super().__init__(fullname, path)
+        self._suffix = suffix
+        self._files = files
+        self._parent_path = parent_path
+        self._record = record
+
+    def create_module(self, spec):
+        """Creates the module from the first variant that loads.
+
+        See importlib.abc.Loader.create_module for more information."""
+        from compilertools._core import log_exception
+
+        while True:
+            try:
+                return super().create_module(spec)
+            except (ImportError, OSError) as exception:
+                # Errors raised by the module initialization (Like a missing Python
+                # dependency) are not specific to the variant file
+                if self.path not in (
+                    getattr(exception, "path", None),
+                    getattr(exception, "filename", None),
+                ):
+                    raise
+                log_exception()
+                _add_bad_variant(self.path)
+                record = self._record
+                if record is not None:
+                    record["rejected"][self._suffix] = f"failed to load: {exception}"
+                    record["reason"] = "next variant after load failure"
+
+                try:
+                    self._suffix, self.path = next(self._files)
+                except StopIteration:
+                    generic = _machinery.PathFinder.find_spec(
+                        self.name, self._parent_path
+                    )
+                    if generic is None:
+                        raise
+                    # Following import steps use the generic module loader
+                    spec.loader = generic.loader
+                    spec.origin = generic.origin
+                    spec.has_location = generic.has_location
+                    spec.cached = generic.cached
+                    spec.loader_state = generic.loader_state
+                    spec.submodule_search_locations = (
+                        generic.submodule_search_locations
+                    )
+                    if record is not None:
+                        record["reason"] = "generic module after load failure"
+                        record["suffix"] = None
+                        record["variant"] = generic.origin
+                    return generic.loader.create_module(generic)
+
+                spec.origin = self.path
+                if record is not None:
+                    record["suffix"] = self._suffix
+                    record["variant"] = self.path
+
+
+class _ExtensionFileFinder:
+    """Path finder for extensions with architecture specific optimizations
+
+    Implements the "importlib.abc.MetaPathFinder" interface without inheriting from it
+    to avoid importing "importlib.abc" on startup.
+
+    Directories listings are cached, like "importlib.machinery.FileFinder" does, so
+    files lookups do not require a "stat" call by file.
+
+    Top level modules are searched in "sys.path", submodules are searched in the
+    parent package "__path__" (Including namespace packages).
+
+    Only modules from registered packages are searched (See "register")."""
+
+    @staticmethod
+    def invalidate_caches():
+        """Clears directories listings caches, and compiler arguments cache if
+        compilers are loaded.
+
+        See importlib.abc.MetaPathFinder.invalidate_caches for more information."""
+        _DIRECTORIES_CACHE.clear()
+        _VARIANTS_NAMES_CACHE.clear()
+        _MARKED_NAMES_CACHE.clear()
+        _MANIFESTS_CACHE.clear()
+
+        # Compilers are not imported only for that
+        compilers = _sys.modules.get("compilertools.compilers._core")
+        if compilers is not None:
+            compilers.clear_compile_args_cache()
+
+    def find_spec(self, fullname, path=None, target=None):
         """Finds module spec using new arch specific suffixes
 
         See importlib.abc.MetaPathFinder.find_spec for more information."""
-        sys_paths = _sys.path
+        statistics = _STATISTICS
+        if statistics is None:
+            return self._find_spec(fullname, path, None)
+
+        record = {
+            "time": 0.0,
+            "probes": 0,
+            "candidates": [],
+            "suffix": None,
+            "variant": None,
+            "reason": "not registered",
+            "rejected": {},
+            "selftest_time": 0.0,
+            "autotune_time": 0.0,
+        }
+        probes = statistics["probes"]
+        start = _perf_counter()
+        try:
+            return self._find_spec(fullname, path, record)
+        finally:
+            elapsed = _perf_counter() - start
+            statistics["finder_calls"] += 1
+            statistics["finder_time"] += elapsed
+            if record["reason"] != "not registered":
+                record["time"] = elapsed
+                record["probes"] = statistics["probes"] - probes
+                statistics["modules"][fullname] = record
+
+    def _find_spec(self, fullname, path, record):
+        """Finds module spec using new arch specific suffixes
+
+        Parameters
+        ----------
+        fullname : str
+            Module full name.
+        path : list of str or None
+            Parent package "__path__", None for top level modules.
+        record : dict or None
+            Statistics record to update (See "get_statistics"), None if statistics
+            are disabled.
+
+        Returns
+        -------
+        importlib.machinery.ModuleSpec or None
+            Module spec. None if the module has no variant."""
+        top_name = fullname.partition(".")[0]
+        forced = _overrides()["force_variants"].get(fullname)
+        marked_names = _marked_names()
+        if (
+            top_name not in _REGISTERED_NAMES
+            and not _CONFIG.get("imports_global", False)
+            and forced is None
+            and top_name not in marked_names
+        ):
+            return None
+
+        if forced == "generic":
+            if record is not None:
+                record["reason"] = "forced generic module"
+            return None
+        elif forced:
+            forced = [f".{forced}{ext}" for ext in _machinery.EXTENSION_SUFFIXES]
+
+        # Modules not in manifests (Like modules of another distribution sharing the
+        # namespace package) are looked up in directories
+        for manifest_path in marked_names.get(top_name, ()):
+            manifest = _load_manifest(manifest_path)
+            if manifest is not None and fullname in manifest["modules"]:
+                return self._find_spec_from_manifest(
+                    fullname, path, manifest, _dirname(manifest_path), record, forced
+                )
+
+        parent_path = path
+        if path is None:
+            name = fullname
+            path = _sys.path
+        else:
+            name = fullname.rpartition(".")[2]
+        directories = [(entry, _directory_entries(entry)) for entry in path]
 
-        file_name = f"{fullname}.compilertools"
-        for sys_path in sys_paths:
-            file_path = _join(sys_path, file_name)
-            if _isfile(file_path):
-                with open(file_path, "rt") as file:
+        file_name = f"{name}.compilertools"
+        for directory in directories:
+            path_entry, entries = directory
+            if file_name in entries:
+                _add_probes()
+                with open(_join(path_entry, file_name), "rt") as file:
                     compiler = file.read()
 
-                if compiler not in _PROCESSED_COMPILERS:
-                    update_extensions_suffixes(compiler)
+                _init_extensions_suffixes(compiler)
 
-                sys_paths = [sys_path]
+                directories = [directory]
                 break
 
-        for suffix in ARCH_SUFFIXES:
-            file_name = f"{fullname}{suffix}"
-            for sys_path in sys_paths:
-                file_path = _join(sys_path, file_name)
-                if _isfile(file_path):
-                    loader = _machinery.ExtensionFileLoader(fullname, file_path)
-                    return _machinery.ModuleSpec(fullname, loader, origin=file_path)
+        else:
+            if not _INITIALIZED:
+                for path_entry, entries in directories:
+                    if name in _variants_names(path_entry, entries):
+                        _init_extensions_suffixes()
+                        break
+                else:
+                    if record is not None:
+                        record["reason"] = "no variant files"
+                    return None
+
+        if forced:
+            # Compatible suffixes are used if the forced variant is not found
+            _init_extensions_suffixes()
+            suffixes = forced + ARCH_SUFFIXES
+        else:
+            suffixes = ARCH_SUFFIXES
+
+        return self._variant_spec(
+            fullname,
+            parent_path,
+            _directory_files(name, directories, suffixes),
+            record,
+            _directory_variants(name, directories) if record is not None else (),
+            forced,
+        )
+
+    @staticmethod
+    def _variant_spec(fullname, parent_path, files, record, variants, forced):
+        """Returns the module spec of the first usable variant file.
+
+        Parameters
+        ----------
+        fullname : str
+            Module full name.
+        parent_path : list of str or None
+            Parent package "__path__", None for top level modules.
+        files : iterator of tuple of str
+            Variants suffixes and files paths, by priority order.
+        record : dict or None
+            Statistics record to update (See "get_statistics").
+        variants : iterable of str
+            Suffixes of all variants of the module (Only used for statistics).
+        forced : list of str or None
+            Forced variant suffixes (See "_overrides").
+
+        Returns
+        -------
+        importlib.machinery.ModuleSpec or None
+            Module spec. None if the module has no usable variant."""
+        files = _usable_files(fullname, files, record)
+
+        # Autotuning results from previous processes are also used
+        autotuned = (
+            not forced
+            and not _VARIANT_SUBPROCESS
+            and (
+                fullname in _AUTOTUNE_BENCHMARKS
+                or fullname in _autotune_cache()["results"]
+            )
+        )
+        if autotuned:
+            files = iter(_autotuned_files(fullname, files, record))
+
+        for suffix, file_path in files:
+            if record is not None:
+                _record_selection(record, variants, suffix, forced)
+                record["variant"] = file_path
+                if autotuned:
+                    record["reason"] = "fastest variant (autotuning)"
+            loader = _VariantFileLoader(
+                fullname, file_path, suffix, files, parent_path, record
+            )
+            return _machinery.ModuleSpec(fullname, loader, origin=file_path)
+
+        if record is not None:
+            _record_selection(record, variants, None, forced)
         return None
 
+    def _find_spec_from_manifest(
+        self, fullname, parent_path, manifest, directory, record=None, forced=None
+    ):
+        """Finds module spec using a variants manifest.
+
+        Manifest variants are tried by "ARCH_SUFFIXES" priority order: Compatibility
+        with the current machine is evaluated from the manifest compiler arguments
+        matrix, files are not looked up.
+
+        Parameters
+        ----------
+        fullname : str
+            Module full name.
+        parent_path : list of str or None
+            Parent package "__path__", None for top level modules.
+        manifest : dict
+            Variants manifest, listing the module.
+        directory : str
+            Directory containing the manifest.
+        record : dict or None
+            Statistics record to update (See "get_statistics").
+        forced : list of str or None
+            Forced variant suffixes (See "_overrides").
+
+        Returns
+        -------
+        importlib.machinery.ModuleSpec or None
+            Module spec. None if the module has no variant."""
+        variants = manifest["modules"][fullname]
+        compiler = manifest["compiler"]
+        _init_extensions_suffixes(compiler)
+
+        suffixes = forced + ARCH_SUFFIXES if forced else ARCH_SUFFIXES
+        return self._variant_spec(
+            fullname,
+            parent_path,
+            _manifest_files(variants, directory, suffixes, record),
+            record,
+            variants,
+            forced,
+        )
+
 
 _sys.meta_path.insert(0, _ExtensionFileFinder())
+
+if _environ.get("COMPILERTOOLS_IMPORT_STATS"):
+    from atexit import register as _register_exit
+
+    enable_statistics()
+    _register_exit(dump_statistics)
@@ -1,11 +1,15 @@
 """Base class and functions for CPU"""
 
+from functools import wraps
 from platform import machine
 from compilertools._utils import import_class, BaseClass
 from compilertools._config import CONFIG
 
 __all__ = ["ProcessorBase", "get_processor", "get_arch"]
 
+#: Linux CPU information directory
+_SYSFS_CPU = "/sys/devices/system/cpu"
+
 
 def get_arch(arch=None):
     """Checks architecture name and returns fixed name.
@@ -70,6 +74,89 @@ class ProcessorBase(BaseClass):
         self._default["vendor"] = ""
         self._default["brand"] = ""
         self._default["features"] = []
+        self._default["fingerprint"] = ""
+        self._default["caches"] = {}
+        self._default["logical_cores"] = 0
+        self._default["physical_cores"] = 0
+        self._default["threads_per_core"] = 1
+        self._default["microarchitecture"] = ""
+        self._default["microarchitectures"] = []
+        self._persistent_cache = None
+
+    @staticmethod
+    def _persistent_property(class_property):
+        """Property decorator with memoization and persistent cache.
+
+        On current machine, values are stored on disk and reused by next processes while
+        the "fingerprint" property value and the compilertools version do not change
+        (Only if the detection is slower than reading the cache, see
+        "_persistent_cache_enabled")."""
+
+        @wraps(class_property)
+        def _property(self):
+            if not self.current_machine:
+                return class_property(self)
+
+            cache = self._get_persistent_cache()
+            key = class_property.__name__
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+
+            value = class_property(self)
+            if value is not None and cache:
+                from compilertools._cache import dump_cache
+
+                cache[key] = value
+                dump_cache(f"processor_{self.arch}", cache)
+            return value
+
+        return BaseClass._memoized_property(_property)
+
+    def __delitem__(self, key):
+        if self._persistent_cache:
+            self._persistent_cache.pop(key, None)
+        return BaseClass.__delitem__(self, key)
+
+    def _persistent_cache_enabled(self):
+        """Returns True if current machine detection results are stored in the
+        persistent cache.
+
+        Subclasses can return False if the detection is faster than reading the cache.
+
+        Returns
+        -------
+        bool
+            True if enabled."""
+        return True
+
+    def _get_persistent_cache(self):
+        """Returns the persistent cache content for the current machine.
+
+        Returns
+        -------
+        dict
+            Cache content. Empty if the machine has no fingerprint."""
+        if self._persistent_cache is None:
+            cache = {}
+            fingerprint = (
+                CONFIG.get("cache", True)
+                and self._persistent_cache_enabled()
+                and self["fingerprint"]
+            )
+            if fingerprint:
+                from compilertools._cache import load_cache
+                from compilertools._version import __version__
+
+                cache = load_cache(f"processor_{self.arch}") or cache
+                if (
+                    cache.get("fingerprint") != fingerprint
+                    or cache.get("version") != __version__
+                ):
+                    cache = {"fingerprint": fingerprint, "version": __version__}
+            self._persistent_cache = cache
+        return self._persistent_cache
 
     @BaseClass._memoized_property
     def arch(self):
@@ -80,3 +167,165 @@ class ProcessorBase(BaseClass):
         str
             Architecture name."""
         return self.__module__.rsplit(".", 1)[-1]
+
+    @BaseClass._memoized_property
+    def caches(self):
+        """CPU caches of the first logical processor.
+
+        Returns
+        -------
+        dict
+            Keys are caches names ("L1d", "L1i", "L2", "L3", ...), values are dicts
+            with "size" (In bytes), "line_size" (In bytes) and "shared_threads"
+            (Number of logical processors sharing the cache) keys."""
+        if not self.current_machine:
+            return
+
+        return _sysfs_caches()
+
+    @BaseClass._memoized_property
+    def logical_cores(self):
+        """Number of logical processors available to the current process.
+
+        Returns
+        -------
+        int
+            Logical processors."""
+        if not self.current_machine:
+            return
+
+        try:
+            from os import sched_getaffinity
+
+            return len(sched_getaffinity(0))
+        except ImportError:
+            from os import cpu_count
+
+            return cpu_count()
+
+    @BaseClass._memoized_property
+    def threads_per_core(self):
+        """Number of logical processors per physical core (More than 1 if SMT is
+        enabled).
+
+        Returns
+        -------
+        int
+            Logical processors per physical core."""
+        if not self.current_machine:
+            return
+
+        return _sysfs_threads_per_core()
+
+    @BaseClass._memoized_property
+    def physical_cores(self):
+        """Number of physical cores available to the current process.
+
+        Returns
+        -------
+        int
+            Physical cores."""
+        if not self.current_machine:
+            return
+
+        return max(1, self["logical_cores"] // (self["threads_per_core"] or 1))
+
+
+def _read_sysfs(path):
+    """Reads a Linux sysfs file.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+
+    Returns
+    -------
+    str or None
+        Content. None if not available."""
+    try:
+        with open(path, "rt") as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def _count_cpu_list(cpu_list):
+    """Counts processors in a Linux CPU list ("0-3,8-11" format).
+
+    Parameters
+    ----------
+    cpu_list : str or None
+        CPU list.
+
+    Returns
+    -------
+    int or None
+        Processors count. None if no list."""
+    if not cpu_list:
+        return None
+
+    count = 0
+    for cpu_range in cpu_list.split(","):
+        first, _, last = cpu_range.partition("-")
+        count += int(last) - int(first) + 1 if last else 1
+    return count
+
+
+def _sysfs_threads_per_core():
+    """Returns the number of logical processors per physical core from Linux sysfs.
+
+    Returns
+    -------
+    int or None
+        Logical processors per physical core. None if not available."""
+    return _count_cpu_list(
+        _read_sysfs(f"{_SYSFS_CPU}/cpu0/topology/thread_siblings_list")
+    )
+
+
+def _sysfs_caches(cpu_dir=f"{_SYSFS_CPU}/cpu0"):
+    """Returns CPU caches from Linux sysfs.
+
+    Parameters
+    ----------
+    cpu_dir : str
+        Logical processor directory.
+
+    Returns
+    -------
+    dict or None
+        Caches. See "ProcessorBase.caches". None if not available."""
+    from os import listdir
+    from os.path import join
+
+    cache_dir = join(cpu_dir, "cache")
+    try:
+        indexes = sorted(listdir(cache_dir))
+    except OSError:
+        return None
+
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    types = {"Data": "d", "Instruction": "i", "Unified": ""}
+    caches = {}
+    for index in indexes:
+        if not index.startswith("index"):
+            continue
+        path = join(cache_dir, index)
+        level = _read_sysfs(join(path, "level"))
+        size = _read_sysfs(join(path, "size"))
+        try:
+            name = f"L{level}{types[_read_sysfs(join(path, 'type'))]}"
+            size = int(size[:-1]) * units[size[-1]] if size[-1] in units else int(size)
+            line_size = int(_read_sysfs(join(path, "coherency_line_size")))
+        except (KeyError, TypeError, ValueError, IndexError):
+            continue
+        caches[name] = {
+            "size": size,
+            "line_size": line_size,
+            "shared_threads": _count_cpu_list(
+                _read_sysfs(join(path, "shared_cpu_list"))
+            )
+            or 1,
+        }
+    return caches or None
@@ -1,8 +1,418 @@
 """X86-32 Processors"""
+from functools import lru_cache as _lru_cache
 from compilertools.processors import ProcessorBase as _ProcessorBase
 
 __all__ = ["Processor", "Cpuid"]
 
+#: CPUID features bits description:
+#: {(eax, ecx): {register_name: {bit: feature}}}
+#:
+#: Reference: Linux kernel "arch/x86/include/asm/cpufeatures.h"
+_FEATURE_BITS = {
+    # Intel
+    (1, 0): {
+        "edx": {
+            0: "FPU",
+            1: "VME",
+            2: "DE",
+            3: "PSE",
+            4: "TSC",
+            5: "MSR",
+            6: "PAE",
+            7: "MCE",
+            8: "CX8",
+            9: "APIC",
+            11: "SEP",
+            12: "MTRR",
+            13: "PGE",
+            14: "MCA",
+            15: "CMOV",
+            16: "PAT",
+            17: "PSE36",
+            18: "PN",
+            19: "CLFLUSH",
+            21: "DS",
+            22: "ACPI",
+            23: "MMX",
+            24: "FXSR",
+            25: "SSE",
+            26: "SSE2",
+            27: "SS",
+            28: "HT",
+            29: "TM",
+            30: "IA64",
+            31: "PBE",
+        },
+        "ecx": {
+            0: "SSE3",
+            1: "PCLMULQDQ",
+            2: "DTES64",
+            3: "MONITOR",
+            4: "DS_CPL",
+            5: "VMX",
+            6: "SMX",
+            7: "EST",
+            8: "TM2",
+            9: "SSSE3",
+            10: "CID",
+            11: "SDBG",
+            12: "FMA",
+            13: "CX16",
+            14: "XTPR",
+            15: "PDCM",
+            17: "PCID",
+            18: "DCA",
+            19: "SSE4_1",
+            20: "SSE4_2",
+            21: "X2APIC",
+            22: "MOVBE",
+            23: "POPCNT",
+            24: "TSC_DEADLINE_TIMER",
+            25: "AES",
+            26: "XSAVE",
+            27: "OSXSAVE",
+            28: "AVX",
+            29: "F16C",
+            30: "RDRAND",
+            31: "HYPERVISOR",
+        },
+    },
+    # Intel structured extended
+    (7, 0): {
+        "ebx": {
+            0: "FSGSBASE",
+            1: "TSC_ADJUST",
+            3: "BMI1",
+            4: "HLE",
+            5: "AVX2",
+            7: "SMEP",
+            8: "BMI2",
+            9: "ERMS",
+            10: "INVPCID",
+            11: "RTM",
+            12: "CQM",
+            14: "MPX",
+            15: "RDT_A",
+            16: "AVX512F",
+            17: "AVX512DQ",
+            18: "RDSEED",
+            19: "ADX",
+            20: "SMAP",
+            21: "AVX512IFMA",
+            23: "CLFLUSHOPT",
+            24: "CLWB",
+            26: "AVX512PF",
+            27: "AVX512ER",
+            28: "AVX512CD",
+            29: "SHA_NI",
+            30: "AVX512BW",
+            31: "AVX512VL",
+        },
+        "ecx": {
+            0: "PREFETCHWT1",
+            1: "AVX512VBMI",
+            2: "UMIP",
+            3: "PKU",
+            4: "OSPKE",
+            6: "AVX512_VBMI2",
+            8: "GFNI",
+            9: "VAES",
+            10: "VPCLMULQDQ",
+            11: "AVX512_VNNI",
+            12: "AVX512_BITALG",
+            14: "AVX512_VPOPCNTDQ",
+            16: "LA57",
+            22: "RDPID",
+            25: "CLDEMOTE",
+            27: "MOVDIRI",
+            28: "MOVDIR64B",
+        },
+        "edx": {
+            2: "AVX512_4VNNIW",
+            3: "AVX512_4FMAPS",
+            4: "FSRM",
+            8: "AVX512_VP2INTERSECT",
+            14: "SERIALIZE",
+            16: "TSXLDTRK",
+            22: "AMX_BF16",
+            23: "AVX512_FP16",
+            24: "AMX_TILE",
+            25: "AMX_INT8",
+        },
+    },
+    (7, 1): {"eax": {4: "AVX_VNNI", 5: "AVX512_BF16"}},
+    # AMD
+    (0x80000001, 0): {
+        "edx": {
+            11: "SYSCALL",
+            19: "MP",
+            20: "NX",
+            22: "MMXEXT",
+            25: "FXSR_OPT",
+            26: "PDPE1GB",
+            27: "RDTSCP",
+            29: "LM",
+            30: "3DNOWEXT",
+            31: "3DNOW",
+        },
+        "ecx": {
+            0: "LAHF_LM",
+            1: "CMP_LEGACY",
+            2: "SVM",
+            3: "EXTAPIC",
+            4: "CR8_LEGACY",
+            5: "ABM",
+            6: "SSE4A",
+            7: "MISALIGNSSE",
+            8: "3DNOWPREFETCH",
+            9: "OSVW",
+            10: "IBS",
+            11: "XOP",
+            12: "SKINIT",
+            13: "WDT",
+            15: "LWP",
+            16: "FMA4",
+            17: "TCE",
+            19: "NODEID_MSR",
+            21: "TBM",
+            22: "TOPOEXT",
+            23: "PERFCTR_CORE",
+            24: "PERFCTR_NB",
+            26: "BPEXT",
+            27: "PTSC",
+            28: "PERFCTR_LLC",
+            29: "MWAITX",
+        },
+    },
+}
+
+#: Linux "/proc/cpuinfo" flags names that are not the lower case feature name
+_LINUX_FLAGS = {"pni": "SSE3", "dts": "DS"}
+
+#: Linux "getauxval" types
+_AT_HWCAP = 16
+_AT_HWCAP2 = 26
+
+#: x86 microarchitectures, named as GCC and Clang "-march" values:
+#: {name: (parent, features)}
+#:
+#: "parent" is an older microarchitecture with a subset of the instructions sets.
+#: "features" are features, in addition to parent ones, that are required to use
+#: the microarchitecture.
+_MICROARCHITECTURES = {
+    # Intel
+    "nehalem": (None, {"SSSE3", "SSE4_1", "SSE4_2", "POPCNT", "CX16"}),
+    "westmere": ("nehalem", {"AES", "PCLMULQDQ"}),
+    "sandybridge": ("westmere", {"AVX"}),
+    "ivybridge": ("sandybridge", {"F16C", "RDRAND", "FSGSBASE"}),
+    "haswell": ("ivybridge", {"AVX2", "BMI1", "BMI2", "FMA", "MOVBE"}),
+    "broadwell": ("haswell", {"ADX", "RDSEED"}),
+    "skylake": ("broadwell", {"CLFLUSHOPT"}),
+    "skylake-avx512": (
+        "skylake",
+        {"AVX512F", "AVX512CD", "AVX512BW", "AVX512DQ", "AVX512VL", "CLWB", "PKU"},
+    ),
+    "cascadelake": ("skylake-avx512", {"AVX512_VNNI"}),
+    "cooperlake": ("cascadelake", {"AVX512_BF16"}),
+    "cannonlake": ("skylake-avx512", {"AVX512IFMA", "AVX512VBMI", "SHA_NI"}),
+    "icelake-client": (
+        "cannonlake",
+        {
+            "AVX512_VBMI2",
+            "AVX512_VNNI",
+            "AVX512_BITALG",
+            "AVX512_VPOPCNTDQ",
+            "GFNI",
+            "VAES",
+            "VPCLMULQDQ",
+            "RDPID",
+        },
+    ),
+    "icelake-server": ("icelake-client", set()),
+    "tigerlake": ("icelake-client", set()),
+    "rocketlake": ("icelake-client", set()),
+    "sapphirerapids": (
+        "icelake-server",
+        {"AVX512_BF16", "AVX512_FP16", "AVX_VNNI", "MOVDIRI", "MOVDIR64B"},
+    ),
+    "emeraldrapids": ("sapphirerapids", set()),
+    "graniterapids": ("sapphirerapids", set()),
+    "alderlake": (
+        "skylake",
+        {"GFNI", "VAES", "VPCLMULQDQ", "SHA_NI", "RDPID", "AVX_VNNI", "MOVDIRI"},
+    ),
+    "raptorlake": ("alderlake", set()),
+    "meteorlake": ("alderlake", set()),
+    # Intel Atom
+    "bonnell": (None, {"SSSE3", "MOVBE"}),
+    "silvermont": (
+        "bonnell",
+        {"SSE4_1", "SSE4_2", "POPCNT", "AES", "PCLMULQDQ", "RDRAND"},
+    ),
+    "goldmont": ("silvermont", {"SHA_NI", "RDSEED", "FSGSBASE", "CLFLUSHOPT"}),
+    "goldmont-plus": ("goldmont", {"RDPID"}),
+    "tremont": ("goldmont-plus", {"CLWB", "GFNI"}),
+    # Intel Xeon Phi
+    "knl": ("broadwell", {"AVX512F", "AVX512CD", "AVX512ER", "AVX512PF"}),
+    "knm": ("knl", {"AVX512_4FMAPS", "AVX512_4VNNIW", "AVX512_VPOPCNTDQ"}),
+    # AMD
+    "amdfam10": (None, {"SSE4A", "ABM", "CX16"}),
+    "btver1": ("amdfam10", {"SSSE3"}),
+    "btver2": (
+        "btver1",
+        {"SSE4_1", "SSE4_2", "AES", "PCLMULQDQ", "AVX", "MOVBE", "F16C", "BMI1"},
+    ),
+    "bdver1": (
+        "amdfam10",
+        {"SSSE3", "SSE4_1", "SSE4_2", "AES", "PCLMULQDQ", "AVX", "XOP", "FMA4"},
+    ),
+    "bdver2": ("bdver1", {"FMA", "F16C", "BMI1", "TBM"}),
+    "bdver3": ("bdver2", {"FSGSBASE"}),
+    "bdver4": ("bdver3", {"AVX2", "BMI2", "MOVBE"}),
+    "znver1": (
+        None,
+        {
+            "SSE4A",
+            "ABM",
+            "CX16",
+            "SSSE3",
+            "SSE4_1",
+            "SSE4_2",
+            "POPCNT",
+            "AES",
+            "PCLMULQDQ",
+            "AVX",
+            "AVX2",
+            "FMA",
+            "F16C",
+            "BMI1",
+            "BMI2",
+            "MOVBE",
+            "ADX",
+            "RDSEED",
+            "RDRAND",
+            "SHA_NI",
+            "CLFLUSHOPT",
+            "FSGSBASE",
+        },
+    ),
+    "znver2": ("znver1", {"CLWB", "RDPID"}),
+    "znver3": ("znver2", {"VAES", "VPCLMULQDQ"}),
+    "znver4": (
+        "znver3",
+        {
+            "AVX512F",
+            "AVX512CD",
+            "AVX512BW",
+            "AVX512DQ",
+            "AVX512VL",
+            "AVX512IFMA",
+            "AVX512VBMI",
+            "AVX512_VBMI2",
+            "AVX512_VNNI",
+            "AVX512_BITALG",
+            "AVX512_VPOPCNTDQ",
+            "GFNI",
+        },
+    ),
+    "znver5": ("znver4", set()),
+}
+
+
+#: x86-64 psABI microarchitecture levels: {level: features}
+#: ("features" are features, in addition to previous level ones, that are required)
+_X86_64_LEVELS = {
+    1: {"CMOV", "CX8", "FPU", "FXSR", "MMX", "SYSCALL", "SSE", "SSE2"},
+    2: {"CX16", "LAHF_LM", "POPCNT", "SSE3", "SSE4_1", "SSE4_2", "SSSE3"},
+    3: {"AVX", "AVX2", "BMI1", "BMI2", "F16C", "FMA", "ABM", "MOVBE", "OSXSAVE"},
+    4: {"AVX512F", "AVX512BW", "AVX512CD", "AVX512DQ", "AVX512VL"},
+}
+
+
+def _models(*ranges):
+    """Returns models numbers.
+
+    Parameters
+    ----------
+    ranges : tuple of int
+        First and last models of each models range.
+
+    Returns
+    -------
+    iterable of int
+        Models."""
+    from itertools import chain
+
+    return chain(*(range(first, last + 1) for first, last in ranges))
+
+
+#: x86 microarchitectures identification: {(vendor, family): {model: name}}
+_MICROARCHITECTURES_MODELS = {
+    ("GenuineIntel", 6): {
+        **dict.fromkeys((0x1C, 0x26, 0x27, 0x35, 0x36), "bonnell"),
+        **dict.fromkeys((0x37, 0x4A, 0x4C, 0x4D, 0x5A, 0x5D), "silvermont"),
+        **dict.fromkeys((0x5C, 0x5F), "goldmont"),
+        0x7A: "goldmont-plus",
+        **dict.fromkeys((0x86, 0x96, 0x9C), "tremont"),
+        **dict.fromkeys((0x1A, 0x1E, 0x1F, 0x2E), "nehalem"),
+        **dict.fromkeys((0x25, 0x2C, 0x2F), "westmere"),
+        **dict.fromkeys((0x2A, 0x2D), "sandybridge"),
+        **dict.fromkeys((0x3A, 0x3E), "ivybridge"),
+        **dict.fromkeys((0x3C, 0x3F, 0x45, 0x46), "haswell"),
+        **dict.fromkeys((0x3D, 0x47, 0x4F, 0x56), "broadwell"),
+        **dict.fromkeys((0x4E, 0x5E, 0x8E, 0x9E, 0xA5, 0xA6), "skylake"),
+        0x55: "skylake-avx512",
+        0x66: "cannonlake",
+        **dict.fromkeys((0x7D, 0x7E, 0x9D), "icelake-client"),
+        **dict.fromkeys((0x6A, 0x6C), "icelake-server"),
+        **dict.fromkeys((0x8C, 0x8D), "tigerlake"),
+        0xA7: "rocketlake",
+        **dict.fromkeys((0x97, 0x9A, 0xBE), "alderlake"),
+        **dict.fromkeys((0xB7, 0xBA, 0xBF), "raptorlake"),
+        **dict.fromkeys((0xAA, 0xAC), "meteorlake"),
+        0x8F: "sapphirerapids",
+        0xCF: "emeraldrapids",
+        **dict.fromkeys((0xAD, 0xAE), "graniterapids"),
+        0x57: "knl",
+        0x85: "knm",
+    },
+    ("AuthenticAMD", 0x10): dict.fromkeys(range(0x100), "amdfam10"),
+    ("AuthenticAMD", 0x14): dict.fromkeys(range(0x100), "btver1"),
+    ("AuthenticAMD", 0x15): {
+        0x01: "bdver1",
+        **dict.fromkeys(_models((0x02, 0x02), (0x10, 0x1F)), "bdver2"),
+        **dict.fromkeys(_models((0x30, 0x3F)), "bdver3"),
+        **dict.fromkeys(_models((0x60, 0x7F)), "bdver4"),
+    },
+    ("AuthenticAMD", 0x16): dict.fromkeys(range(0x100), "btver2"),
+    ("AuthenticAMD", 0x17): {
+        **dict.fromkeys(_models((0x00, 0x2F)), "znver1"),
+        **dict.fromkeys(_models((0x30, 0xFF)), "znver2"),
+    },
+    ("AuthenticAMD", 0x19): {
+        **dict.fromkeys(_models((0x00, 0x0F), (0x20, 0x5F)), "znver3"),
+        **dict.fromkeys(_models((0x10, 0x1F), (0x60, 0x7F), (0xA0, 0xAF)), "znver4"),
+    },
+    ("AuthenticAMD", 0x1A): dict.fromkeys(range(0x100), "znver5"),
+    ("HygonGenuine", 0x18): dict.fromkeys(range(0x100), "znver1"),
+}
+
+#: CPUID leaf 4 and 0x8000001D caches types names suffixes
+_CACHE_TYPES = {1: "d", 2: "i", 3: ""}
+
+#: Linux "arch_prctl" code to get XSAVE state components supported by the kernel
+_ARCH_GET_XCOMP_SUPP = 0x1021
+
+#: XCR0 bits of XSAVE state components required by instructions sets:
+#: SSE (1), AVX (2), AVX-512 opmask (5), ZMM_Hi256 (6), Hi16_ZMM (7), AMX TILECFG (17)
+#: and AMX TILEDATA (18)
+_XCR0_STATES = {
+    "sse": 0b10,
+    "avx": 0b110,
+    "avx512": 0b11100110,
+    "amx": 0b11 << 17,
+}
+
 
 class Processor(_ProcessorBase):
     """x86-32 CPU"""
@@ -10,9 +420,265 @@ class Processor(_ProcessorBase):
     def __init__(self, current_machine=False):
         _ProcessorBase.__init__(self, current_machine)
         self._default["os_supports_xsave"] = False
+        self._default["cpuid_highest_function"] = 0
+        self._default["family"] = 0
+        self._default["model"] = 0
+        self._default["stepping"] = 0
+        self._default["x86_64_level"] = 0
         self._default["cpuid_highest_extended_function"] = 0
+        self._default["xcr0"] = 0
+        for state in _XCR0_STATES:
+            self._default[f"os_supports_{state}"] = False
+
+    @_ProcessorBase._memoized_property
+    def backend(self):
+        """Current machine CPU information source.
+
+        "cpuid" if the CPUID instruction can be executed (With a JIT compiled
+        function or the Linux "/dev/cpu/*/cpuid" device), else "linux" if the Linux
+        kernel information ("/proc/cpuinfo", "getauxval") is used.
+
+        Returns
+        -------
+        str
+            Backend name."""
+        if not self.current_machine:
+            return
+
+        from sys import platform
+
+        try:
+            Cpuid.batch(())
+        except RuntimeError:
+            if not platform.startswith("linux"):
+                raise
+            return "linux"
+        return "cpuid"
+
+    def _persistent_cache_enabled(self):
+        """Returns True if current machine detection results are stored in the
+        persistent cache.
+
+        The JIT compiled CPUID function reads all registers faster than the cache
+        (And its fingerprint) is read, so only the "/dev/cpu/*/cpuid" device and
+        Linux kernel backends use the cache.
+
+        Returns
+        -------
+        bool
+            True if enabled."""
+        return _cpuid_function() is None
+
+    @_ProcessorBase._memoized_property
+    def fingerprint(self):
+        """Current machine fingerprint, used to invalidate the persistent cache.
+
+        Based on CPUID signature and features (Or Linux kernel CPU information), kernel
+        boot ID and Python ABI.
+
+        Returns
+        -------
+        str
+            Fingerprint."""
+        if not self.current_machine:
+            return
+
+        from importlib.machinery import EXTENSION_SUFFIXES
+
+        if self.backend == "linux":
+            from zlib import crc32
+
+            cpuinfo = _linux_cpuinfo()
+            registers = [
+                crc32(
+                    "\n".join(
+                        cpuinfo.get(key, "")
+                        for key in ("vendor_id", "cpu family", "model", "stepping")
+                    ).encode()
+                ),
+                crc32(cpuinfo.get("flags", "").encode()),
+                _linux_getauxval(_AT_HWCAP),
+                _linux_getauxval(_AT_HWCAP2),
+            ]
+
+        else:
+            registers = []
+            for reg in Cpuid.batch(((0, 0), (1, 0))):
+                registers += reg.registers
+
+            # Ignores the initial APIC ID that depends on the core running the process
+            registers[5] &= 0x00FFFFFF
+
+        try:
+            with open("/proc/sys/kernel/random/boot_id", "rt") as file:
+                boot_id = file.read().strip()
+        except OSError:
+            boot_id = ""
+
+        return "-".join(
+            ["".join(f"{reg:08x}" for reg in registers), boot_id, EXTENSION_SUFFIXES[0]]
+        )
+
+    def _signature(self, key):
+        """Returns a processor signature value.
+
+        Parameters
+        ----------
+        key : str
+            "family", "model" or "stepping".
+
+        Returns
+        -------
+        int or None
+            Value."""
+        if not self.current_machine:
+            return
+
+        if self.backend == "linux":
+            try:
+                return int(_linux_cpuinfo()[{"family": "cpu family"}.get(key, key)])
+            except (KeyError, ValueError):
+                return
+
+        eax = Cpuid(1).eax
+        family = (eax >> 8) & 0xF
+        if key == "family":
+            if family == 0xF:
+                family += (eax >> 20) & 0xFF
+            return family
+        elif key == "model":
+            model = (eax >> 4) & 0xF
+            if family in (0x6, 0xF):
+                model += (eax >> 12) & 0xF0
+            return model
+        return eax & 0xF
+
+    @_ProcessorBase._persistent_property
+    def family(self):
+        """CPU family, from CPUID signature.
+
+        Returns
+        -------
+        int
+            Family."""
+        return self._signature("family")
+
+    @_ProcessorBase._persistent_property
+    def model(self):
+        """CPU model, from CPUID signature.
+
+        Returns
+        -------
+        int
+            Model."""
+        return self._signature("model")
+
+    @_ProcessorBase._persistent_property
+    def stepping(self):
+        """CPU stepping, from CPUID signature.
+
+        Returns
+        -------
+        int
+            Stepping."""
+        return self._signature("stepping")
 
     @_ProcessorBase._memoized_property
+    def microarchitecture(self):
+        """CPU microarchitecture, identified from vendor, family, model and features.
+
+        Returns
+        -------
+        str
+            Microarchitecture name, as GCC and Clang "-march" value. Empty string if
+            unknown."""
+        if not self.current_machine:
+            return
+
+        models = _MICROARCHITECTURES_MODELS.get((self["vendor"], self["family"]), {})
+        name = models.get(self["model"], "")
+
+        if name == "skylake-avx512":
+            # Skylake-SP, Cascade Lake and Cooper Lake share the same model
+            features = self["features"]
+            if "AVX512_BF16" in features:
+                name = "cooperlake"
+            elif "AVX512_VNNI" in features:
+                name = "cascadelake"
+        return name
+
+    @_ProcessorBase._memoized_property
+    def microarchitectures(self):
+        """CPU microarchitecture and its older compatible microarchitectures, that can
+        be used on this machine.
+
+        Microarchitectures with features not available (Like features hidden by a
+        hypervisor) or not supported by the OS are excluded.
+
+        Returns
+        -------
+        list of str
+            Microarchitectures names, from the most specific."""
+        if not self.current_machine:
+            return
+
+        features = self["features"]
+        names = []
+        name = self["microarchitecture"] or None
+        while name is not None:
+            parent, required = _MICROARCHITECTURES[name]
+            names.append((name, required))
+            name = parent
+
+        usable = []
+        required = set()
+        for name, name_required in reversed(names):
+            required |= name_required
+            if (
+                not required.issubset(features)
+                or ("AVX" in required and not self["os_supports_avx"])
+                or ("AVX512F" in required and not self["os_supports_avx512"])
+            ):
+                break
+            usable.insert(0, name)
+        return usable
+
+    @_ProcessorBase._memoized_property
+    def x86_64_level(self):
+        """x86-64 psABI microarchitecture level that can be used on this machine.
+
+        Levels 3 and 4 also require the OS to save AVX and AVX-512 states.
+
+        Returns
+        -------
+        int
+            Level (0 if not x86-64 compatible, 1 for baseline, then 2, 3 or 4)."""
+        if not self.current_machine:
+            return
+
+        features = self["features"]
+        os_supports = {3: self["os_supports_avx"], 4: self["os_supports_avx512"]}
+        current_level = 0
+        for level, required in _X86_64_LEVELS.items():
+            if not required.issubset(features) or not os_supports.get(level, True):
+                break
+            current_level = level
+        return current_level
+
+    @_ProcessorBase._persistent_property
+    def cpuid_highest_function(self):
+        """CPUID highest function.
+
+        Returns
+        -------
+        int
+            Related EAX value for CPUID."""
+        if not self.current_machine or self.backend == "linux":
+            return
+
+        return Cpuid().eax
+
+    @_ProcessorBase._persistent_property
     def cpuid_highest_extended_function(self):
         """CPUID highest extended function.
 
@@ -20,12 +686,12 @@ class Processor(_ProcessorBase):
         -------
         int
             Related EAX value for CPUID."""
-        if not self.current_machine:
+        if not self.current_machine or self.backend == "linux":
             return
 
         return Cpuid(0x80000000).eax
 
-    @_ProcessorBase._memoized_property
+    @_ProcessorBase._persistent_property
     def vendor(self):
         """CPU's manufacturer ID from CPUID.
 
@@ -36,10 +702,13 @@ class Processor(_ProcessorBase):
         if not self.current_machine:
             return
 
+        if self.backend == "linux":
+            return _linux_cpuinfo().get("vendor_id")
+
         reg = Cpuid()
         return Cpuid.registers_to_str(reg.ebx, reg.edx, reg.ecx)
 
-    @_ProcessorBase._memoized_property
+    @_ProcessorBase._persistent_property
     def brand(self):
         """CPU's brand from CPUID
 
@@ -50,16 +719,18 @@ class Processor(_ProcessorBase):
         if not self.current_machine:
             return
 
+        if self.backend == "linux":
+            return _linux_cpuinfo().get("model name")
+
         if self.cpuid_highest_extended_function < 0x80000004:
             return
 
         brand_list = []
-        for eax in (0x80000002, 0x80000003, 0x80000004):
-            reg = Cpuid(eax)
-            brand_list += [reg.eax, reg.ebx, reg.ecx, reg.edx]
+        for reg in Cpuid.batch(((0x80000002, 0), (0x80000003, 0), (0x80000004, 0))):
+            brand_list += reg.registers
         return Cpuid.registers_to_str(*brand_list)
 
-    @_ProcessorBase._memoized_property
+    @_ProcessorBase._persistent_property
     def features(self):
         """CPU's features flags from CPUID
 
@@ -81,180 +752,18 @@ class Processor(_ProcessorBase):
         if not self.current_machine:
             return
 
-        # Feature bits description
-        # feature_bits_desc: {(eax, ecx): registers_dict}
-        # registers_dict: {register_name: feature_dict}
-        # feature_dict: {bit: feature}
-        feature_bits_desc = {
-            # Intel
-            (1, 0): {
-                "edx": {
-                    0: "FPU",
-                    1: "VME",
-                    2: "DE",
-                    3: "PSE",
-                    4: "TSC",
-                    5: "MSR",
-                    6: "PAE",
-                    7: "MCE",
-                    8: "CX8",
-                    9: "APIC",
-                    11: "SEP",
-                    12: "MTRR",
-                    13: "PGE",
-                    14: "MCA",
-                    15: "CMOV",
-                    16: "PAT",
-                    17: "PSE36",
-                    18: "PN",
-                    19: "CLFLUSH",
-                    21: "DS",
-                    22: "ACPI",
-                    23: "MMX",
-                    24: "FXSR",
-                    25: "SSE",
-                    26: "SSE2",
-                    27: "SS",
-                    28: "HT",
-                    29: "TM",
-                    30: "IA64",
-                    31: "PBE",
-                },
-                "ecx": {
-                    0: "SSE3",
-                    1: "PCLMULQDQ",
-                    2: "DTES64",
-                    3: "MONITOR",
-                    4: "DS_CPL",
-                    5: "VMX",
-                    6: "SMX",
-                    7: "EST",
-                    8: "TM2",
-                    9: "SSSE3",
-                    10: "CID",
-                    11: "SDBG",
-                    12: "FMA",
-                    13: "CX16",
-                    14: "XTPR",
-                    15: "PDCM",
-                    17: "PCID",
-                    18: "DCA",
-                    19: "SSE4_1",
-                    20: "SSE4_2",
-                    21: "X2APIC",
-                    22: "MOVBE",
-                    23: "POPCNT",
-                    24: "TSC_DEADLINE_TIMER",
-                    25: "AES",
-                    26: "XSAVE",
-                    27: "OSXSAVE",
-                    28: "AVX",
-                    29: "F16C",
-                    30: "RDRAND",
-                    31: "HYPERVISOR",
-                },
-            },
-            # Intel structured extended
-            (7, 0): {
-                "ebx": {
-                    0: "FSGSBASE",
-                    1: "TSC_ADJUST",
-                    3: "BMI1",
-                    4: "HLE",
-                    5: "AVX2",
-                    7: "SMEP",
-                    8: "BMI2",
-                    9: "ERMS",
-                    10: "INVPCID",
-                    11: "RTM",
-                    12: "CQM",
-                    14: "MPX",
-                    15: "RDT_A",
-                    16: "AVX512F",
-                    17: "AVX512DQ",
-                    18: "RDSEED",
-                    19: "ADX",
-                    20: "SMAP",
-                    21: "AVX512IFMA",
-                    23: "CLFLUSHOPT",
-                    24: "CLWB",
-                    26: "AVX512PF",
-                    27: "AVX512ER",
-                    28: "AVX512CD",
-                    29: "SHA_NI",
-                    30: "AVX512BW",
-                    31: "AVX512VL",
-                },
-                "ecx": {
-                    0: "PREFETCHWT1",
-                    1: "AVX512VBMI",
-                    2: "UMIP",
-                    3: "PKU",
-                    4: "OSPKE",
-                    6: "AVX512_VBMI2",
-                    8: "GFNI",
-                    9: "VAES",
-                    10: "VPCLMULQDQ",
-                    11: "AVX512_VNNI",
-                    12: "AVX512_BITALG",
-                    14: "AVX512_VPOPCNTDQ",
-                    16: "LA57",
-                    22: "RDPID",
-                },
-                "edx": {2: "AVX512_4VNNIW", 3: "AVX512_4FMAPS"},
-            },
-        }
-
-        if self.cpuid_highest_extended_function >= 0x80000001:
-            # AMD
-            feature_bits_desc[(0x80000001, 0)] = {
-                "edx": {
-                    11: "SYSCALL",
-                    19: "MP",
-                    20: "NX",
-                    22: "MMXEXT",
-                    25: "FXSR_OPT",
-                    26: "PDPE1GB",
-                    27: "RDTSCP",
-                    29: "LM",
-                    30: "3DNOWEXT",
-                    31: "3DNOW",
-                },
-                "ecx": {
-                    0: "LAHF_LM",
-                    1: "CMP_LEGACY",
-                    2: "SVM",
-                    3: "EXTAPIC",
-                    4: "CR8_LEGACY",
-                    5: "ABM",
-                    6: "SSE4A",
-                    7: "MISALIGNSSE",
-                    8: "3DNOWPREFETCH",
-                    9: "OSVW",
-                    10: "IBS",
-                    11: "XOP",
-                    12: "SKINIT",
-                    13: "WDT",
-                    15: "LWP",
-                    16: "FMA4",
-                    17: "TCE",
-                    19: "NODEID_MSR",
-                    21: "TBM",
-                    22: "TOPOEXT",
-                    23: "PERFCTR_CORE",
-                    24: "PERFCTR_NB",
-                    26: "BPEXT",
-                    27: "PTSC",
-                    28: "PERFCTR_LLC",
-                    29: "MWAITX",
-                },
-            }
+        if self.backend == "linux":
+            return _linux_features()
 
+        highest_extended_function = self.cpuid_highest_extended_function
         flags = set()
         add_flag = flags.add
-        for eax, ecx in feature_bits_desc:
-            reg = Cpuid(eax, ecx)
-            reg_desc = feature_bits_desc[(eax, ecx)]
+        for reg in Cpuid.batch(
+            leaf
+            for leaf in _FEATURE_BITS
+            if leaf[0] < 0x80000000 or leaf[0] <= highest_extended_function
+        ):
+            reg_desc = _FEATURE_BITS[(reg.eax_value, reg.ecx_value)]
             for exx in reg_desc:
                 bits = getattr(reg, exx)
                 reg_exx = reg_desc[exx]
@@ -263,7 +772,7 @@ class Processor(_ProcessorBase):
                         add_flag(reg_exx[bit])
         return flags
 
-    @_ProcessorBase._memoized_property
+    @_ProcessorBase._persistent_property
     def os_supports_xsave(self):
         """OS and CPU supports XSAVE instruction.
 
@@ -276,6 +785,176 @@ class Processor(_ProcessorBase):
 
         return "XSAVE" in self["features"] and "OSXSAVE" in self["features"]
 
+    @_ProcessorBase._persistent_property
+    def xcr0(self):
+        """XSAVE state components enabled by the OS, from the XCR0 register.
+
+        Read with XGETBV, or on Linux with "arch_prctl" if XGETBV can't be executed
+        (Or from the kernel CPU features flags on Linux older than 5.16).
+
+        Returns
+        -------
+        int
+            XCR0 register value. 0 if XSAVE is not enabled by the OS."""
+        if not self.current_machine:
+            return
+
+        if "OSXSAVE" not in self["features"]:
+            return 0
+
+        xgetbv = _xgetbv_function() if self.backend == "cpuid" else None
+        if xgetbv is not None:
+            return xgetbv(0)
+        return _linux_xcomp_supp() or _linux_features_xcr0()
+
+    @_ProcessorBase._persistent_property
+    def caches(self):
+        """CPU caches of the first logical processor.
+
+        From CPUID leaf 4 (Intel) or 0x8000001D (AMD), or from Linux sysfs if not
+        available.
+
+        Returns
+        -------
+        dict
+            Keys are caches names ("L1d", "L1i", "L2", "L3", ...), values are dicts
+            with "size" (In bytes), "line_size" (In bytes) and "shared_threads"
+            (Number of logical processors sharing the cache) keys."""
+        if not self.current_machine:
+            return
+
+        leaf = None
+        if self.backend == "cpuid":
+            if self["vendor"] in ("AuthenticAMD", "HygonGenuine"):
+                if "TOPOEXT" in self["features"]:
+                    leaf = 0x8000001D
+            elif self["cpuid_highest_function"] >= 4:
+                leaf = 4
+
+        if leaf is None:
+            from compilertools.processors._core import _sysfs_caches
+
+            return _sysfs_caches()
+
+        caches = {}
+        for reg in Cpuid.batch((leaf, index) for index in range(8)):
+            eax = reg.eax
+            cache_type = eax & 0x1F
+            if not cache_type:
+                break
+            elif cache_type not in _CACHE_TYPES:
+                continue
+            ebx = reg.ebx
+            line_size = (ebx & 0xFFF) + 1
+            partitions = ((ebx >> 12) & 0x3FF) + 1
+            ways = (ebx >> 22) + 1
+            caches[f"L{(eax >> 5) & 0x7}{_CACHE_TYPES[cache_type]}"] = {
+                "size": ways * partitions * line_size * (reg.ecx + 1),
+                "line_size": line_size,
+                "shared_threads": ((eax >> 14) & 0xFFF) + 1,
+            }
+        return caches
+
+    @_ProcessorBase._persistent_property
+    def threads_per_core(self):
+        """Number of logical processors per physical core (More than 1 if SMT is
+        enabled).
+
+        From CPUID leaf 0xB, or from Linux sysfs if not available.
+
+        Returns
+        -------
+        int
+            Logical processors per physical core."""
+        if not self.current_machine:
+            return
+
+        if self.backend == "cpuid" and self["cpuid_highest_function"] >= 0xB:
+            reg = Cpuid(0xB, 0)
+
+            # First level type must be SMT
+            if (reg.ecx >> 8) & 0xFF == 1 and reg.ebx & 0xFFFF:
+                return reg.ebx & 0xFFFF
+
+        from compilertools.processors._core import _sysfs_threads_per_core
+
+        return _sysfs_threads_per_core()
+
+    def _os_supports_state(self, state):
+        """Returns True if the OS saves all XSAVE state components of an instruction
+        set.
+
+        Parameters
+        ----------
+        state : str
+            Key of "_XCR0_STATES".
+
+        Returns
+        -------
+        bool
+            Supports if True."""
+        mask = _XCR0_STATES[state]
+        return (self["xcr0"] & mask) == mask
+
+    @_ProcessorBase._memoized_property
+    def os_supports_sse(self):
+        """OS saves SSE registers (XMM) state.
+
+        Returns
+        -------
+        bool
+            Supports if True."""
+        if not self.current_machine:
+            return
+
+        if not self["xcr0"]:
+            # Saved with FXSAVE if the OS does not enable XSAVE
+            return "SSE" in self["features"]
+        return self._os_supports_state("sse")
+
+    @_ProcessorBase._memoized_property
+    def os_supports_avx(self):
+        """OS saves AVX registers (XMM and YMM) state.
+
+        Returns
+        -------
+        bool
+            Supports if True."""
+        if not self.current_machine:
+            return
+
+        return self._os_supports_state("avx")
+
+    @_ProcessorBase._memoized_property
+    def os_supports_avx512(self):
+        """OS saves AVX-512 registers (XMM, YMM, opmask, ZMM_Hi256 and Hi16_ZMM) state.
+
+        Returns
+        -------
+        bool
+            Supports if True."""
+        if not self.current_machine:
+            return
+
+        return self._os_supports_state("avx512")
+
+    @_ProcessorBase._memoized_property
+    def os_supports_amx(self):
+        """OS saves AMX registers (TILECFG and TILEDATA) state.
+
+        On Linux, the process must still request AMX usage permission with
+        "arch_prctl(ARCH_REQ_XCOMP_PERM, XFEATURE_XTILEDATA)" before using AMX
+        instructions.
+
+        Returns
+        -------
+        bool
+            Supports if True."""
+        if not self.current_machine:
+            return
+
+        return self._os_supports_state("amx")
+
 
 class Cpuid:
     """Gets Processor CPUID.
@@ -285,121 +964,75 @@ class Cpuid:
     eax_value : int
         EAX register value
     ecx_value : int
-        ECX register value"""
-
-    def __init__(self, eax_value=0, ecx_value=0):
-        bytecode = []
-        for reg, value in ((0x0, eax_value), (0x1, ecx_value)):
-            if value == 0:
-                # Sets to 0 (XOR reg, reg)
-                bytecode += (
-                    # XOR
-                    b"\x31",
-                    # reg, reg
-                    (0b11000000 | reg | (reg << 3)).to_bytes(1, "little"),
-                )
-            else:
-                # Sets other value (MOV reg, value)
-                bytecode += (
-                    # MOV reg,
-                    (0b10111000 | reg).to_bytes(1, "little"),
-                    # Value
-                    value.to_bytes(4, "little"),
-                )
-
-        self._bytecode_base = b"".join(
-            bytecode
-            +
-            # CPUID
-            [b"\x0F\xA2"]
-        )
+        ECX register value
+    registers : tuple of int
+        EAX, EBX, ECX and EDX registers CPUID results, if already known."""
+
+    def __init__(self, eax_value=0, ecx_value=0, registers=None):
+        self.eax_value = eax_value
+        self.ecx_value = ecx_value
+        self._registers = registers
 
-    def _get_cpuid(self, reg):
-        """Gets specified register CPUID result.
+    @classmethod
+    def batch(cls, leaves):
+        """Gets CPUID results for many leaves with a single function call.
 
         Parameters
         ----------
-        reg : int
-            Register address.
+        leaves : iterable of tuple of int
+            EAX and ECX registers values of each leaf.
 
         Returns
         -------
-        int
-            Raw CPUID Result as unsigned integer."""
-        from platform import system
-        from ctypes import (
-            c_void_p,
-            c_size_t,
-            c_ulong,
-            c_uint32,
-            c_int,
-            CFUNCTYPE,
-            memmove,
-        )
+        list of Cpuid
+            CPUID results, in leaves order."""
+        leaves = tuple(leaves)
+        buffer = cls._execute(leaves)
+        return [
+            cls(eax_value, ecx_value, tuple(buffer[index * 4 : index * 4 + 4]))
+            for index, (eax_value, ecx_value) in enumerate(leaves)
+        ]
 
-        bytecode = [self._bytecode_base]
+    @staticmethod
+    def _execute(leaves):
+        """Executes CPUID for each leaf.
 
-        if reg != 0x0:
-            # MOV EAX, reg
-            bytecode += [
-                # MOV
-                b"\x89",
-                # EAX, reg
-                (0b11000000 | (reg << 3)).to_bytes(1, "little"),
-            ]
+        Parameters
+        ----------
+        leaves : tuple of tuple of int
+            EAX and ECX registers values of each leaf.
 
-        bytecode = b"".join(
-            bytecode
-            +
-            # RET
-            [b"\xC3"]
-        )
+        Returns
+        -------
+        ctypes.c_uint32 array
+            EAX, EBX, ECX and EDX raw CPUID results of each leaf, as unsigned
+            integers."""
+        from ctypes import c_uint32
 
-        is_windows = system() == "Windows"
+        count = len(leaves)
+        buffer = (c_uint32 * (count * 4))()
+        for index, (eax_value, ecx_value) in enumerate(leaves):
+            buffer[index * 4] = eax_value
+            buffer[index * 4 + 1] = ecx_value
 
-        size = len(bytecode)
-        if size < 0x1000:
-            size = 0x1000
+        function = _cpuid_function() or _cpuid_device_function()
+        if function is None:
+            raise RuntimeError("CPUID not available")
+        function(buffer, count)
+        return buffer
 
-        try:
-            if is_windows:
-                from ctypes import windll
-
-                lib = windll.kernel32
-                valloc = lib.VirtualAlloc
-                valloc.argtypes = [c_void_p, c_size_t, c_ulong, c_ulong]
-                args = (None, size, 0x1000, 0x40)
-            else:
-                from ctypes import cdll
-
-                lib = cdll.LoadLibrary(None)
-                mprotect = lib.mprotect
-                valloc = lib.valloc
-                valloc.argtypes = [c_size_t]
-                args = (c_size_t(size),)
-
-            valloc.restype = c_void_p
-            address = valloc(*args)
-            if address == 0:
-                raise RuntimeError("Failed to allocate memory")
-
-            if not is_windows:
-                mprotect.restype = c_int
-                mprotect.argtypes = [c_void_p, c_size_t, c_int]
-                if mprotect(address, size, 1 | 2 | 4) != 0:
-                    raise RuntimeError("Failed to memory protect")
-
-            memmove(address, bytecode, size)
-
-            result = CFUNCTYPE(c_uint32)(address)()
-
-        finally:
-            if is_windows:
-                lib.VirtualFree(c_ulong(address), 0, 0x8000)
-            else:
-                mprotect(address, size, 1 | 2)
-                lib.free(c_void_p(address))
-        return result
+    @property
+    def registers(self):
+        """Get EAX, EBX, ECX and EDX registers CPUID results.
+
+        Returns
+        -------
+        tuple of int
+            Raw registers values."""
+        if self._registers is None:
+            (cpuid,) = self.batch(((self.eax_value, self.ecx_value),))
+            self._registers = cpuid.registers
+        return self._registers
 
     @property
     def eax(self):
@@ -409,7 +1042,7 @@ class Cpuid:
         -------
         int
             Raw EAX register value."""
-        return self._get_cpuid(0x0)
+        return self.registers[0]
 
     @property
     def ebx(self):
@@ -418,8 +1051,8 @@ class Cpuid:
         Returns
         -------
         int
-            Raw EAX register value."""
-        return self._get_cpuid(0x3)
+            Raw EBX register value."""
+        return self.registers[1]
 
     @property
     def ecx(self):
@@ -428,8 +1061,8 @@ class Cpuid:
         Returns
         -------
         int
-            Raw EAX register value."""
-        return self._get_cpuid(0x1)
+            Raw ECX register value."""
+        return self.registers[2]
 
     @property
     def edx(self):
@@ -438,8 +1071,8 @@ class Cpuid:
         Returns
         -------
         int
-            Raw EAX register value."""
-        return self._get_cpuid(0x2)
+            Raw EDX register value."""
+        return self.registers[3]
 
     @staticmethod
     def registers_to_str(*uints):
@@ -457,3 +1090,425 @@ class Cpuid:
         from struct import pack
 
         return pack(f"<{'I' * len(uints)}", *uints).decode("ASCII").strip("\x00 ")
+
+
+def _cpuid_bytecode(is_64bits, is_windows):
+    """Assembles the CPUID function machine code.
+
+    The function signature is "void cpuid(uint32_t *buffer, size_t count)". For each of
+    the "count" leaves, it reads EAX and ECX values from the 4 integers of "buffer"
+    related to the leaf, executes CPUID, and writes back EAX, EBX, ECX and EDX results
+    in place.
+
+    Parameters
+    ----------
+    is_64bits : bool
+        If True, x86-64 code, else x86-32 code.
+    is_windows : bool
+        If True, uses Windows x64 calling convention instead of System V one.
+
+    Returns
+    -------
+    bytes
+        Machine code."""
+    if is_64bits:
+        if is_windows:
+            # PUSH rbx; MOV r8, rcx; MOV r9, rdx
+            prologue = b"\x53\x49\x89\xc8\x49\x89\xd1"
+        else:
+            # PUSH rbx; MOV r8, rdi; MOV r9, rsi
+            prologue = b"\x53\x49\x89\xf8\x49\x89\xf1"
+        # TEST r9, r9
+        test = b"\x4d\x85\xc9"
+        body = (
+            b"\x41\x8b\x00"  # MOV eax, [r8]
+            b"\x41\x8b\x48\x04"  # MOV ecx, [r8+4]
+            b"\x0f\xa2"  # CPUID
+            b"\x41\x89\x00"  # MOV [r8], eax
+            b"\x41\x89\x58\x04"  # MOV [r8+4], ebx
+            b"\x41\x89\x48\x08"  # MOV [r8+8], ecx
+            b"\x41\x89\x50\x0c"  # MOV [r8+12], edx
+            b"\x49\x83\xc0\x10"  # ADD r8, 16
+            b"\x49\xff\xc9"  # DEC r9
+        )
+        # POP rbx; RET
+        epilogue = b"\x5b\xc3"
+
+    else:
+        prologue = (
+            b"\x53\x56\x57"  # PUSH ebx; PUSH esi; PUSH edi
+            b"\x8b\x74\x24\x10"  # MOV esi, [esp+16]
+            b"\x8b\x7c\x24\x14"  # MOV edi, [esp+20]
+        )
+        # TEST edi, edi
+        test = b"\x85\xff"
+        body = (
+            b"\x8b\x06"  # MOV eax, [esi]
+            b"\x8b\x4e\x04"  # MOV ecx, [esi+4]
+            b"\x0f\xa2"  # CPUID
+            b"\x89\x06"  # MOV [esi], eax
+            b"\x89\x5e\x04"  # MOV [esi+4], ebx
+            b"\x89\x4e\x08"  # MOV [esi+8], ecx
+            b"\x89\x56\x0c"  # MOV [esi+12], edx
+            b"\x83\xc6\x10"  # ADD esi, 16
+            b"\x4f"  # DEC edi
+        )
+        # POP edi; POP esi; POP ebx; RET
+        epilogue = b"\x5f\x5e\x5b\xc3"
+
+    # JZ epilogue
+    jump_end = b"\x74" + (len(body) + 2).to_bytes(1, "little")
+
+    # JMP test
+    jump_loop = b"\xeb" + (-(len(test) + len(jump_end) + len(body) + 2)).to_bytes(
+        1, "little", signed=True
+    )
+
+    return b"".join((prologue, test, jump_end, body, jump_loop, epilogue))
+
+
+def _xgetbv_bytecode(is_64bits, is_windows):
+    """Assembles the XGETBV function machine code.
+
+    The function signature is "uint64_t xgetbv(uint32_t index)". It returns the
+    extended control register specified by "index".
+
+    Parameters
+    ----------
+    is_64bits : bool
+        If True, x86-64 code, else x86-32 code.
+    is_windows : bool
+        If True, uses Windows x64 calling convention instead of System V one.
+
+    Returns
+    -------
+    bytes
+        Machine code."""
+    if is_64bits:
+        return b"".join(
+            (
+                b"" if is_windows else b"\x89\xf9",  # MOV ecx, edi
+                b"\x0f\x01\xd0"  # XGETBV
+                b"\x48\xc1\xe2\x20"  # SHL rdx, 32
+                b"\x48\x09\xd0"  # OR rax, rdx
+                b"\xc3",  # RET
+            )
+        )
+
+    return (
+        b"\x8b\x4c\x24\x04"  # MOV ecx, [esp+4]
+        b"\x0f\x01\xd0"  # XGETBV
+        b"\xc3"  # RET
+    )
+
+
+@_lru_cache(maxsize=None)
+def _cpuid_function():
+    """Returns the CPUID function.
+
+    The function is assembled on first call and kept in read and execute only memory
+    for the process lifetime. A failure is also kept, so the assembly is only tried
+    once by process.
+
+    Returns
+    -------
+    ctypes function or None
+        CPUID function. See "_cpuid_bytecode" for signature. None if executable
+        memory is denied (SELinux "execmem", PaX, ...)."""
+    from ctypes import c_size_t, c_uint32, POINTER
+
+    try:
+        return _executable_function(_cpuid_bytecode, None, POINTER(c_uint32), c_size_t)
+    except RuntimeError:
+        return None
+
+
+@_lru_cache(maxsize=None)
+def _xgetbv_function():
+    """Returns the XGETBV function.
+
+    The function is assembled on first call and kept in read and execute only memory
+    for the process lifetime. It must only be called if CPUID reports "OSXSAVE". A
+    failure is also kept, so the assembly is only tried once by process.
+
+    Returns
+    -------
+    ctypes function or None
+        XGETBV function. See "_xgetbv_bytecode" for signature. None if executable
+        memory is denied."""
+    from ctypes import c_uint32, c_uint64
+
+    try:
+        return _executable_function(_xgetbv_bytecode, c_uint64, c_uint32)
+    except RuntimeError:
+        return None
+
+
+def _executable_function(assembler, restype, *argtypes):
+    """Assembles a function in read and execute only memory.
+
+    Parameters
+    ----------
+    assembler : function
+        Function that returns machine code from "is_64bits" and "is_windows" arguments.
+    restype : ctypes type or None
+        Function return type.
+    argtypes : ctypes type
+        Function arguments types.
+
+    Returns
+    -------
+    ctypes function
+        Function."""
+    from sys import platform
+    from ctypes import (
+        c_void_p,
+        c_size_t,
+        c_ulong,
+        c_int,
+        CFUNCTYPE,
+        POINTER,
+        byref,
+        memmove,
+        sizeof,
+    )
+
+    is_windows = platform == "win32"
+    bytecode = assembler(sizeof(c_void_p) == 8, is_windows)
+    size = 0x1000
+
+    if is_windows:
+        from ctypes import windll
+
+        lib = windll.kernel32
+        valloc = lib.VirtualAlloc
+        valloc.argtypes = [c_void_p, c_size_t, c_ulong, c_ulong]
+        valloc.restype = c_void_p
+        vprotect = lib.VirtualProtect
+        vprotect.argtypes = [c_void_p, c_size_t, c_ulong, POINTER(c_ulong)]
+        vprotect.restype = c_int
+
+        # MEM_COMMIT | MEM_RESERVE, PAGE_READWRITE
+        address = valloc(None, size, 0x3000, 0x04)
+        if not address:
+            raise RuntimeError("Failed to allocate memory")
+        memmove(address, bytecode, len(bytecode))
+
+        # PAGE_EXECUTE_READ
+        if not vprotect(address, size, 0x20, byref(c_ulong())):
+            lib.VirtualFree(c_void_p(address), 0, 0x8000)
+            raise RuntimeError("Failed to memory protect")
+
+    else:
+        from ctypes import cdll
+
+        lib = cdll.LoadLibrary(None)
+        valloc = lib.valloc
+        valloc.argtypes = [c_size_t]
+        valloc.restype = c_void_p
+        mprotect = lib.mprotect
+        mprotect.argtypes = [c_void_p, c_size_t, c_int]
+        mprotect.restype = c_int
+
+        address = valloc(size)
+        if not address:
+            raise RuntimeError("Failed to allocate memory")
+        memmove(address, bytecode, len(bytecode))
+
+        # PROT_READ | PROT_EXEC
+        if mprotect(address, size, 1 | 4) != 0:
+            lib.free(c_void_p(address))
+            raise RuntimeError("Failed to memory protect")
+
+    return CFUNCTYPE(restype, *argtypes)(address)
+
+
+@_lru_cache(maxsize=None)
+def _cpuid_device_function():
+    """Returns a CPUID function that reads the Linux "/dev/cpu/0/cpuid" device.
+
+    This requires the "cpuid" kernel module and read access to the device.
+
+    Returns
+    -------
+    function or None
+        CPUID function. See "_cpuid_bytecode" for signature. None if the device is
+        not available."""
+    from os import open as os_open, pread, O_RDONLY
+    from struct import unpack
+
+    try:
+        fd = os_open("/dev/cpu/0/cpuid", O_RDONLY)
+    except OSError:
+        return None
+
+    def cpuid(buffer, count):
+        """CPUID function"""
+        for index in range(0, count * 4, 4):
+            # The file offset selects EAX (low 32 bits) and ECX (high 32 bits)
+            buffer[index : index + 4] = unpack(
+                "<4I", pread(fd, 16, buffer[index] | (buffer[index + 1] << 32))
+            )
+
+    return cpuid
+
+
+def _parse_cpuinfo(text):
+    """Parses the first processor block of a Linux "/proc/cpuinfo" content.
+
+    Parameters
+    ----------
+    text : str
+        "/proc/cpuinfo" content.
+
+    Returns
+    -------
+    dict
+        Fields values."""
+    cpuinfo = {}
+    for line in text.split("\n\n", 1)[0].splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            cpuinfo[key.strip()] = value.strip()
+    return cpuinfo
+
+
+@_lru_cache(maxsize=None)
+def _linux_cpuinfo():
+    """Returns the first processor information from Linux "/proc/cpuinfo".
+
+    Only the first processor block is read.
+
+    Returns
+    -------
+    dict
+        Fields values. Empty if not available."""
+    chunks = []
+    try:
+        with open("/proc/cpuinfo", "rb", buffering=0) as file:
+            while True:
+                chunk = file.read(8192)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                if b"\n\n" in chunk:
+                    break
+    except OSError:
+        return {}
+    return _parse_cpuinfo(b"".join(chunks).decode(errors="replace"))
+
+
+def _linux_getauxval(kind):
+    """Returns a Linux auxiliary vector value.
+
+    Parameters
+    ----------
+    kind : int
+        Value type.
+
+    Returns
+    -------
+    int
+        Value. 0 if not available."""
+    from ctypes import cdll, c_ulong
+
+    try:
+        getauxval = cdll.LoadLibrary(None).getauxval
+    except (OSError, AttributeError):
+        return 0
+    getauxval.argtypes = [c_ulong]
+    getauxval.restype = c_ulong
+    return getauxval(kind)
+
+
+def _linux_xcomp_supp():
+    """Returns XSAVE state components supported by the Linux kernel.
+
+    Requires Linux 5.16 or more.
+
+    Returns
+    -------
+    int
+        XCR0 bits. 0 if not available."""
+    from sys import platform
+
+    if not platform.startswith("linux"):
+        return 0
+
+    from ctypes import cdll, byref, c_long, c_uint64, c_void_p, sizeof
+
+    # "arch_prctl" syscall number
+    syscall_number = 158 if sizeof(c_void_p) == 8 else 384
+
+    try:
+        syscall = cdll.LoadLibrary(None).syscall
+    except (OSError, AttributeError):
+        return 0
+    syscall.restype = c_long
+    value = c_uint64()
+    if syscall(syscall_number, _ARCH_GET_XCOMP_SUPP, byref(value)) != 0:
+        return 0
+    return value.value
+
+
+def _linux_features_xcr0():
+    """Returns XSAVE state components enabled by the Linux kernel, from its CPU
+    features flags.
+
+    The kernel clears features flags whose state it does not save (Like "avx512f"
+    if ZMM states are not enabled).
+
+    Returns
+    -------
+    int
+        XCR0 bits. 0 if not available."""
+    flags = _linux_features()
+    if "OSXSAVE" not in flags:
+        return 0
+
+    # x87 and SSE states are always enabled with XSAVE
+    xcr0 = 0b11
+    for state, feature in (("avx", "AVX"), ("avx512", "AVX512F"), ("amx", "AMX_TILE")):
+        if feature in flags:
+            xcr0 |= _XCR0_STATES[state]
+    return xcr0
+
+
+def _linux_features():
+    """Returns CPU's features flags from the Linux kernel.
+
+    Uses "/proc/cpuinfo" flags, or "getauxval" hardware capabilities if not available
+    (Only CPUID leaf 1 EDX register features).
+
+    Returns
+    -------
+    set of str
+        Flags names."""
+    known = {
+        name
+        for registers in _FEATURE_BITS.values()
+        for bits in registers.values()
+        for name in bits.values()
+    }
+    flags = set()
+
+    cpuinfo_flags = _linux_cpuinfo().get("flags")
+    if cpuinfo_flags is not None:
+        for flag in cpuinfo_flags.split():
+            name = _LINUX_FLAGS.get(flag, flag.upper())
+            if name in known:
+                flags.add(name)
+
+        # The kernel clears "xsave" if it does not enable it
+        if "XSAVE" in flags:
+            flags.add("OSXSAVE")
+        return flags
+
+    bits = _linux_getauxval(_AT_HWCAP)
+    leaf_bits = _FEATURE_BITS[(1, 0)]["edx"]
+    for bit in leaf_bits:
+        if ((1 << bit) & bits) != 0:
+            flags.add(leaf_bits[bit])
+    if _linux_getauxval(_AT_HWCAP2) & 0b10:
+        flags.add("FSGSBASE")
+    return flags
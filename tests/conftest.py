@@ -0,0 +1,13 @@
+"""Tests configuration"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def cache_dir(tmp_path_factory):
+    """Uses a temporary persistent cache directory"""
+    from os import environ
+
+    environ["COMPILERTOOLS_CACHE_DIR"] = str(tmp_path_factory.mktemp("cache"))
+    yield environ["COMPILERTOOLS_CACHE_DIR"]
+    del environ["COMPILERTOOLS_CACHE_DIR"]
@@ -0,0 +1,161 @@
+"""Test command line interface"""
+
+
+def run_main(*args):
+    """Runs the command line interface and returns its output.
+
+    Parameters
+    ----------
+    *args : str
+        Command line arguments.
+
+    Returns
+    -------
+    str
+        Output."""
+    from contextlib import redirect_stdout
+    from io import StringIO
+    from compilertools.__main__ import main
+
+    output = StringIO()
+    with redirect_stdout(output):
+        main(list(args))
+    return output.getvalue()
+
+
+def tests_diagnostics():
+    """Test diagnostics commands"""
+    import sys
+    import importlib
+    from json import loads
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    import compilertools.imports as imports
+    from compilertools.__main__ import _cpu_text
+    from compilertools.imports import ARCH_SUFFIXES, enable_statistics
+    from compilertools.processors import get_arch
+
+    try:
+        # Processor
+        data = loads(run_main("cpu", "--json"))
+        assert data["processor"]["arch"] == get_arch()
+        assert data["time"] > 0
+        assert f"arch: {get_arch()}" in run_main("cpu").splitlines()
+        assert _cpu_text(
+            {
+                "processor": {
+                    "features": {"SSE2", "AVX"},
+                    "microarchitectures": ["skylake", "haswell"],
+                },
+                "time": 0.001,
+            }
+        ) == [
+            "features: AVX SSE2",
+            "microarchitectures: skylake haswell",
+            "detection time: 1.000 ms",
+        ]
+
+        # Suffixes
+        data = loads(run_main("suffixes", "--json"))
+        assert data["suffixes"] == ARCH_SUFFIXES
+        assert set(data["overrides"]) == {
+            "max_isa",
+            "exclude_suffixes",
+            "force_variants",
+        }
+        assert run_main("suffixes").splitlines()[: len(ARCH_SUFFIXES)] == ARCH_SUFFIXES
+
+        # Build matrix
+        data = loads(run_main("matrix", "--json", "--arch", "x86_64", "--arch", "x86"))
+        assert set(data["matrix"]) == {"x86_64", "x86_32"}
+        assert data["matrix"]["x86_64"][""]
+        assert set(data["compiler"]) == {"name", "version"}
+        assert "x86_32:" in run_main("matrix", "--arch", "x86").splitlines()
+
+        # Timing
+        data = loads(run_main("timing", "--json"))
+        assert set(data["times"]) == {
+            "processor",
+            "compiler",
+            "compiler_version",
+            "suffixes",
+        }
+        assert data["persistent_cache"] is True
+
+        # Explain
+        if ARCH_SUFFIXES:
+            name = "compilertools_dummy_explain"
+            with TemporaryDirectory() as tmp:
+                sys.path.insert(0, tmp)
+                importlib.invalidate_caches()
+                try:
+                    file_path = join(tmp, f"{name}{ARCH_SUFFIXES[0]}")
+                    with open(file_path, "wt") as file:
+                        file.write("")
+                    data = loads(run_main("explain", name, "--json"))
+                    assert data[name]["variant"] == file_path
+                    assert run_main("explain", name).startswith(
+                        f"{name}: {file_path} ("
+                    )
+                    assert run_main("explain", "compilertools_dummy_pkg.module") == (
+                        "compilertools_dummy_pkg.module: error: "
+                        "No module named 'compilertools_dummy_pkg'\n"
+                    )
+                finally:
+                    sys.path.remove(tmp)
+                    importlib.invalidate_caches()
+    finally:
+        enable_statistics(False)
+        imports._REGISTERED_NAMES.clear()
+
+
+def tests_autotune():
+    """Test autotune command"""
+    from json import loads
+    from pytest import raises
+    import compilertools.imports as imports
+
+    run_autotune = imports.run_autotune
+    runs = []
+
+    def dummy_run_autotune(fullname, benchmark=None):
+        """Dummy run_autotune"""
+        runs.append((fullname, benchmark))
+
+    imports.run_autotune = dummy_run_autotune
+    imports._AUTOTUNE = {
+        "fingerprint": "",
+        "results": {
+            "pkg.module": {
+                "benchmark": "pkg.bench:run",
+                "timings": {".avx2.so": 0.002, ".avx512.so": None, ".sse4.so": 0.001},
+            },
+            "pkg.other": {"benchmark": "pkg.bench:other", "timings": {}},
+        },
+    }
+    try:
+        # Show results
+        assert run_main("autotune").splitlines() == [
+            "pkg.module (pkg.bench:run)",
+            "  .sse4.so: 1.000 ms",
+            "  .avx2.so: 2.000 ms",
+            "  .avx512.so: failed",
+            "pkg.other (pkg.bench:other)",
+        ]
+
+        assert loads(run_main("autotune", "pkg.other", "--json")) == {
+            "pkg.other": {"benchmark": "pkg.bench:other", "timings": {}}
+        }
+
+        # Run autotuning
+        output = run_main(
+            "autotune", "pkg.other", "--run", "--benchmark", "pkg.bench:run"
+        )
+        assert runs == [("pkg.other", "pkg.bench:run")]
+        assert output.splitlines() == ["pkg.other (pkg.bench:other)"]
+
+        with raises(SystemExit):
+            run_main("autotune", "--run")
+    finally:
+        imports.run_autotune = run_autotune
+        imports._AUTOTUNE = None
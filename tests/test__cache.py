@@ -0,0 +1,53 @@
+"""Tests for persistent cache"""
+
+
+def tests_cache():
+    """Test load_cache, dump_cache and get_cache_dir"""
+    import os
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools._cache import load_cache, dump_cache, get_cache_dir
+    import compilertools._config as _config
+
+    cache_dir = os.environ["COMPILERTOOLS_CACHE_DIR"]
+    config_cache = _config.CONFIG["cache"]
+
+    try:
+        with TemporaryDirectory() as tmp:
+            # Cache directory
+            os.environ["COMPILERTOOLS_CACHE_DIR"] = join(tmp, "cache")
+            assert get_cache_dir() == join(tmp, "cache")
+
+            # Missing cache
+            assert load_cache("test") is None
+
+            # Dump and load, with sets
+            content = {"key": "value", "set": {"b", "a"}, "list": [1, 2]}
+            dump_cache("test", content)
+            assert load_cache("test") == content
+            assert os.listdir(join(tmp, "cache")) == ["test.json"]
+
+            # Corrupted cache
+            with open(join(tmp, "cache", "test.json"), "wt") as file:
+                file.write("{")
+            assert load_cache("test") is None
+
+            # Not serializable content is ignored
+            dump_cache("test", {"key": object()})
+            assert load_cache("test") is None
+            assert os.listdir(join(tmp, "cache")) == ["test.json"]
+
+            # Disabled cache
+            dump_cache("test", content)
+            _config.CONFIG["cache"] = False
+            assert load_cache("test") is None
+            dump_cache("test2", content)
+            assert os.listdir(join(tmp, "cache")) == ["test.json"]
+
+        # Default cache directory
+        del os.environ["COMPILERTOOLS_CACHE_DIR"]
+        assert get_cache_dir().endswith("compilertools")
+
+    finally:
+        os.environ["COMPILERTOOLS_CACHE_DIR"] = cache_dir
+        _config.CONFIG["cache"] = config_cache
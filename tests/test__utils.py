@@ -125,3 +125,134 @@ def tests_always_str_list():
 
     # str to tuple
     assert always_str_list("0") == ("0",)
+
+
+def tests_probe_compiler():
+    """Test probe_compiler, probe_all and dump_version"""
+    import sys
+    from os import chmod, environ, symlink
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from time import perf_counter
+    from compilertools._config import CONFIG
+    from compilertools._utils import (
+        probe_compiler,
+        probe_compilers,
+        probe_arguments,
+        resolve_executable,
+        run_coroutine,
+        dump_version,
+        build_commands,
+    )
+
+    if sys.platform == "win32":
+        from pytest import skip
+
+        skip("Shell scripts compilers are not supported on Windows")
+
+    script = "\n".join(
+        (
+            "#!/bin/sh",
+            'echo "$1" >> "%s"',
+            "sleep %s",
+            'case "$*" in *-mbad*) exit 1;; esac',
+            'case "$1" in',
+            '    --version) echo "%s";;',
+            "    -dumpversion) echo 9.4.0;;",
+            "esac",
+            "",
+        )
+    )
+
+    def write_compiler(path, version_str="gcc (GCC) 9.4.0", sleep=0):
+        """Writes a fake compiler"""
+        with open(path, "wt") as file:
+            file.write(script % (calls_path, sleep, version_str))
+        chmod(path, 0o755)
+
+    def calls():
+        """Returns compiler calls"""
+        try:
+            with open(calls_path, "rt") as file:
+                return sorted(file.read().split())
+        except FileNotFoundError:
+            return []
+
+    cc = environ.get("CC")
+    timeout = CONFIG["probe_timeout"]
+    with TemporaryDirectory() as tmp:
+        path = join(tmp, "compiler")
+        calls_path = join(tmp, "calls")
+        link = join(tmp, "cc")
+        symlink(path, link)
+        try:
+            # Probe and cache result
+            write_compiler(path)
+            assert resolve_executable(link) == resolve_executable(path)
+            assert probe_compiler(link) == {
+                "family": "gcc",
+                "version": 9.4,
+                "path": resolve_executable(path),
+            }
+            assert calls() == ["--version", "-dumpfullversion", "-dumpversion"]
+            assert probe_compiler(path)["version"] == 9.4
+            assert len(calls()) == 3
+
+            # Compiler modified
+            write_compiler(path, "clang version 9.4.0 (Fedora)")
+            assert probe_compiler(path)["family"] == "clang"
+            assert len(calls()) == 6
+
+            # Compiler invoked by distutils
+            environ["CC"] = f"ccache {path} -pthread"
+            assert build_commands()[0] == path
+            assert dump_version("clang") == 9.4
+            assert dump_version("gcc") != 9.4
+
+            # Timeout
+            write_compiler(path, "gcc (GCC) 9.4.1", sleep=1)
+            CONFIG["probe_timeout"] = 0.1
+            assert probe_compiler(path) is None
+            CONFIG["probe_timeout"] = timeout
+            write_compiler(path, "gcc (GCC) 9.4.1")
+            assert probe_compiler(path)["family"] == "gcc"
+
+            # Not found
+            assert probe_compiler(join(tmp, "not_exists")) is None
+
+            # Concurrent probes
+            paths = [join(tmp, f"compiler_{index}") for index in range(3)]
+            for compiler_path in paths:
+                write_compiler(compiler_path, sleep=1)
+            start = perf_counter()
+            probes = probe_compilers(paths + paths[:1])
+            assert perf_counter() - start < 3
+            assert list(probes) == paths
+            assert all(probe["version"] == 9.4 for probe in probes.values())
+
+            # Arguments support
+            environ["CC"] = path
+            arguments = ["-mgood", "-mbad -mgood", "-mgood"]
+            calls_count = len(calls())
+            assert probe_arguments("gcc", arguments) == {
+                "-mgood": True,
+                "-mbad -mgood": False,
+            }
+            assert calls().count("-O3") == 2
+            assert probe_arguments("gcc", arguments[:1]) == {"-mgood": True}
+            assert len(calls()) == calls_count + 2
+            assert probe_arguments("not_a_compiler_family", arguments) == {}
+
+            # Synchronous probes from a running event loop
+            async def probe():
+                """Probes from a coroutine"""
+                return probe_compiler(link)
+
+            assert run_coroutine(probe())["family"] == "gcc"
+
+        finally:
+            CONFIG["probe_timeout"] = timeout
+            if cc is None:
+                environ.pop("CC", None)
+            else:
+                environ["CC"] = cc
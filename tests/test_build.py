@@ -30,6 +30,10 @@ def tests_get_build_compile_args():
                 "compile": "--option-compile",
                 "link": "--option-link",
             }
+            self["option"]["variant_option"] = {
+                "compile": "--variant-option",
+                "suffixes": {"arch2_opt"},
+            }
 
         def _compile_args_matrix(self, arch, cpu):
             """Return test args matrix"""
@@ -46,6 +50,12 @@ def tests_get_build_compile_args():
                         suffix="arch2_opt",
                         build_if=(arch == "arch2"),
                     ),
+                    self.Arg(args="--avx2", suffix="avx2", build_if=(arch == "arch3")),
+                    self.Arg(
+                        args="--x86-64-v3",
+                        suffix="x86_64_v3",
+                        build_if=(arch == "arch3"),
+                    ),
                 ]
             ]
 
@@ -92,6 +102,15 @@ def tests_get_build_compile_args():
         f".arch1{ext_suffix}": ["--arch1", "--option-compile"]
     }
 
+    # Test options restricted to some variants
+    assert get_build_compile_args(compiler, "arch2", use_option=["variant_option"]) == {
+        f".arch2{ext_suffix}": ["--arch2"],
+        f".arch2_opt{ext_suffix}": ["--arch2_opt", "--variant-option"],
+    }
+    assert get_build_compile_args(
+        compiler, current_machine=True, use_option=["variant_option"]
+    ) == {ext_suffix: ["--native", "--variant-option"]}
+
     # Test filtering suffixes
     assert get_build_compile_args(compiler, "arch2") == {
         f".arch2{ext_suffix}": ["--arch2"],
@@ -108,6 +127,18 @@ def tests_get_build_compile_args():
     }
     ConfigBuild.suffixes_includes.remove("arch2")
 
+    # Test x86-64 psABI microarchitecture levels mode
+    assert get_build_compile_args(compiler, "arch3") == {
+        f".avx2{ext_suffix}": ["--avx2"]
+    }
+    ConfigBuild.x86_64_levels = True
+    try:
+        assert get_build_compile_args(compiler, "arch3") == {
+            f".x86_64_v3{ext_suffix}": ["--x86-64-v3"]
+        }
+    finally:
+        ConfigBuild.x86_64_levels = False
+
 
 def tests_get_build_link_args():
     """Test get_build_link_args"""
@@ -202,12 +233,50 @@ def tests_add_args():
     _add_args(compiler, args, "api", "compile", ["not_exist"])
     assert args == []
 
+    # API with many arguments
+    compiler["api"]["api_name"]["compile"] = ["--api-compile1", "--api-compile2"]
+    args = ["--arg"]
+    _add_args(compiler, args, "api", "compile", ["api_name"])
+    assert args == ["--arg", "--api-compile1", "--api-compile2"]
+
+    # Lazily computed arguments
+    compiler["api"]["api_name"]["compile"] = lambda: ["--api-lazy"]
+    args = []
+    _add_args(compiler, args, "api", "compile", ["api_name"])
+    assert args == ["--api-lazy"]
+
+    # CPU caches detection only if "cpu_cache" option is used
+    from compilertools.compilers.gcc import Compiler as GCC
+
+    detected = []
+
+    def cpu_cache_values():
+        """Dummy CPU caches detection"""
+        detected.append(True)
+        return {"L1_CACHE_SIZE": 32768}
+
+    cpu_cache_values_original = CompilerBase.__dict__["_cpu_cache_values"]
+    CompilerBase._cpu_cache_values = staticmethod(cpu_cache_values)
+    try:
+        compiler = GCC()
+        args = []
+        _add_args(compiler, args, "option", "compile", ["fast_fpmath"])
+        assert args == ["-Ofast"]
+        assert not detected
+
+        _add_args(compiler, args, "option", "compile", ["cpu_cache"])
+        assert "-DCOMPILERTOOLS_L1_CACHE_SIZE=32768" in args
+        assert detected
+    finally:
+        CompilerBase._cpu_cache_values = cpu_cache_values_original
+
 
 def tests_update_extension():
     """Test _update_extension, _patch_build_extension.patched and
     _patch_get_ext_filename.patched"""
     from os.path import join
     from os import makedirs
+    from json import load
     from tempfile import TemporaryDirectory
     from distutils.sysconfig import get_config_var
     from compilertools.compilers import CompilerBase
@@ -359,10 +428,37 @@ def tests_update_extension():
         excepted_file = join(
             dummy_build_ext.build_lib, "package", "module.compilertools"
         )
-        assert dummy_build_ext.get_outputs() == [excepted_file]
+        manifest_file = join(dummy_build_ext.build_lib, "package.compilertools.json")
+        assert dummy_build_ext.get_outputs() == [excepted_file, manifest_file]
         with open(excepted_file, "rt") as file:
             assert file.read() == dummy_build_ext.compilertools_compiler_name
 
+        # Test variants manifest
+        with open(manifest_file, "rt") as file:
+            manifest = load(file)
+        assert manifest["compiler"] == dummy_build_ext.compilertools_compiler_name
+        variants = manifest["modules"]["package.module"]
+        assert len(variants) == len(excepted_args)
+        for suffix in excepted_args:
+            suffix = f".{suffix}{ext_suffix}" if suffix else ext_suffix
+            assert variants[suffix] == f"package/module{suffix}"
+
+        # Manifest by distribution
+        class DummyDistribution:
+            """Dummy distutils.dist.Distribution"""
+
+            @staticmethod
+            def get_name():
+                """Dummy get_name"""
+                return "My-Package.dist"
+
+        dummy_build_ext.distribution = DummyDistribution()
+        manifest_file = join(
+            dummy_build_ext.build_lib, "package.my_package_dist.compilertools.json"
+        )
+        assert dummy_build_ext.get_outputs()[-1] == manifest_file
+        del dummy_build_ext.distribution
+
     # Test after disabling optimization with CONFIG_BUILD
     ConfigBuild.disabled = True
     dummy_ext = DummyExtension()
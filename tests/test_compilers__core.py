@@ -7,8 +7,11 @@ def tests_get_compiler():
     from os.path import splitext, dirname
     from compilertools._config import CONFIG
     from compilertools.compilers import CompilerBase, _core
-    from compilertools.compilers._core import get_compiler, _which_unix_compiler
-    from distutils.ccompiler import get_default_compiler
+    from compilertools.compilers._core import (
+        get_compiler,
+        _which_unix_compiler,
+        _default_compiler,
+    )
 
     compiler = CompilerBase()
 
@@ -19,9 +22,15 @@ def tests_get_compiler():
     unix_compiler = _which_unix_compiler("cc")
 
     # Return default compiler
-    name = get_default_compiler()
+    name = _default_compiler()
+    assert name in ("unix", "msvc")
     alias = CONFIG["compilers"].get(name, name)
     assert get_compiler().__class__.__module__ == "compilertools.compilers." + (
+        alias if alias != "unix" else "gcc"
+    )
+    assert get_compiler(
+        current_compiler=True
+    ).__class__.__module__ == "compilertools.compilers." + (
         alias if alias != "unix" else unix_compiler
     )
 
@@ -44,9 +53,9 @@ def tests_get_compiler():
                 == f"compilertools.compilers.{alias}"
             )
         else:
+            # Unix compiler is only detected for the current compiler
             assert (
-                get_compiler(name).__class__.__module__
-                == f"compilertools.compilers.{unix_compiler}"
+                get_compiler(name).__class__.__module__ == "compilertools.compilers.gcc"
             )
 
 
@@ -201,52 +210,175 @@ def tests_compiler_base():
 
 def test_which_unix_compiler():
     """Test _which_unix_compiler"""
-    import subprocess
-    from io import StringIO
+    import compilertools._utils as utils
     from compilertools.compilers._core import _which_unix_compiler
 
     compiler = "gcc"
 
-    # Mock Popen
-
-    raise_exception = False
-
-    class Process:
-        """Mocked process result"""
-
-        version_str = None
-
-        @property
-        def stdout(self):
-            """Mocked stdout"""
-            return StringIO(self.version_str)
+    # Mock probe_compiler
+    probed = []
+    family = None
 
-    def Popen(args, **_):
-        """Mocked Popen"""
-        assert args[0] == compiler or (args[0] == "cc" and compiler == "unix")
-        if raise_exception:
-            raise OSError
-        return Process()
+    def probe_compiler(command):
+        """Mocked probe_compiler"""
+        probed.append(command)
+        return None if family is None else {"family": family, "version": 1.0}
 
-    subprocess_popen = subprocess.Popen
-    subprocess.Popen = Popen
+    utils_probe_compiler = utils.probe_compiler
+    utils.probe_compiler = probe_compiler
 
     # Test
     try:
         # GCC
-        Process.version_str = "gcc (GCC) 6.3.1\n..."
+        family = "gcc"
         assert _which_unix_compiler(compiler) == "gcc"
+        assert probed == [compiler]
 
         # LLVM
-        Process.version_str = "clang version 7.0.0 (Fedora 7.0.0-2.fc29)\n..."
-        assert _which_unix_compiler(compiler) == "llvm"
-
-        Process.version_str = "Apple LLVM version 9.1.0 (clang-902.0.39.2)\n..."
+        family = "clang"
         assert _which_unix_compiler(compiler) == "llvm"
 
         # Default to GCC if no compiler found
-        raise_exception = True
+        family = None
         assert _which_unix_compiler(compiler) == "gcc"
 
+        # Unspecified compiler: Uses the one invoked by distutils
+        _which_unix_compiler("unix")
+        assert probed[-1] == (utils.build_commands() or ["cc"])[0]
+
+    finally:
+        utils.probe_compiler = utils_probe_compiler
+
+
+def tests_probe_args_matrix():
+    """Test arguments probing by test compilation"""
+    import compilertools._utils as utils
+    from compilertools._config import CONFIG
+    from compilertools.compilers import CompilerBase
+
+    class Compiler(CompilerBase):
+        """Dummy Compiler"""
+
+        _probe_command = "cc"
+
+        def _compile_args_matrix(self, arch, cpu):
+            """Return test args matrix"""
+            return [
+                [self.Arg(args=["--generic", "-O3"])],
+                [
+                    self.Arg(args="--inst1", suffix="inst1", build_if=False),
+                    self.Arg(args="--inst2", suffix="inst2"),
+                    self.Arg(args="--inst3", suffix="inst3"),
+                    self.Arg(),
+                ],
+            ]
+
+    # Mock probe_arguments
+    probed = []
+
+    def probe_arguments(command, arguments):
+        """Mocked probe_arguments"""
+        arguments = list(arguments)
+        probed.append((command, arguments))
+        return {"--generic -O3": True, "--inst1": True, "--inst2": False}
+
+    utils_probe_arguments = utils.probe_arguments
+    utils.probe_arguments = probe_arguments
+
+    try:
+        # Probe results replace "build_if", arguments not probed are unchanged
+        assert list(Compiler(current_compiler=True).compile_args()) == [
+            "inst1",
+            "inst3",
+            "",
+        ]
+        assert probed == [("cc", ["--generic -O3", "--inst1", "--inst2", "--inst3"])]
+
+        # Not current compiler
+        assert list(Compiler().compile_args()) == ["inst1", "inst2", "inst3", ""]
+        assert len(probed) == 1
+
+        # Probing disabled
+        CONFIG["probe_arguments"] = False
+        assert list(Compiler(current_compiler=True).compile_args()) == [
+            "inst2",
+            "inst3",
+            "",
+        ]
+        assert len(probed) == 1
+
+    finally:
+        utils.probe_arguments = utils_probe_arguments
+        CONFIG["probe_arguments"] = True
+
+
+def tests_compile_args_cache():
+    """Test compile_args memoization"""
+    import importlib
+    from os import environ
+    from sys import executable
+    from compilertools._config import CONFIG
+    from compilertools.compilers import CompilerBase, clear_compile_args_cache
+
+    calls = []
+
+    class Compiler(CompilerBase):
+        """Dummy Compiler"""
+
+        def _compile_args_matrix(self, arch, cpu):
+            """Return test args matrix"""
+            calls.append(arch)
+            return [
+                [self.Arg(args=["--generic"])],
+                [self.Arg(args="--inst1", suffix="inst1"), self.Arg()],
+            ]
+
+    compiler = Compiler()
+    args = compiler.compile_args("x86_64")
+    assert args == {"inst1": ["--generic", "--inst1"], "": ["--generic"]}
+
+    # Result is memoized, but can be modified by the caller
+    args["inst1"].append("--other")
+    del args[""]
+    assert compiler.compile_args("x86_64") == {
+        "inst1": ["--generic", "--inst1"],
+        "": ["--generic"],
+    }
+    assert Compiler().compile_args("x86_64") == compiler.compile_args("x86_64")
+    assert calls == ["x86_64"]
+
+    # Compiler version is part of the compiler identity
+    compiler["version"] = 1.0
+    compiler.compile_args("x86_64")
+    assert calls == ["x86_64", "x86_64"]
+
+    # Cache can be cleared
+    clear_compile_args_cache()
+    compiler.compile_args("x86_64")
+    assert len(calls) == 3
+    importlib.invalidate_caches()
+    compiler.compile_args("x86_64")
+    assert len(calls) == 4
+
+    # Probed compiler executable is part of the compiler identity
+    class ProbedCompiler(Compiler):
+        """Dummy Compiler with arguments probing"""
+
+        _probe_command = "compilertools_dummy_cc"
+
+    CONFIG["probe_arguments"] = False
+    environ_cc = environ.get("CC")
+    try:
+        compiler = ProbedCompiler(current_compiler=True)
+        environ["CC"] = "compilertools_dummy_cc"
+        compiler.compile_args("x86_64")
+        compiler.compile_args("x86_64")
+        assert len(calls) == 5
+        environ["CC"] = executable
+        compiler.compile_args("x86_64")
+        assert len(calls) == 6
     finally:
-        subprocess.Popen = subprocess_popen
+        environ.pop("CC", None)
+        if environ_cc is not None:
+            environ["CC"] = environ_cc
+        CONFIG["probe_arguments"] = True
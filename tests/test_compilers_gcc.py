@@ -1,11 +1,20 @@
 """Tests for GNU Compiler Collection"""
 
 
+def tests_march_versions():
+    """Test "-march" values are known microarchitectures"""
+    from compilertools.compilers.gcc import _MARCH_VERSIONS
+    from compilertools.processors.x86_32 import _MICROARCHITECTURES
+
+    assert set(_MARCH_VERSIONS) == set(_MICROARCHITECTURES)
+
+
 def tests_compiler():
     """Test Compiler"""
+    import asyncio
     import platform
-    import subprocess
-    from compilertools.compilers._core import _get_arch_and_cpu
+    from compilertools._config import CONFIG
+    from compilertools.compilers._core import _get_arch_and_cpu, _order_args_matrix
     from compilertools.compilers.gcc import Compiler
 
     cmd = {
@@ -19,25 +28,34 @@ def tests_compiler():
         """Force version"""
         return cmd["python"]
 
-    def run(*popenargs, check=False, **_):
-        """Mocked subprocess.run"""
-        args = popenargs[0]
+    class Process:
+        """Mocked asyncio subprocess"""
+
+        def __init__(self, args):
+            try:
+                self.stdout = cmd[args[1]]
+                self.returncode = 0
+            except KeyError:
+                self.stdout = ""
+                self.returncode = 1
+
+        async def communicate(self):
+            """Mocked communicate"""
+            return self.stdout.encode(), b""
+
+    async def create_subprocess_exec(*args, **_):
+        """Mocked asyncio.create_subprocess_exec"""
         if cmd["not_found"]:
             raise FileNotFoundError
-        try:
-            stdout = cmd[args[1]]
-            return_code = 0
-        except KeyError:
-            stdout = ""
-            return_code = 1
-            if check:
-                raise subprocess.CalledProcessError(return_code, args)
-        return subprocess.CompletedProcess(args, return_code, stdout)
+        return Process(args)
 
     platform_python_compiler = platform.python_compiler
     platform.python_compiler = dummy_compiler
-    subprocess_run = subprocess.run
-    subprocess.run = run
+    asyncio_create_subprocess_exec = asyncio.create_subprocess_exec
+    asyncio.create_subprocess_exec = create_subprocess_exec
+
+    # Mocked probes results must not be stored in the persistent cache
+    CONFIG["cache"] = False
 
     try:
         compiler = Compiler(current_compiler=True)
@@ -78,10 +96,105 @@ def tests_compiler():
         assert len(compiler.api) > 0
         assert len(compiler.option) > 0
 
+        # Test CPU cache option
+        cpu_cache = compiler.option["cpu_cache"]["compile"]()
+        for name, value in compiler._cpu_cache_values().items():
+            assert f"-DCOMPILERTOOLS_{name}={value}" in cpu_cache
+        if "L1_CACHE_LINE_SIZE" in compiler._cpu_cache_values():
+            assert cpu_cache[cpu_cache.index("--param") + 1].startswith("l1-cache-")
+
         # Test _compile_args_matrix
         assert compiler._compile_args_matrix(arch_x86, cpu_x86)
         assert compiler._compile_args_matrix(arch_amd64, cpu_amd64)
 
+        # Test x86-64 psABI microarchitecture levels
+        cpu_amd64["x86_64_level"] = 3
+        cpu_amd64["features"] = {"AVX", "AVX2"}
+        cpu_amd64["os_supports_avx"] = True
+        matrix = compiler._compile_args_matrix(arch_amd64, cpu_amd64)
+        suffixes = _order_args_matrix(matrix, current_machine=True)
+        assert "x86_64_v3" in suffixes
+        assert "x86_64_v2" in suffixes
+        assert "x86_64_v4" not in suffixes
+        assert list(suffixes).index("x86_64_v3") < list(suffixes).index("avx2")
+        assert "-mfma" in suffixes["x86_64_v3"]
+        assert "-msse4.2" in suffixes["x86_64_v3"]
+        assert "-mavx512f" not in suffixes["x86_64_v3"]
+        compiler["version"] = 11.1
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64), current_machine=True
+        )
+        assert suffixes["x86_64_v3"][-1] == "-march=x86-64-v3"
+        compiler["version"] = 4.9
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64),
+            current_machine=True,
+            current_compiler=True,
+        )
+        assert "x86_64_v3" in suffixes
+        cpu_amd64["x86_64_level"] = 4
+        assert "x86_64_v4" not in _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64),
+            current_machine=True,
+            current_compiler=True,
+        )
+        compiler["version"] = 6.3
+
+        # Test AVX-512 variants gated on OS AVX-512 state support
+        cpu_amd64["features"] = {"AVX", "AVX2", "AVX512F", "AVX512CD"}
+        cpu_amd64["os_supports_avx"] = True
+        cpu_amd64["os_supports_avx512"] = False
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64), current_machine=True
+        )
+        assert "avx2" in suffixes
+        assert "avx512" not in suffixes
+        cpu_amd64["os_supports_avx512"] = True
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64), current_machine=True
+        )
+        assert "avx512" in suffixes
+
+        # Test AVX-512 sub-families
+        cpu_amd64["x86_64_level"] = 4
+        cpu_amd64["features"] = {"AVX512VBMI", "AVX512_VBMI2", "AVX512_VNNI"}
+        cpu_amd64["features"].update(("AVX512_BITALG", "AVX512_VPOPCNTDQ"))
+        compiler["version"] = 12.1
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64), current_machine=True
+        )
+        assert "avx512_spr" not in suffixes
+        assert list(suffixes)[:3] == ["avx512_icl", "avx512_skx", "x86_64_v4"]
+        assert "-mavx512vbmi2" in suffixes["avx512_icl"]
+        assert "-mfma" in suffixes["avx512_icl"]
+        assert "-mavx512dq" in suffixes["avx512_skx"]
+        cpu_amd64["features"].update(("AVX512_BF16", "AVX512_FP16"))
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64), current_machine=True
+        )
+        assert "-mavx512fp16" in suffixes["avx512_spr"]
+        compiler["version"] = 11.1
+        assert "avx512_spr" not in _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64),
+            current_machine=True,
+            current_compiler=True,
+        )
+        cpu_amd64["x86_64_level"] = 3
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64), current_machine=True
+        )
+        assert "avx512_skx" not in suffixes
+
+        # Test 256-bit vectors preference option
+        del compiler["option"]
+        option = compiler.option["prefer_vector_width_256"]
+        assert option["compile"] == "-mprefer-vector-width=256"
+        assert {"avx512_skx", "x86_64_v4"} <= option["suffixes"]
+        assert "avx2" not in option["suffixes"]
+        compiler["version"] = 6.3
+        del compiler["option"]
+        assert "prefer_vector_width_256" not in compiler.option
+
         # Test _compile_args_current_machine with x86
         args = compiler._compile_args_current_machine(arch_x86, cpu_x86)
         assert args
@@ -99,9 +212,42 @@ def tests_compiler():
         args = compiler._compile_args_current_machine(arch_x86, cpu_x86)
         assert "-mfpmath=sse" not in args
 
+        # Check explicit microarchitecture
+        cpu_amd64["microarchitectures"] = ["unknown", "skylake-avx512", "haswell"]
+        args = compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
+        assert "-march=skylake-avx512 -mtune=skylake-avx512" in args
+        assert "native" not in args
+
+        compiler["version"] = 4.9
+        args = compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
+        assert "-march=haswell -mtune=haswell" in args
+
+        compiler["version"] = 1.0
+        args = compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
+        assert "-march=native" in args
+        assert "-mtune" not in args
+
+        # Check profile-guided optimization arguments
+        CONFIG["probe_arguments"] = False
+        compiler["version"] = 7.1
+        assert compiler.pgo_args("generate", "pgo") == {
+            "compile": ["-fprofile-generate=pgo", "-fprofile-update=atomic"],
+            "link": ["-fprofile-generate=pgo", "-fprofile-update=atomic"],
+        }
+        compiler["version"] = 6.3
+        assert compiler.pgo_args("generate", "pgo")["compile"] == [
+            "-fprofile-generate=pgo"
+        ]
+        assert compiler.pgo_args("use", "pgo") == {
+            "compile": ["-fprofile-use=pgo", "-fprofile-correction"],
+            "link": ["-fprofile-use=pgo"],
+        }
+
     finally:
         platform.python_compiler = platform_python_compiler
-        subprocess.run = subprocess_run
+        asyncio.create_subprocess_exec = asyncio_create_subprocess_exec
+        CONFIG["cache"] = True
+        CONFIG["probe_arguments"] = True
 
 
 def tests_compiler_gcc_command():
@@ -1,11 +1,23 @@
 """Tests for LLVM Clang"""
 
 
+def tests_march_versions():
+    """Test "-march" values are known microarchitectures"""
+    from compilertools.compilers.llvm import _MARCH_VERSIONS
+    from compilertools.processors.x86_32 import _MICROARCHITECTURES
+
+    assert set(_MARCH_VERSIONS) == set(_MICROARCHITECTURES)
+
+
 def tests_compiler():
     """Test Compiler"""
+    import asyncio
     import platform
-    import subprocess
-    from compilertools.compilers._core import _get_arch_and_cpu
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from pytest import raises
+    from compilertools._config import CONFIG
+    from compilertools.compilers._core import _get_arch_and_cpu, _order_args_matrix
     from compilertools.compilers.llvm import Compiler
 
     cmd = {
@@ -19,25 +31,34 @@ def tests_compiler():
         """Force version"""
         return cmd["python"]
 
-    def run(*popenargs, check=False, **_):
-        """Mocked subprocess.run"""
-        args = popenargs[0]
+    class Process:
+        """Mocked asyncio subprocess"""
+
+        def __init__(self, args):
+            try:
+                self.stdout = cmd[args[1]]
+                self.returncode = 0
+            except KeyError:
+                self.stdout = ""
+                self.returncode = 1
+
+        async def communicate(self):
+            """Mocked communicate"""
+            return self.stdout.encode(), b""
+
+    async def create_subprocess_exec(*args, **_):
+        """Mocked asyncio.create_subprocess_exec"""
         if cmd["not_found"]:
             raise FileNotFoundError
-        try:
-            stdout = cmd[args[1]]
-            return_code = 0
-        except KeyError:
-            stdout = ""
-            return_code = 1
-            if check:
-                raise subprocess.CalledProcessError(return_code, args)
-        return subprocess.CompletedProcess(args, return_code, stdout)
+        return Process(args)
 
     platform_python_compiler = platform.python_compiler
     platform.python_compiler = dummy_compiler
-    subprocess_run = subprocess.run
-    subprocess.run = run
+    asyncio_create_subprocess_exec = asyncio.create_subprocess_exec
+    asyncio.create_subprocess_exec = create_subprocess_exec
+
+    # Mocked probes results must not be stored in the persistent cache
+    CONFIG["cache"] = False
 
     try:
         compiler = Compiler(current_compiler=True)
@@ -81,6 +102,22 @@ def tests_compiler():
         assert compiler._compile_args_matrix(arch_x86, cpu_x86)
         assert compiler._compile_args_matrix(arch_amd64, cpu_amd64)
 
+        # Test AVX-512 sub-families and 256-bit vectors preference option
+        cpu_amd64["x86_64_level"] = 4
+        cpu_amd64["features"] = {"AVX512_BF16", "AVX512_FP16"}
+        suffixes = _order_args_matrix(
+            compiler._compile_args_matrix(arch_amd64, cpu_amd64),
+            current_machine=True,
+            current_compiler=True,
+        )
+        assert "avx512_skx" in suffixes
+        assert "avx512_icl" not in suffixes
+        assert "avx512_spr" not in suffixes
+        option = compiler.option["prefer_vector_width_256"]
+        assert option["compile"] == "-mprefer-vector-width=256"
+        assert {"avx512_skx", "x86_64_v4"} <= option["suffixes"]
+        assert "avx2" not in option["suffixes"]
+
         # Test _compile_args_current_machine with x86
         args = compiler._compile_args_current_machine(arch_x86, cpu_x86)
         assert args
@@ -98,9 +135,55 @@ def tests_compiler():
         args = compiler._compile_args_current_machine(arch_x86, cpu_x86)
         assert "-mfpmath=sse" not in args
 
+        # Check explicit microarchitecture
+        cpu_amd64["microarchitectures"] = ["unknown", "skylake-avx512", "haswell"]
+        args = compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
+        assert "-march=skylake-avx512 -mtune=skylake-avx512" in args
+        assert "native" not in args
+
+        compiler["version"] = 3.4
+        args = compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
+        assert "-march=haswell -mtune=haswell" in args
+
+        compiler["version"] = 1.0
+        args = compiler._compile_args_current_machine(arch_amd64, cpu_amd64)
+        assert "-march=native" in args
+        assert "-mtune" not in args
+
+        # Check profile-guided optimization arguments
+        CONFIG["probe_arguments"] = False
+        compiler["version"] = 13.0
+        raw_profile = join("pgo", "default-%p.profraw")
+        assert compiler.pgo_args("generate", "pgo") == {
+            "compile": [
+                f"-fprofile-instr-generate={raw_profile}",
+                "-fprofile-update=atomic",
+            ],
+            "link": [
+                f"-fprofile-instr-generate={raw_profile}",
+                "-fprofile-update=atomic",
+            ],
+        }
+        compiler["version"] = 12.0
+        assert compiler.pgo_args("generate", "pgo")["compile"] == [
+            f"-fprofile-instr-generate={raw_profile}"
+        ]
+        profile = join("pgo", "default.profdata")
+        assert compiler.pgo_args("use", "pgo") == {
+            "compile": [f"-fprofile-instr-use={profile}"],
+            "link": [f"-fprofile-instr-use={profile}"],
+        }
+
+        # Check profiles merge without raw profiles
+        with TemporaryDirectory() as tmp:
+            with raises(RuntimeError):
+                compiler.pgo_merge(tmp)
+
     finally:
         platform.python_compiler = platform_python_compiler
-        subprocess.run = subprocess_run
+        asyncio.create_subprocess_exec = asyncio_create_subprocess_exec
+        CONFIG["cache"] = True
+        CONFIG["probe_arguments"] = True
 
 
 def tests_compiler_clang_command():
@@ -7,7 +7,14 @@ def tests_update_ext_suffixes():
     from importlib.machinery import EXTENSION_SUFFIXES
     import compilertools._core as core
     from compilertools._core import suffix_from_args
-    from compilertools.imports import ARCH_SUFFIXES, update_extensions_suffixes
+    from compilertools.imports import (
+        ARCH_SUFFIXES,
+        update_extensions_suffixes,
+        _init_extensions_suffixes,
+    )
+
+    # Suffixes are lazily computed
+    _init_extensions_suffixes()
 
     # Create fake compiler and extensions on environments without ARCH_SUFFIXES
     if not ARCH_SUFFIXES:
@@ -67,6 +74,7 @@ def tests_update_ext_suffixes():
 def tests_extension_file_finder():
     """Test _ExtensionFileFinder"""
     import sys
+    from os import mkdir
     from os.path import join
     from tempfile import TemporaryDirectory
     import importlib.machinery as machinery
@@ -75,8 +83,12 @@ def tests_extension_file_finder():
         _ExtensionFileFinder,
         ARCH_SUFFIXES,
         _PROCESSED_COMPILERS,
+        _init_extensions_suffixes,
     )
 
+    # Suffixes are lazily computed
+    _init_extensions_suffixes()
+
     # Create fake compiler and extensions on environments without ARCH_SUFFIXES
     if not ARCH_SUFFIXES:
         ARCH_SUFFIXES += [".fake1", ".fake2"]
@@ -98,19 +110,20 @@ def tests_extension_file_finder():
     # Test find_spec
     # Monkey patch importlib machinery for don't need to import unexisting file.
     module_spec = machinery.ModuleSpec
-    extension_file_loader = machinery.ExtensionFileLoader
+    variant_file_loader = imports._VariantFileLoader
 
     def dummy_spec(_, loader, *, origin=None):
         """Dummy ModuleSpec"""
         assert loader == origin
         return origin
 
-    def dummy_fileloader(_, path):
-        """Dummy ExtensionFileLoader"""
+    def dummy_fileloader(_, path, *args):
+        """Dummy _VariantFileLoader"""
         return path
 
     machinery.ModuleSpec = dummy_spec
-    machinery.ExtensionFileLoader = dummy_fileloader
+    imports._VariantFileLoader = dummy_fileloader
+    imports.register("compilertools_dummy_file", "compilertools_dummy_package")
 
     try:
         for use_compiler_file in (False, True):
@@ -133,24 +146,915 @@ def tests_extension_file_finder():
                 file_finder = _ExtensionFileFinder()
 
                 # Existing file
-                assert file_finder.find_spec(name, "") == file_path
+                assert file_finder.find_spec(name, None) == file_path
 
                 if use_compiler_file:
                     assert compiler in _PROCESSED_COMPILERS
 
                     # Checks called twice
-                    assert file_finder.find_spec(name, "") == file_path
+                    assert file_finder.find_spec(name, None) == file_path
 
                 # non-existing file
-                assert file_finder.find_spec("compilertools_notexists_file", "") is None
+                name = "compilertools_notexists_file"
+                assert file_finder.find_spec(name, None) is None
+
+                # Submodule in parent package directory
+                package = join(tmp, "compilertools_dummy_package")
+                mkdir(package)
+                file_path = join(package, "".join(["_kernels", ext]))
+                with open(file_path, "wt") as file:
+                    file.write("")
+                fullname = "compilertools_dummy_package._kernels"
+                assert file_finder.find_spec(fullname, [package]) == file_path
+                assert file_finder.find_spec(fullname, None) is None
+                assert file_finder.find_spec(fullname, [tmp]) is None
 
                 sys.path.remove(tmp)
 
     finally:
         machinery.ModuleSpec = module_spec
-        machinery.ExtensionFileLoader = extension_file_loader
+        imports._VariantFileLoader = variant_file_loader
+        imports._REGISTERED_NAMES.clear()
 
         if imports_update_extensions_suffixes:
             ARCH_SUFFIXES.clear()
             _PROCESSED_COMPILERS.discard("fake_compiler")
             imports.update_extensions_suffixes = imports_update_extensions_suffixes
+
+
+def tests_register():
+    """Test packages registration"""
+    import sys
+    import importlib
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    import compilertools.imports as imports
+    from compilertools.imports import _ExtensionFileFinder, register, _marked_names
+    from compilertools._config import CONFIG
+
+    finder = _ExtensionFileFinder()
+    directory_entries = imports._directory_entries
+    searched = []
+
+    def listed_directory_entries(directory):
+        """Records searched directories"""
+        searched.append(directory)
+        return directory_entries(directory)
+
+    imports._directory_entries = listed_directory_entries
+    package = "compilertools_dummy_package"
+    package_path = ["compilertools_dummy_package_path"]
+    try:
+        # Not registered
+        assert finder.find_spec(f"{package}.module", package_path) is None
+        assert package_path[0] not in searched
+
+        # Registered by API
+        register(f"{package}.module")
+        assert package in imports._REGISTERED_NAMES
+        assert finder.find_spec(f"{package}.module", package_path) is None
+        assert package_path[0] in searched
+        imports._REGISTERED_NAMES.clear()
+        searched.clear()
+
+        # Global mode
+        CONFIG["imports_global"] = True
+        try:
+            assert finder.find_spec(f"{package}.module", package_path) is None
+            assert package_path[0] in searched
+        finally:
+            CONFIG["imports_global"] = False
+
+    finally:
+        imports._directory_entries = directory_entries
+        imports._REGISTERED_NAMES.clear()
+
+    # Registered by build marker
+    with TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        try:
+            assert package not in _marked_names()
+            with open(join(tmp, f"{package}.compilertools"), "wt") as file:
+                file.write("")
+            importlib.invalidate_caches()
+            assert _marked_names()[package] == []
+            manifests = [
+                join(tmp, f"{package}.compilertools.json"),
+                join(tmp, f"{package}.distribution.compilertools.json"),
+            ]
+            for manifest in manifests:
+                with open(manifest, "wt") as file:
+                    file.write("")
+            importlib.invalidate_caches()
+            assert _marked_names()[package] == manifests
+        finally:
+            sys.path.remove(tmp)
+
+    # Updated on "sys.path" change
+    assert package not in _marked_names()
+
+
+def tests_manifest():
+    """Test variants manifest"""
+    import sys
+    import importlib
+    from json import dump
+    from os import mkdir
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from compilertools.imports import (
+        ARCH_SUFFIXES,
+        _ExtensionFileFinder,
+        _init_extensions_suffixes,
+        _load_manifest,
+    )
+
+    _init_extensions_suffixes()
+    if not ARCH_SUFFIXES:
+        from pytest import skip
+
+        skip("ARCH_SUFFIXES is empty on current environment")
+
+    finder = _ExtensionFileFinder()
+    package = "compilertools_dummy_package"
+    best, other = ARCH_SUFFIXES[0], ARCH_SUFFIXES[-1]
+    manifest = {
+        "compiler": "gcc",
+        "modules": {
+            f"{package}.module": {
+                suffix: f"{package}/module{suffix}" for suffix in (best, other)
+            }
+        },
+    }
+
+    with TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        importlib.invalidate_caches()
+        try:
+            mkdir(join(tmp, package))
+            manifest_path = join(tmp, f"{package}.compilertools.json")
+            with open(manifest_path, "wt") as file:
+                dump(manifest, file)
+            assert _load_manifest(manifest_path) == manifest
+
+            # Files listed in the manifest, but not existing
+            assert finder.find_spec(f"{package}.module", [tmp]) is None
+
+            # Best variant
+            for suffix in (best, other):
+                with open(join(tmp, package, f"module{suffix}"), "wt") as file:
+                    file.write("")
+            spec = finder.find_spec(f"{package}.module", ["not_searched"])
+            assert spec.origin == join(tmp, package, f"module{best}")
+            assert spec.name == f"{package}.module"
+
+            # Module not in manifest, looked up in directories
+            package_path = [join(tmp, package)]
+            assert finder.find_spec(f"{package}.other", package_path) is None
+            with open(join(tmp, package, f"other{best}"), "wt") as file:
+                file.write("")
+            importlib.invalidate_caches()
+            spec = finder.find_spec(f"{package}.other", package_path)
+            assert spec.origin == join(tmp, package, f"other{best}")
+
+            # Manifest of another distribution sharing the namespace package
+            with open(join(tmp, f"{package}.dist.compilertools.json"), "wt") as file:
+                dump(
+                    {
+                        "compiler": "gcc",
+                        "modules": {
+                            f"{package}.third": {other: f"{package}/third{other}"}
+                        },
+                    },
+                    file,
+                )
+            with open(join(tmp, package, f"third{other}"), "wt") as file:
+                file.write("")
+            importlib.invalidate_caches()
+            spec = finder.find_spec(f"{package}.third", ["not_searched"])
+            assert spec.origin == join(tmp, package, f"third{other}")
+            spec = finder.find_spec(f"{package}.module", ["not_searched"])
+            assert spec.origin == join(tmp, package, f"module{best}")
+
+            # Invalid manifest
+            with open(manifest_path, "wt") as file:
+                file.write("[]")
+            importlib.invalidate_caches()
+            assert _load_manifest(manifest_path) is None
+        finally:
+            sys.path.remove(tmp)
+            importlib.invalidate_caches()
+
+
+def tests_statistics():
+    """Test import hook statistics"""
+    import sys
+    import importlib
+    from io import StringIO
+    from json import dump
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from importlib.machinery import EXTENSION_SUFFIXES
+    import compilertools.imports as imports
+    from compilertools.imports import (
+        ARCH_SUFFIXES,
+        _ExtensionFileFinder,
+        _init_extensions_suffixes,
+        enable_statistics,
+        get_statistics,
+        dump_statistics,
+    )
+
+    _init_extensions_suffixes()
+    if not ARCH_SUFFIXES:
+        from pytest import skip
+
+        skip("ARCH_SUFFIXES is empty on current environment")
+
+    finder = _ExtensionFileFinder()
+    name = "compilertools_dummy_stats"
+    best, other = ARCH_SUFFIXES[0], ARCH_SUFFIXES[-1]
+    incompatible = f".compilertools_dummy{EXTENSION_SUFFIXES[0]}"
+
+    # Disabled by default
+    assert get_statistics() is None
+    assert finder.find_spec(name) is None
+
+    with TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        importlib.invalidate_caches()
+        imports.register(name)
+        enable_statistics()
+        try:
+            for suffix in (best, other, incompatible):
+                with open(join(tmp, f"{name}{suffix}"), "wt") as file:
+                    file.write("")
+
+            # Directories lookup
+            spec = finder.find_spec(name)
+            assert spec.origin == join(tmp, f"{name}{best}")
+            assert finder.find_spec("compilertools_dummy_not_registered") is None
+
+            statistics = get_statistics()
+            assert statistics["finder_calls"] == 2
+            assert statistics["probes"] >= 2
+            assert list(statistics["modules"]) == [name]
+            record = statistics["modules"][name]
+            assert record["variant"] == spec.origin
+            assert record["suffix"] == best
+            assert record["candidates"] == [best, other]
+            assert record["rejected"] == {
+                other: "lower priority",
+                incompatible: "not compatible with current machine",
+            }
+            assert record["probes"] >= 2
+            assert 0 < record["time"] <= statistics["finder_time"]
+
+            # Manifest lookup
+            with open(join(tmp, f"{name}.compilertools.json"), "wt") as file:
+                dump(
+                    {
+                        "compiler": "gcc",
+                        "modules": {
+                            name: {
+                                suffix: f"{name}{suffix}"
+                                for suffix in (
+                                    best,
+                                    other,
+                                    incompatible,
+                                    EXTENSION_SUFFIXES[0],
+                                )
+                            },
+                            f"{name}.missing": {best: f"missing{best}"},
+                        },
+                    },
+                    file,
+                )
+            importlib.invalidate_caches()
+            assert finder.find_spec(name).origin == spec.origin
+            record = get_statistics()["modules"][name]
+            assert record["rejected"] == {
+                other: "lower priority",
+                incompatible: "not compatible with current machine",
+                EXTENSION_SUFFIXES[0]: "generic module",
+            }
+
+            assert finder.find_spec(f"{name}.missing", [tmp]) is None
+            record = get_statistics()["modules"][f"{name}.missing"]
+            assert record["variant"] is None
+            assert record["reason"] == "no compatible variant"
+            assert record["rejected"] == {best: "file not found"}
+
+            assert finder.find_spec(f"{name}.other", [tmp]) is None
+            record = get_statistics()["modules"][f"{name}.other"]
+            assert record["reason"] == "no variant files"
+
+            # Text dump
+            output = StringIO()
+            dump_statistics(output)
+            output = output.getvalue()
+            assert f"| {name} | {spec.origin}" in output
+            assert f"{other}: lower priority" in output
+            assert "(no variant files)" in output
+
+            enable_statistics(False)
+            assert get_statistics() is None
+        finally:
+            enable_statistics(False)
+            imports._REGISTERED_NAMES.clear()
+            sys.path.remove(tmp)
+            importlib.invalidate_caches()
+
+
+def tests_overrides(caplog):
+    """Test variants selection overrides"""
+    import os
+    import sys
+    import importlib
+    from json import dump
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from importlib.machinery import EXTENSION_SUFFIXES
+    import compilertools.imports as imports
+    from compilertools.imports import (
+        ARCH_SUFFIXES,
+        _ExtensionFileFinder,
+        _init_extensions_suffixes,
+        _overrides,
+        _filter_args,
+        enable_statistics,
+        get_statistics,
+    )
+    from compilertools._core import get_compiler
+    from compilertools.processors import get_arch
+
+    environ = {
+        "COMPILERTOOLS_EXCLUDE_SUFFIXES": " intel, avx512_spr",
+        "COMPILERTOOLS_FORCE_VARIANT": "pkg.module:avx2,other:generic",
+    }
+    with TemporaryDirectory() as tmp:
+        environ["COMPILERTOOLS_CONFIG"] = join(tmp, "config.json")
+        with open(environ["COMPILERTOOLS_CONFIG"], "wt") as file:
+            dump(
+                {
+                    "max_isa": "x86_64_v3",
+                    "exclude_suffixes": ["avx"],
+                    "force_variants": {"pkg.module": "avx", "pkg.other": "avx"},
+                },
+                file,
+            )
+        os.environ.update(environ)
+        imports._OVERRIDES = None
+        try:
+            # Configuration file, then environment variables
+            overrides = _overrides()
+            assert overrides == {
+                "max_isa": "x86_64_v3",
+                "exclude_suffixes": ["intel", "avx512_spr"],
+                "force_variants": {
+                    "pkg.module": "avx2",
+                    "pkg.other": "avx",
+                    "other": "generic",
+                },
+            }
+
+            # Evaluated once
+            os.environ["COMPILERTOOLS_MAX_ISA"] = "avx"
+            assert _overrides() is overrides
+
+            # Excluded arguments
+            if get_arch() == "x86_64":
+                compiler = get_compiler("gcc")
+                args = _filter_args(compiler, compiler.compile_args())
+                assert list(args) == ["x86_64_v3", "avx2", "avx", "x86_64_v2", ""]
+                assert f".avx512_spr{EXTENSION_SUFFIXES[0]}" in (
+                    imports._EXCLUDED_SUFFIXES
+                )
+
+                # Unknown instruction set ceiling
+                overrides["max_isa"] = "compilertools_unknown"
+                caplog.clear()
+                assert "x86_64_v4" in _filter_args(compiler, compiler.compile_args())
+                assert "compilertools_unknown" in caplog.text
+        finally:
+            for name in list(environ) + ["COMPILERTOOLS_MAX_ISA"]:
+                del os.environ[name]
+            imports._OVERRIDES = None
+            imports._EXCLUDED_SUFFIXES.clear()
+
+    # Forced variants
+    _init_extensions_suffixes()
+    if not ARCH_SUFFIXES:
+        from pytest import skip
+
+        skip("ARCH_SUFFIXES is empty on current environment")
+
+    finder = _ExtensionFileFinder()
+    name = "compilertools_dummy_forced"
+    best = ARCH_SUFFIXES[0]
+    forced = f".compilertools_dummy{EXTENSION_SUFFIXES[0]}"
+    with TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        importlib.invalidate_caches()
+        imports.register(name)
+        enable_statistics()
+        try:
+            for suffix in (best, forced):
+                with open(join(tmp, f"{name}{suffix}"), "wt") as file:
+                    file.write("")
+
+            imports._OVERRIDES = {
+                "max_isa": None,
+                "exclude_suffixes": [],
+                "force_variants": {name: "compilertools_dummy"},
+            }
+            assert finder.find_spec(name).origin == join(tmp, f"{name}{forced}")
+            record = get_statistics()["modules"][name]
+            assert record["reason"] == "forced variant"
+            assert record["rejected"] == {best: "lower priority"}
+
+            imports._OVERRIDES["force_variants"][name] = "compilertools_missing"
+            assert finder.find_spec(name).origin == join(tmp, f"{name}{best}")
+            record = get_statistics()["modules"][name]
+            assert record["reason"].endswith("(forced variant not found)")
+
+            imports._OVERRIDES["force_variants"][name] = "generic"
+            assert finder.find_spec(name) is None
+            record = get_statistics()["modules"][name]
+            assert record["reason"] == "forced generic module"
+        finally:
+            enable_statistics(False)
+            imports._OVERRIDES = None
+            imports._REGISTERED_NAMES.clear()
+            sys.path.remove(tmp)
+            importlib.invalidate_caches()
+
+
+def tests_overrides_global():
+    """Test reading overrides imports "json" only if there is a configuration file,
+    and does not recurse into the import hook in global mode"""
+    import os
+    from os.path import join
+    from subprocess import run, PIPE
+    from sys import executable
+    from tempfile import TemporaryDirectory
+
+    script = "\n".join(
+        (
+            "import sys",
+            "from compilertools._config import CONFIG",
+            "import compilertools.imports",
+            "import colorsys",
+            "print(compilertools.imports._OVERRIDES is not None, end=' ')",
+            "print('json' in sys.modules, end=' ')",
+            "CONFIG['imports_global'] = True",
+            "compilertools.imports._OVERRIDES = None",
+            "import json",
+            "print(compilertools.imports._OVERRIDES is not None, end='')",
+        )
+    )
+    with TemporaryDirectory() as tmp:
+        # "json" is not imported without configuration file
+        environ = dict(os.environ)
+        environ["COMPILERTOOLS_CONFIG"] = join(tmp, "config.json")
+        process = run([executable, "-c", script], stdout=PIPE, stderr=PIPE, env=environ)
+        assert process.returncode == 0, process.stderr.decode()
+        assert process.stdout.decode() == "True False True"
+
+
+def tests_load_fallback():
+    """Test fallback to next variants if a variant fails to load"""
+    import sys
+    import importlib
+    from importlib.machinery import ExtensionFileLoader
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    from pytest import raises
+    import compilertools.imports as imports
+    from compilertools._cache import load_cache
+    from compilertools._config import CONFIG
+    from compilertools.imports import (
+        ARCH_SUFFIXES,
+        _ExtensionFileFinder,
+        _init_extensions_suffixes,
+        enable_statistics,
+        get_statistics,
+    )
+
+    _init_extensions_suffixes()
+    if len(ARCH_SUFFIXES) < 2:
+        from pytest import skip
+
+        skip("Not enough ARCH_SUFFIXES on current environment")
+
+    name = "compilertools_dummy_fallback"
+    init_name = "compilertools_dummy_init_error"
+    best, other = ARCH_SUFFIXES[0], ARCH_SUFFIXES[-1]
+    create_module_base = ExtensionFileLoader.create_module
+    with TemporaryDirectory() as tmp:
+        sys.path.insert(0, tmp)
+        importlib.invalidate_caches()
+        imports.register(name)
+        imports._BAD_VARIANTS = None
+        CONFIG["logging"] = False
+        enable_statistics()
+        try:
+            # Invalid variants files and valid generic module
+            for suffix in (best, other):
+                with open(join(tmp, f"{name}{suffix}"), "wt") as file:
+                    file.write("invalid")
+            with open(join(tmp, f"{name}.py"), "wt") as file:
+                file.write("VALUE = 1\n")
+
+            module = importlib.import_module(name)
+            assert module.VALUE == 1
+            assert module.__file__ == join(tmp, f"{name}.py")
+            record = get_statistics()["modules"][name]
+            assert record["reason"] == "generic module after load failure"
+            assert record["variant"] == join(tmp, f"{name}.py")
+            assert record["rejected"][best].startswith("failed to load: ")
+            assert record["rejected"][other].startswith("failed to load: ")
+
+            # Bad variants are stored and skipped by next processes
+            bad_variants = load_cache("bad_variants")
+            assert join(tmp, f"{name}{best}") in bad_variants
+            assert join(tmp, f"{name}{other}") in bad_variants
+            imports._BAD_VARIANTS = None
+            assert _ExtensionFileFinder().find_spec(name) is None
+            record = get_statistics()["modules"][name]
+            assert record["rejected"][best] == "failed to load previously"
+
+            # Retried once modified
+            with open(join(tmp, f"{name}{best}"), "wt") as file:
+                file.write("modified")
+            spec = _ExtensionFileFinder().find_spec(name)
+            assert spec.origin == join(tmp, f"{name}{best}")
+
+            # Errors from the module initialization are raised, and not stored
+            def create_module(*_):
+                """Raises like a module importing a missing dependency"""
+                raise ModuleNotFoundError("No module named 'missing'", name="missing")
+
+            with open(join(tmp, f"{init_name}{best}"), "wt") as file:
+                file.write("")
+            imports.register(init_name)
+            importlib.invalidate_caches()
+            ExtensionFileLoader.create_module = create_module
+            with raises(ModuleNotFoundError):
+                importlib.import_module(init_name)
+            assert join(tmp, f"{init_name}{best}") not in load_cache("bad_variants")
+            assert not imports._is_bad_variant(join(tmp, f"{init_name}{best}"))
+        finally:
+            ExtensionFileLoader.create_module = create_module_base
+            enable_statistics(False)
+            CONFIG["logging"] = True
+            imports._BAD_VARIANTS = None
+            imports._REGISTERED_NAMES.clear()
+            sys.modules.pop(name, None)
+            sys.modules.pop(init_name, None)
+            sys.path.remove(tmp)
+            importlib.invalidate_caches()
+
+
+def tests_selftest():
+    """Test variants self-test in subprocess"""
+    import sys
+    import importlib
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    import compilertools.imports as imports
+    from compilertools._cache import load_cache
+    from compilertools._config import CONFIG
+    from compilertools.imports import (
+        ARCH_SUFFIXES,
+        _ExtensionFileFinder,
+        _init_extensions_suffixes,
+        enable_statistics,
+        get_statistics,
+    )
+
+    _init_extensions_suffixes()
+    if len(ARCH_SUFFIXES) < 2:
+        from pytest import skip
+
+        skip("Not enough ARCH_SUFFIXES on current environment")
+
+    finder = _ExtensionFileFinder()
+    name = "compilertools_dummy_selftest"
+    best, other = ARCH_SUFFIXES[0], ARCH_SUFFIXES[-1]
+    run_selftest = imports._run_selftest
+    calls = []
+
+    def dummy_run_selftest(fullname, file_path):
+        """Dummy _run_selftest"""
+        assert fullname == name
+        calls.append(file_path)
+        return file_path.endswith(other), "killed by SIGILL"
+
+    with TemporaryDirectory() as tmp:
+        best_path = join(tmp, f"{name}{best}")
+        other_path = join(tmp, f"{name}{other}")
+        for file_path in (best_path, other_path):
+            with open(file_path, "wt") as file:
+                file.write("invalid")
+
+        sys.path.insert(0, tmp)
+        importlib.invalidate_caches()
+        imports.register(name)
+        imports._SELFTESTS = None
+        try:
+            # Disabled by default
+            assert finder.find_spec(name).origin == best_path
+
+            # Subprocess
+            passed, message = run_selftest(name, best_path)
+            assert passed is False
+            assert message
+
+            # Failing variants are skipped
+            CONFIG["imports_selftest"] = True
+            imports._run_selftest = dummy_run_selftest
+            enable_statistics()
+            assert finder.find_spec(name).origin == other_path
+            assert calls == [best_path, other_path]
+            record = get_statistics()["modules"][name]
+            assert record["rejected"][best] == "failed self-test: killed by SIGILL"
+            assert record["selftest_time"] > 0
+
+            # Results are stored for next processes
+            results = load_cache("selftests")["results"]
+            assert results[best_path][2:] == [False, "killed by SIGILL"]
+            assert results[other_path][2:] == [True, "killed by SIGILL"]
+            imports._SELFTESTS = None
+            assert finder.find_spec(name).origin == other_path
+            assert len(calls) == 2
+
+            # Tested again once modified
+            with open(best_path, "wt") as file:
+                file.write("modified")
+            assert finder.find_spec(name).origin == other_path
+            assert calls[2:] == [best_path]
+        finally:
+            CONFIG["imports_selftest"] = False
+            imports._run_selftest = run_selftest
+            imports._SELFTESTS = None
+            enable_statistics(False)
+            imports._REGISTERED_NAMES.clear()
+            sys.path.remove(tmp)
+            importlib.invalidate_caches()
+
+
+def tests_autotune():
+    """Test variants autotuning"""
+    import sys
+    import importlib
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    import compilertools.imports as imports
+    from compilertools._cache import load_cache
+    from compilertools.imports import (
+        ARCH_SUFFIXES,
+        _ExtensionFileFinder,
+        _init_extensions_suffixes,
+        autotune,
+        run_autotune,
+        get_autotune_results,
+        enable_statistics,
+        get_statistics,
+    )
+
+    _init_extensions_suffixes()
+    if len(ARCH_SUFFIXES) < 2:
+        from pytest import skip
+
+        skip("Not enough ARCH_SUFFIXES on current environment")
+
+    finder = _ExtensionFileFinder()
+    name = "compilertools_dummy_autotune"
+    best, other = ARCH_SUFFIXES[0], ARCH_SUFFIXES[-1]
+    run_benchmark = imports._run_benchmark
+    calls = []
+
+    def dummy_run_benchmark(fullname, file_path, benchmark):
+        """Dummy _run_benchmark"""
+        assert fullname == name
+        calls.append(file_path)
+        return 0.5 if file_path.endswith(other) else 1.0
+
+    with TemporaryDirectory() as tmp:
+        best_path = join(tmp, f"{name}{best}")
+        other_path = join(tmp, f"{name}{other}")
+        for file_path in (best_path, other_path):
+            with open(file_path, "wt") as file:
+                file.write("invalid")
+
+        sys.path.insert(0, tmp)
+        importlib.invalidate_caches()
+        imports._AUTOTUNE = None
+        try:
+            # Subprocess
+            assert run_benchmark(name, best_path, "os.path:join") is None
+            import math
+
+            if getattr(math, "__file__", None):
+                assert run_benchmark("math", math.__file__, "builtins:id") >= 0
+
+            # Fastest variant
+            imports._run_benchmark = dummy_run_benchmark
+            autotune(name, "compilertools_dummy_bench:run")
+            enable_statistics()
+            assert finder.find_spec(name).origin == other_path
+            assert calls == [best_path, other_path]
+            record = get_statistics()["modules"][name]
+            assert record["reason"] == "fastest variant (autotuning)"
+            assert record["autotune_time"] > 0
+
+            # Results are stored for next processes
+            result = {
+                "benchmark": "compilertools_dummy_bench:run",
+                "timings": {best: 1.0, other: 0.5},
+            }
+            assert load_cache("autotune")["results"][name] == result
+            imports._AUTOTUNE = None
+            assert get_autotune_results()[name] == result
+            assert finder.find_spec(name).origin == other_path
+            assert len(calls) == 2
+
+            # Stored results are used by processes not enabling autotuning
+            imports._AUTOTUNE = None
+            imports._AUTOTUNE_BENCHMARKS.clear()
+            assert finder.find_spec(name).origin == other_path
+            record = get_statistics()["modules"][name]
+            assert record["reason"] == "fastest variant (autotuning)"
+            assert len(calls) == 2
+
+            # Benchmarked again if the benchmark changed
+            autotune(name, dummy_run_benchmark)
+            assert finder.find_spec(name).origin == other_path
+            assert len(calls) == 4
+            assert get_autotune_results()[name]["benchmark"] == (
+                "tests.test_imports:tests_autotune.<locals>.dummy_run_benchmark"
+            )
+
+            # Forced run
+            assert run_autotune(name)["timings"] == result["timings"]
+            assert len(calls) == 6
+        finally:
+            imports._run_benchmark = run_benchmark
+            imports._AUTOTUNE = None
+            imports._AUTOTUNE_BENCHMARKS.clear()
+            enable_statistics(False)
+            imports._REGISTERED_NAMES.clear()
+            sys.path.remove(tmp)
+            importlib.invalidate_caches()
+
+
+def tests_lazy_initialization():
+    """Test suffixes are only computed when an optimized module is imported"""
+    from os.path import join
+    from subprocess import run, PIPE
+    from sys import executable
+    from tempfile import TemporaryDirectory
+    from importlib.machinery import EXTENSION_SUFFIXES
+
+    script = "\n".join(
+        (
+            "import sys",
+            "sys.path.insert(0, %r)",
+            "import compilertools.imports as imports",
+            "imports.register('compilertools_dummy_lazy')",
+            "print(imports._INITIALIZED, end=' ')",
+            "try:",
+            "    import compilertools_dummy_lazy",
+            "except ImportError:",
+            "    pass",
+            "print(imports._INITIALIZED, end=' ')",
+            "print('compilertools.compilers._core' in sys.modules, end='')",
+        )
+    )
+
+    with TemporaryDirectory() as tmp:
+        # No optimized module
+        process = run([executable, "-c", script % tmp], stdout=PIPE, check=True)
+        assert process.stdout.decode() == "False False False"
+
+        # Optimized module variant file
+        file_path = join(tmp, f"compilertools_dummy_lazy.avx{EXTENSION_SUFFIXES[0]}")
+        with open(file_path, "wt") as file:
+            file.write("")
+        process = run([executable, "-c", script % tmp], stdout=PIPE, check=True)
+        assert process.stdout.decode() == "False True True"
+
+
+def tests_no_subprocess_at_runtime():
+    """Test no subprocess is run and no distutils is imported at runtime"""
+    from json import loads
+    from subprocess import run, PIPE
+    from sys import executable, version_info
+    from tempfile import TemporaryDirectory
+    from compilertools.compilers import get_compiler
+
+    if version_info < (3, 8):
+        from pytest import skip
+
+        skip("Audit hooks requires Python 3.8 or more")
+
+    script = "\n".join(
+        (
+            "import sys",
+            "from json import dumps",
+            "from os.path import join",
+            "sys.path.insert(0, %r)",
+            "spawned = []",
+            "def hook(event, args):",
+            "    if event.split('.')[0] in ('subprocess', 'os') and event.split(",
+            "        '.')[1] in ('Popen', 'system', 'posix_spawn', 'spawn', 'exec',",
+            "        'fork', 'forkpty'):",
+            "        spawned.append(event)",
+            "sys.addaudithook(hook)",
+            "import compilertools",
+            "import compilertools.imports as imports",
+            "names = ('compilertools_dummy_sidecar', 'compilertools_dummy_default')",
+            "for name in names:",
+            "    imports.register(name)",
+            "    with open(join(sys.path[0], name + '.py'), 'wt') as file:",
+            "        file.write('')",
+            "with open(join(sys.path[0], names[0] + '.compilertools'), 'wt') as file:",
+            "    file.write('llvm')",
+            "import compilertools_dummy_sidecar",
+            "if imports.ARCH_SUFFIXES:",
+            "    file_name = names[1] + imports.ARCH_SUFFIXES[0]",
+            "    with open(join(sys.path[0], file_name), 'wt') as file:",
+            "        file.write('')",
+            "import importlib",
+            "importlib.invalidate_caches()",
+            "import compilertools_dummy_default",
+            "print(dumps({",
+            "    'spawned': spawned,",
+            "    'compilers': sorted(imports._PROCESSED_COMPILERS),",
+            "    'modules': [name for name in sys.modules",
+            "                if name.split('.')[0] in ('distutils', 'setuptools')],",
+            "}))",
+        )
+    )
+
+    with TemporaryDirectory() as tmp:
+        process = run([executable, "-c", script % tmp], stdout=PIPE, stderr=PIPE)
+        assert process.returncode == 0, process.stderr.decode()
+        result = loads(process.stdout.decode())
+        assert result["spawned"] == []
+        assert result["modules"] == []
+        # Default compiler suffixes are also available for modules without sidecar
+        assert result["compilers"] == sorted({get_compiler().name, "llvm"})
+
+
+def tests_directory_entries():
+    """Test directories listings cache"""
+    import importlib
+    from os import utime
+    from os.path import join
+    from tempfile import TemporaryDirectory
+    import compilertools.imports as imports
+    from compilertools.imports import _directory_entries, _variants_names
+
+    listed = []
+    imports_listdir = imports._listdir
+
+    def listdir(directory):
+        """Counting listdir"""
+        listed.append(directory)
+        return imports_listdir(directory)
+
+    imports._listdir = listdir
+    try:
+        with TemporaryDirectory() as tmp:
+            ext = importlib.machinery.EXTENSION_SUFFIXES[0]
+            with open(join(tmp, f"module.avx2{ext}"), "wt") as file:
+                file.write("")
+
+            # Cached listing
+            entries = _directory_entries(tmp)
+            assert entries == {f"module.avx2{ext}"}
+            assert _directory_entries(tmp) is entries
+            assert listed == [tmp]
+            assert _variants_names(tmp, entries) == {"module"}
+            assert _variants_names(tmp, entries) is _variants_names(tmp, entries)
+
+            # Updated on directory modification time change
+            with open(join(tmp, "module.compilertools"), "wt") as file:
+                file.write("")
+            utime(tmp, ns=(0, 0))
+            assert "module.compilertools" in _directory_entries(tmp)
+            assert listed == [tmp, tmp]
+
+            # Updated on "importlib.invalidate_caches"
+            importlib.invalidate_caches()
+            assert tmp not in imports._DIRECTORIES_CACHE
+            _directory_entries(tmp)
+            assert listed == [tmp, tmp, tmp]
+
+        # Missing directory
+        assert _directory_entries(tmp) == frozenset()
+
+    finally:
+        imports._listdir = imports_listdir
@@ -72,3 +72,129 @@ def tests_processor_base():
 
     # Test arch
     assert processor.arch == "_core"
+
+
+def tests_processor_base_persistent_property():
+    """Test ProcessorBase._persistent_property"""
+    from compilertools.processors import ProcessorBase
+    from compilertools._cache import load_cache, dump_cache
+    from compilertools._version import __version__
+    import compilertools._config as _config
+
+    calls = []
+
+    class Processor(ProcessorBase):
+        """Dummy processor"""
+
+        fingerprint_value = "fingerprint1"
+
+        @ProcessorBase._memoized_property
+        def fingerprint(self):
+            """Fingerprint"""
+            return self.fingerprint_value
+
+        @ProcessorBase._persistent_property
+        def features(self):
+            """Features"""
+            calls.append(1)
+            return {"feature1", "feature2"}
+
+    name = f"processor_{Processor().arch}"
+
+    # Not current machine: not cached
+    assert Processor().features == {"feature1", "feature2"}
+    assert load_cache(name) is None
+
+    # First process: computed and cached
+    assert Processor(current_machine=True).features == {"feature1", "feature2"}
+    assert len(calls) == 2
+    assert load_cache(name) == {
+        "fingerprint": "fingerprint1",
+        "version": __version__,
+        "features": {"feature1", "feature2"},
+    }
+
+    # Next process: From cache
+    assert Processor(current_machine=True).features == {"feature1", "feature2"}
+    assert len(calls) == 2
+
+    # Fingerprint changed: computed again
+    Processor.fingerprint_value = "fingerprint2"
+    assert Processor(current_machine=True).features == {"feature1", "feature2"}
+    assert len(calls) == 3
+    assert load_cache(name)["fingerprint"] == "fingerprint2"
+
+    # Compilertools version changed: computed again
+    cache = load_cache(name)
+    cache["version"] = "0.0.0"
+    dump_cache(name, cache)
+    assert Processor(current_machine=True).features == {"feature1", "feature2"}
+    assert len(calls) == 4
+    assert load_cache(name)["version"] == __version__
+
+    # Deleted value: computed again
+    processor = Processor(current_machine=True)
+    assert processor.features == {"feature1", "feature2"}
+    del processor["features"]
+    assert processor.features == {"feature1", "feature2"}
+    assert len(calls) == 5
+
+    # Cache disabled
+    _config.CONFIG["cache"] = False
+    try:
+        assert Processor(current_machine=True).features == {"feature1", "feature2"}
+        assert len(calls) == 6
+    finally:
+        _config.CONFIG["cache"] = True
+
+
+def tests_processor_base_topology(tmpdir):
+    """Test ProcessorBase caches and cores"""
+    from os import cpu_count
+    from compilertools.processors import ProcessorBase
+    from compilertools.processors._core import _count_cpu_list, _sysfs_caches
+
+    # Not current machine
+    processor = ProcessorBase()
+    assert processor.caches == {}
+    assert processor.logical_cores == 0
+    assert processor.physical_cores == 0
+    assert processor.threads_per_core == 1
+
+    # Current machine
+    processor = ProcessorBase(current_machine=True)
+    assert 1 <= processor.logical_cores <= cpu_count()
+    assert processor.physical_cores == max(
+        1, processor.logical_cores // processor.threads_per_core
+    )
+    assert isinstance(processor.caches, dict)
+
+    # CPU list
+    assert _count_cpu_list(None) is None
+    assert _count_cpu_list("0") == 1
+    assert _count_cpu_list("0,4") == 2
+    assert _count_cpu_list("0-3,8-11,16") == 9
+
+    # Caches from sysfs
+    assert _sysfs_caches(str(tmpdir)) is None
+    for index, level, cache_type, size, shared in (
+        (0, 1, "Data", "48K", "0,56"),
+        (1, 1, "Instruction", "32K", "0,56"),
+        (2, 2, "Unified", "2048K", "0,56"),
+        (3, 3, "Unified", "105M", "0-111"),
+        (4, 4, "Unknown", "1M", "0"),
+    ):
+        index_dir = tmpdir.join("cache").ensure(f"index{index}", dir=True)
+        index_dir.join("level").write(f"{level}\n")
+        index_dir.join("type").write(f"{cache_type}\n")
+        index_dir.join("size").write(f"{size}\n")
+        index_dir.join("coherency_line_size").write("64\n")
+        index_dir.join("shared_cpu_list").write(f"{shared}\n")
+    tmpdir.join("cache").ensure("uevent")
+
+    assert _sysfs_caches(str(tmpdir)) == {
+        "L1d": {"size": 48 << 10, "line_size": 64, "shared_threads": 2},
+        "L1i": {"size": 32 << 10, "line_size": 64, "shared_threads": 2},
+        "L2": {"size": 2048 << 10, "line_size": 64, "shared_threads": 2},
+        "L3": {"size": 105 << 20, "line_size": 64, "shared_threads": 112},
+    }
@@ -1,5 +1,55 @@
 """Tests for x86-32 CPU"""
 
+#: CPUID results recorded on an Intel Xeon (Sapphire Rapids) Linux machine
+RECORDED_CPUID = {
+    0x0: (0x00000020, 0x756E6547, 0x6C65746E, 0x49656E69),
+    0x1: (0x000C06F2, 0x00010800, 0xFFFA3203, 0x0F8BFBFF),
+    0x7: (0x00000002, 0xF1BF27EB, 0x1B415FDE, 0xBFD14410),
+    0x80000000: (0x80000008, 0, 0, 0),
+    0x80000001: (0, 0, 0x00000121, 0x2C100800),
+    0x80000002: (0x65746E49, 0x2952286C, 0x6F655820, 0x2952286E),
+    0x80000003: (0x6F725020, 0x73736563, 0x0000726F, 0),
+    0x80000004: (0, 0, 0, 0),
+}
+
+#: CPUID subleaves results, recorded on the same machine
+RECORDED_CPUID_SUBLEAVES = {
+    (0x7, 1): (0x00001C30, 0, 0, 0),
+    (0x4, 0): (0x00000121, 0x02C0003F, 0x0000003F, 0),
+    (0x4, 1): (0x00000122, 0x01C0003F, 0x0000003F, 0),
+    (0x4, 2): (0x00000143, 0x03C0003F, 0x000007FF, 0),
+    (0x4, 3): (0x00000163, 0x04C0003F, 0x0003BFFF, 0x00000004),
+    (0xB, 0): (0, 0x00000001, 0x00000100, 0),
+    (0xB, 1): (0x00000005, 0x00000001, 0x00000201, 0),
+}
+
+#: "/proc/cpuinfo" recorded on the same machine (First processor block)
+RECORDED_CPUINFO = """processor\t: 0
+vendor_id\t: GenuineIntel
+cpu family\t: 6
+model\t\t: 207
+model name\t: Intel(R) Xeon(R) Processor
+stepping\t: 2
+flags\t\t: fpu vme de pse tsc msr pae mce cx8 apic sep mtrr pge mca cmov pat pse36 \
+clflush mmx fxsr sse sse2 ss syscall nx pdpe1gb rdtscp lm constant_tsc rep_good nopl \
+xtopology nonstop_tsc cpuid tsc_known_freq pni pclmulqdq ssse3 fma cx16 pcid sse4_1 \
+sse4_2 x2apic movbe popcnt tsc_deadline_timer aes xsave avx f16c rdrand hypervisor \
+lahf_lm abm 3dnowprefetch cpuid_fault ssbd ibrs ibpb stibp ibrs_enhanced fsgsbase \
+tsc_adjust bmi1 avx2 smep bmi2 erms invpcid avx512f avx512dq rdseed adx smap \
+avx512ifma clflushopt clwb avx512cd sha_ni avx512bw avx512vl xsaveopt xsavec xgetbv1 \
+xsaves avx_vnni avx512_bf16 wbnoinvd arat avx512vbmi umip pku ospke avx512_vbmi2 gfni \
+vaes vpclmulqdq avx512_vnni avx512_bitalg avx512_vpopcntdq rdpid bus_lock_detect \
+cldemote movdiri movdir64b fsrm md_clear serialize tsxldtrk ibt amx_bf16 avx512_fp16 \
+amx_tile amx_int8 flush_l1d arch_capabilities
+clflush size\t: 64
+
+processor\t: 1
+vendor_id\t: GenuineIntel
+"""
+
+#: Features that the Linux kernel may not report in "/proc/cpuinfo" flags
+KERNEL_HIDDEN_FEATURES = {"LA57", "PREFETCHWT1", "HLE", "RTM", "MPX", "PCOMMIT"}
+
 
 def tests_processor_nocpu():
     """Tests Processor methods that don't need a real x86_32 CPU"""
@@ -12,8 +62,8 @@ def tests_processor_nocpu():
     flags = 0b10000000000000000000000000000001
 
     registers = {
-        0: {"ebx": encoded, "ecx": encoded, "edx": encoded},
-        1: {"ecx": flags, "edx": flags},
+        0: {"eax": 1, "ebx": encoded, "ecx": encoded, "edx": encoded},
+        1: {"eax": flags, "ebx": flags, "ecx": flags, "edx": flags},
         7: {"ebx": flags, "ecx": flags, "edx": flags},
         0x80000000: {"eax": flags, "ebx": flags, "ecx": flags, "edx": flags},
         0x80000001: {"eax": flags, "ebx": flags, "ecx": flags, "edx": flags},
@@ -25,33 +75,22 @@ def tests_processor_nocpu():
     class Cpuid(x86_32.Cpuid):
         """Dummy CPUID function"""
 
-        def __init__(self, eax=0, ecx=None):
-            self._eax = eax
-            self._ecx = ecx
-
-        @property
-        def eax(self):
-            """EAX"""
-            return registers[self._eax]["eax"]
-
-        @property
-        def ebx(self):
-            """EAX"""
-            return registers[self._eax]["ebx"]
-
-        @property
-        def ecx(self):
-            """EAX"""
-            return registers[self._eax]["ecx"]
-
-        @property
-        def edx(self):
-            """EAX"""
-            return registers[self._eax]["edx"]
+        @staticmethod
+        def _execute(leaves):
+            """Get registers values from dummy registers"""
+            return [
+                registers[eax].get(reg, 0)
+                for eax, _ in leaves
+                for reg in ("eax", "ebx", "ecx", "edx")
+            ]
 
     x86_cpuid = x86_32.Cpuid
+    x86_cpuid_function = x86_32._cpuid_function
     x86_32.Cpuid = Cpuid
 
+    # Persistent cache is only used without JIT compiled CPUID function
+    x86_32._cpuid_function = lambda: None
+
     try:
 
         # Tests registers_to_str
@@ -118,8 +157,95 @@ def tests_processor_nocpu():
         processor["features"].update(("XSAVE", "OSXSAVE"))
         assert processor.os_supports_xsave is True
 
+        # Test fingerprint
+        fingerprint = processor.fingerprint
+        assert fingerprint.startswith(
+            "00000001" + "74736554" * 3 + "80000001" "00000001" "80000001" "80000001-"
+        )
+        assert Processor().fingerprint == ""
+
+        # Test persistent cache: Next process with same fingerprint use cached values
+        registers[7]["ebx"] = 0
+        processor = Processor(current_machine=True)
+        assert processor.fingerprint == fingerprint
+        assert "AVX512VL" in processor.features
+
+        # Test persistent cache: Invalidated if fingerprint changes
+        registers[1]["ecx"] = 0
+        processor = Processor(current_machine=True)
+        assert processor.fingerprint != fingerprint
+        assert "AVX512VL" not in processor.features
+
+        # Test persistent cache: Not used with JIT compiled CPUID function
+        x86_32._cpuid_function = lambda: Cpuid._execute
+        registers[7]["ebx"] = flags
+        processor = Processor(current_machine=True)
+        assert "AVX512VL" in processor.features
+        assert processor._get_persistent_cache() == {}
+
     finally:
         x86_32.Cpuid = x86_cpuid
+        x86_32._cpuid_function = x86_cpuid_function
+
+
+def tests_cpuid_bytecode():
+    """Tests CPUID function machine code"""
+    from compilertools.processors.x86_32 import _cpuid_bytecode
+
+    loop_64 = (
+        b"\x4d\x85\xc9"  # TEST r9, r9
+        b"\x74\x21"  # JZ +33
+        b"\x41\x8b\x00"  # MOV eax, [r8]
+        b"\x41\x8b\x48\x04"  # MOV ecx, [r8+4]
+        b"\x0f\xa2"  # CPUID
+        b"\x41\x89\x00"  # MOV [r8], eax
+        b"\x41\x89\x58\x04"  # MOV [r8+4], ebx
+        b"\x41\x89\x48\x08"  # MOV [r8+8], ecx
+        b"\x41\x89\x50\x0c"  # MOV [r8+12], edx
+        b"\x49\x83\xc0\x10"  # ADD r8, 16
+        b"\x49\xff\xc9"  # DEC r9
+        b"\xeb\xda"  # JMP -38
+        b"\x5b"  # POP rbx
+        b"\xc3"  # RET
+    )
+
+    # x86-64 System V
+    prologue = (
+        b"\x53"  # PUSH rbx
+        b"\x49\x89\xf8"  # MOV r8, rdi
+        b"\x49\x89\xf1"  # MOV r9, rsi
+    )
+    assert _cpuid_bytecode(True, False) == prologue + loop_64
+
+    # x86-64 Windows
+    prologue = (
+        b"\x53"  # PUSH rbx
+        b"\x49\x89\xc8"  # MOV r8, rcx
+        b"\x49\x89\xd1"  # MOV r9, rdx
+    )
+    assert _cpuid_bytecode(True, True) == prologue + loop_64
+
+    # x86-32
+    assert _cpuid_bytecode(False, False) == (
+        b"\x53\x56\x57"  # PUSH ebx; PUSH esi; PUSH edi
+        b"\x8b\x74\x24\x10"  # MOV esi, [esp+16]
+        b"\x8b\x7c\x24\x14"  # MOV edi, [esp+20]
+        b"\x85\xff"  # TEST edi, edi
+        b"\x74\x18"  # JZ +24
+        b"\x8b\x06"  # MOV eax, [esi]
+        b"\x8b\x4e\x04"  # MOV ecx, [esi+4]
+        b"\x0f\xa2"  # CPUID
+        b"\x89\x06"  # MOV [esi], eax
+        b"\x89\x5e\x04"  # MOV [esi+4], ebx
+        b"\x89\x4e\x08"  # MOV [esi+8], ecx
+        b"\x89\x56\x0c"  # MOV [esi+12], edx
+        b"\x83\xc6\x10"  # ADD esi, 16
+        b"\x4f"  # DEC edi
+        b"\xeb\xe4"  # JMP -28
+        b"\x5f\x5e\x5b"  # POP edi; POP esi; POP ebx
+        b"\xc3"  # RET
+    )
+    assert _cpuid_bytecode(False, True) == _cpuid_bytecode(False, False)
 
 
 def tests_cpuid_nocpu():
@@ -127,10 +253,11 @@ def tests_cpuid_nocpu():
     from pytest import raises
 
     # Initialize dummy testing environment
-    import platform
+    import sys
     import ctypes
+    from compilertools.processors import x86_32
 
-    platform_system = platform.system
+    sys_platform = sys.platform
     ctypes_cdll = ctypes.cdll
     try:
         ctypes_windll = ctypes.windll
@@ -138,20 +265,19 @@ def tests_cpuid_nocpu():
         ctypes_windll = None
     ctypes_cfunctype = ctypes.CFUNCTYPE
     ctypes_memmove = ctypes.memmove
-    ctypes_c_void_p = ctypes.c_void_p
+    cpuid_device_function = x86_32._cpuid_device_function
+
+    def no_cpuid_device():
+        """CPUID device not available"""
 
     try:
-        system = "Unix"
         mem_address = 1
-        mprotect_success = 0
+        protect_success = True
         func_result = {}
 
-        def dummy_system():
-            """Dummy platform.system"""
-            return system
-
         def dummy_generic(*_, **__):
             """Dummy generic method"""
+            func_result["freed"] = True
 
         def dummy_memmove(address, bytecode, size):
             """Dummy ctypes.memmove. Store bytecode to execute"""
@@ -164,14 +290,24 @@ def tests_cpuid_nocpu():
 
             def __new__(cls, *args, **kwargs):
                 """Dummy new"""
+                func_result["allocations"] = func_result.get("allocations", 0) + 1
                 return mem_address
 
         class DummyMprotect:
             """Dummy mprotect"""
 
-            def __call__(self, *args, **kwargs):
+            def __call__(self, address, size, flags):
                 """Dummy call"""
-                return mprotect_success
+                func_result["flags"] = flags
+                return 0 if protect_success else -1
+
+        class DummyVirtualProtect:
+            """Dummy VirtualProtect"""
+
+            def __call__(self, address, size, flags, old_flags):
+                """Dummy call"""
+                func_result["flags"] = flags
+                return protect_success
 
         class DummyCFuncType:
             """Dummy ctypes.CFUNCTYPE"""
@@ -179,12 +315,16 @@ def tests_cpuid_nocpu():
             def __init__(self, *args, **kwargs):
                 """Dummy init"""
 
-            def __call__(self, *args, **kwargs):
+            def __call__(self, address):
                 """Dummy call"""
 
-                def func(*_, **__):
-                    """Return executed bytecode"""
-                    return func_result
+                def func(buffer, count):
+                    """Fill buffer with leaf EAX value"""
+                    func_result["calls"] = func_result.get("calls", 0) + 1
+                    for index in range(count):
+                        buffer[index * 4 + 1] = buffer[index * 4] + 1
+                        buffer[index * 4 + 2] = buffer[index * 4] + 2
+                        buffer[index * 4 + 3] = buffer[index * 4] + 3
 
                 return func
 
@@ -208,69 +348,73 @@ def tests_cpuid_nocpu():
                 """Dummy ctypes.windll.kernel32"""
 
                 VirtualAlloc = DummyValloc
+                VirtualProtect = DummyVirtualProtect()
                 VirtualFree = dummy_generic
 
-        platform.system = dummy_system
         ctypes.memmove = dummy_memmove
-        ctypes.c_void_p = dummy_generic
         ctypes.CFUNCTYPE = DummyCFuncType
         ctypes.cdll = DummyCDll
         ctypes.windll = DummyWinDll
+        x86_32._cpuid_device_function = no_cpuid_device
 
         from compilertools.processors.x86_32 import Cpuid
 
-        for system in ("Unix", "Windows"):
-            # Check assembly bytecode
-            cpuid = Cpuid()
-            assert cpuid.eax["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\xc3"
-            )  # RET
-            assert cpuid.ebx["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\x89\xd8"  # MOV eax, ebx
-                b"\xc3"
-            )  # RET
-            assert cpuid.ecx["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\x89\xc8"  # MOV eax, ecx
-                b"\xc3"
-            )  # RET
-            assert cpuid.edx["bytecode"] == (
-                b"\x31\xc0"  # XOR eax, eax
-                b"\x31\xc9"  # XOR ecx, ecx
-                b"\x0f\xa2"  # CPUID
-                b"\x89\xd0"  # MOV eax, edx
-                b"\xc3"
-            )  # RET
-
-            assert Cpuid(7, 5).eax["bytecode"] == (
-                b"\xb8\x07\x00\x00\x00"  # MOV eax, 0x00000007
-                b"\xb9\x05\x00\x00\x00"  # MOV ecx, 0x00000005
-                b"\x0f\xa2"  # CPUID
-                b"\xc3"
-            )  # RET
+        for platform, flags in (("linux", 1 | 4), ("win32", 0x20)):
+            sys.platform = platform
+            x86_32._cpuid_function.cache_clear()
+            func_result.clear()
+
+            # Check single leaf
+            cpuid = Cpuid(7, 5)
+            assert cpuid.eax_value == 7
+            assert cpuid.ecx_value == 5
+            assert cpuid.eax == 7
+            assert cpuid.ebx == 8
+            assert cpuid.ecx == 9
+            assert cpuid.edx == 10
+            assert cpuid.registers == (7, 8, 9, 10)
+            assert func_result["calls"] == 1
+
+            # Check batch in one call
+            results = Cpuid.batch(((0, 0), (1, 0), (0x80000000, 0)))
+            assert [reg.eax_value for reg in results] == [0, 1, 0x80000000]
+            assert [reg.registers for reg in results] == [
+                (0, 1, 2, 3),
+                (1, 2, 3, 4),
+                (0x80000000, 0x80000001, 0x80000002, 0x80000003),
+            ]
+            assert func_result["calls"] == 2
+
+            # Check memory: Only bytecode copied, read and execute only
+            assert func_result["address"] == mem_address
+            assert func_result["size"] == len(func_result["bytecode"])
+            assert func_result["flags"] == flags
+            assert "freed" not in func_result
 
             # Test failed to allocate memory
+            x86_32._cpuid_function.cache_clear()
             mem_address = 0
+            allocations = func_result["allocations"]
             with raises(RuntimeError):
                 Cpuid().eax
             mem_address = 1
 
-        # Test failed to mprotect
-        system = "Unix"
-        mprotect_success = 1
-        with raises(RuntimeError):
-            Cpuid().eax
+            # Failure is cached: Allocation is not retried
+            with raises(RuntimeError):
+                Cpuid().eax
+            assert func_result["allocations"] == allocations + 1
+
+            # Test failed to memory protect
+            x86_32._cpuid_function.cache_clear()
+            protect_success = False
+            with raises(RuntimeError):
+                Cpuid().eax
+            assert func_result["freed"]
+            protect_success = True
 
     finally:
-        platform.system = platform_system
+        sys.platform = sys_platform
+        x86_32._cpuid_function.cache_clear()
         ctypes.cdll = ctypes_cdll
         if ctypes_windll is not None:
             ctypes.windll = ctypes_windll
@@ -278,7 +422,7 @@ def tests_cpuid_nocpu():
             del ctypes.windll
         ctypes.CFUNCTYPE = ctypes_cfunctype
         ctypes.memmove = ctypes_memmove
-        ctypes.c_void_p = ctypes_c_void_p
+        x86_32._cpuid_device_function = cpuid_device_function
 
 
 def tests_cpuid():
@@ -320,6 +464,26 @@ def tests_cpuid():
         assert cpuid.edx == ref["edx"]
 
 
+def tests_cpuid_batch():
+    """Test cpuid batch with a real x86 CPU"""
+    from compilertools.processors import get_arch
+
+    if get_arch().split("_")[0] != "x86":
+        from pytest import skip
+
+        skip("Current processor is not x86")
+
+    from compilertools.processors.x86_32 import Cpuid
+
+    leaves = ((0, 0), (0x80000000, 0), (0, 0))
+    results = Cpuid.batch(leaves)
+    assert [(reg.eax_value, reg.ecx_value) for reg in results] == list(leaves)
+    assert results[0].registers == results[2].registers == Cpuid(0).registers
+    assert Cpuid.registers_to_str(
+        results[0].ebx, results[0].edx, results[0].ecx
+    ).isalnum()
+
+
 def tests_processor():
     """Tests Processor methods that need a real x86 CPU"""
     # Check architecture and skip if not compatible
@@ -335,3 +499,517 @@ def tests_processor():
 
     processor = Processor(current_machine=True)
     assert processor.features
+
+
+def tests_processor_xcr0_nocpu():
+    """Tests Processor XSAVE state components support"""
+    from compilertools._config import CONFIG
+    from compilertools.processors import x86_32
+    from compilertools.processors.x86_32 import Processor
+
+    recorded = dict(RECORDED_CPUID)
+
+    class Cpuid(x86_32.Cpuid):
+        """Recorded CPUID function"""
+
+        @staticmethod
+        def _execute(leaves):
+            """Get registers values from recorded registers"""
+            return [reg for eax, _ in leaves for reg in recorded[eax]]
+
+    xcr0 = {"value": 0x602E7, "calls": 0}
+
+    def xgetbv(index):
+        """Dummy XGETBV"""
+        assert index == 0
+        xcr0["calls"] += 1
+        return xcr0["value"]
+
+    x86_cpuid = x86_32.Cpuid
+    x86_xgetbv_function = x86_32._xgetbv_function
+    x86_linux_xcomp_supp = x86_32._linux_xcomp_supp
+    x86_cpuid_function = x86_32._cpuid_function
+    x86_linux_features = x86_32._linux_features
+    x86_32.Cpuid = Cpuid
+    x86_32._xgetbv_function = lambda: xgetbv
+    x86_32._linux_xcomp_supp = lambda: 0x2E7
+
+    # Persistent cache is only used without JIT compiled CPUID function
+    x86_32._cpuid_function = lambda: None
+
+    try:
+        # Not current machine
+        processor = Processor()
+        assert processor.xcr0 == 0
+        assert processor.os_supports_sse is False
+        assert processor.os_supports_avx is False
+        assert processor.os_supports_avx512 is False
+        assert processor.os_supports_amx is False
+
+        # All states supported
+        processor = Processor(current_machine=True)
+        assert processor.xcr0 == 0x602E7
+        assert processor.os_supports_sse is True
+        assert processor.os_supports_avx is True
+        assert processor.os_supports_avx512 is True
+        assert processor.os_supports_amx is True
+
+        # Value from persistent cache
+        assert Processor(current_machine=True).xcr0 == 0x602E7
+        assert xcr0["calls"] == 1
+
+        # Only AVX state supported (AVX-512 disabled by OS or hypervisor)
+        for value, avx, avx512, amx in (
+            (0x7, True, False, False),
+            (0x47, True, False, False),
+            (0xE7, True, True, False),
+            (0x20007, True, False, False),
+            (0x3, False, False, False),
+        ):
+            xcr0["value"] = value
+            processor = Processor(current_machine=True)
+            processor["xcr0"] = value
+            assert processor.os_supports_sse is True
+            assert processor.os_supports_avx is avx
+            assert processor.os_supports_avx512 is avx512
+            assert processor.os_supports_amx is amx
+
+        # Linux kernel fallback
+        processor = Processor(current_machine=True)
+        processor["backend"] = "linux"
+        assert processor.xcr0 == 0x2E7
+        assert processor.os_supports_avx512 is True
+        assert processor.os_supports_amx is False
+
+        # Linux kernel fallback, without "arch_prctl(ARCH_GET_XCOMP_SUPP)"
+        x86_32._linux_xcomp_supp = lambda: 0
+        CONFIG["cache"] = False
+        for flags, value in (
+            ({"XSAVE", "OSXSAVE", "AVX", "AVX2", "AVX512F"}, 0xE7),
+            ({"XSAVE", "OSXSAVE", "AVX", "AMX_TILE"}, 0x60007),
+            ({"XSAVE", "OSXSAVE"}, 0x3),
+            ({"AVX"}, 0),
+        ):
+            x86_32._linux_features = lambda: flags
+            processor = Processor(current_machine=True)
+            processor["backend"] = "linux"
+            assert processor.xcr0 == value
+        CONFIG["cache"] = True
+
+        # XSAVE not enabled by OS: XGETBV not executed, SSE saved with FXSAVE
+        recorded[1] = (
+            recorded[1][0],
+            recorded[1][1],
+            recorded[1][2] & ~(1 << 27),
+            recorded[1][3],
+        )
+        calls = xcr0["calls"]
+        processor = Processor(current_machine=True)
+        assert processor.os_supports_xsave is False
+        assert processor.xcr0 == 0
+        assert processor.os_supports_sse is True
+        assert processor.os_supports_avx is False
+        assert xcr0["calls"] == calls
+
+    finally:
+        x86_32.Cpuid = x86_cpuid
+        x86_32._xgetbv_function = x86_xgetbv_function
+        x86_32._linux_xcomp_supp = x86_linux_xcomp_supp
+        x86_32._cpuid_function = x86_cpuid_function
+        x86_32._linux_features = x86_linux_features
+        CONFIG["cache"] = True
+
+
+def tests_xgetbv_bytecode():
+    """Tests XGETBV function machine code"""
+    from compilertools.processors.x86_32 import _xgetbv_bytecode
+
+    xgetbv = b"\x0f\x01\xd0"
+    assert _xgetbv_bytecode(True, False) == (
+        b"\x89\xf9" + xgetbv + b"\x48\xc1\xe2\x20\x48\x09\xd0\xc3"
+    )
+    assert _xgetbv_bytecode(True, True) == (
+        xgetbv + b"\x48\xc1\xe2\x20\x48\x09\xd0\xc3"
+    )
+    assert _xgetbv_bytecode(False, False) == b"\x8b\x4c\x24\x04" + xgetbv + b"\xc3"
+
+
+def tests_processor_xcr0():
+    """Tests Processor XSAVE state components support with a real x86 CPU"""
+    from compilertools.processors import get_arch
+
+    if get_arch().split("_")[0] != "x86":
+        from pytest import skip
+
+        skip("Current processor is not x86")
+
+    from compilertools.processors.x86_32 import Processor, _linux_xcomp_supp
+
+    processor = Processor(current_machine=True)
+    if not processor.os_supports_xsave:
+        assert processor.xcr0 == 0
+        return
+
+    # x87 and SSE states are always enabled with XSAVE
+    assert processor.xcr0 & 0b11 == 0b11
+    assert processor.os_supports_sse
+    assert processor.os_supports_avx is ("AVX" in processor.features)
+
+    supported = _linux_xcomp_supp()
+    if supported:
+        assert supported == processor.xcr0
+
+
+def tests_processor_linux_nocpu():
+    """Tests Processor Linux kernel backend against recorded CPUID results"""
+    from compilertools.processors import x86_32
+    from compilertools.processors.x86_32 import Processor, _parse_cpuinfo
+
+    recorded = {(eax, 0): registers for eax, registers in RECORDED_CPUID.items()}
+    recorded.update(RECORDED_CPUID_SUBLEAVES)
+
+    class Cpuid(x86_32.Cpuid):
+        """Recorded CPUID function"""
+
+        @staticmethod
+        def _execute(leaves):
+            """Get registers values from recorded registers"""
+            return [reg for leaf in leaves for reg in recorded[leaf]]
+
+    cpuinfo = _parse_cpuinfo(RECORDED_CPUINFO)
+    assert cpuinfo["vendor_id"] == "GenuineIntel"
+    assert cpuinfo["model"] == "207"
+    assert cpuinfo["flags"].startswith("fpu vme ")
+
+    x86_cpuid = x86_32.Cpuid
+    x86_linux_cpuinfo = x86_32._linux_cpuinfo
+    x86_linux_getauxval = x86_32._linux_getauxval
+    x86_cpuid_function = x86_32._cpuid_function
+    x86_cpuid_device_function = x86_32._cpuid_device_function
+    x86_32.Cpuid = Cpuid
+    x86_32._linux_cpuinfo = lambda: cpuinfo
+    hwcaps = {x86_32._AT_HWCAP: RECORDED_CPUID[1][3], x86_32._AT_HWCAP2: 0b10}
+    x86_32._linux_getauxval = hwcaps.__getitem__
+
+    try:
+        # Cross-check backends
+        reference = Processor(current_machine=True)
+        assert reference.backend == "cpuid"
+
+        processor = Processor(current_machine=True)
+        processor["backend"] = "linux"
+        assert processor.cpuid_highest_extended_function == 0
+        assert processor.vendor == reference.vendor == "GenuineIntel"
+        assert processor.brand == reference.brand == "Intel(R) Xeon(R) Processor"
+        assert processor.os_supports_xsave is reference.os_supports_xsave is True
+        assert processor.features <= reference.features
+        assert reference.features - processor.features <= KERNEL_HIDDEN_FEATURES
+        assert {"AVX512F", "FSGSBASE", "SSE3", "LAHF_LM"} <= processor.features
+        assert {"AVX512_BF16", "AVX512_FP16", "AMX_TILE"} <= reference.features
+        assert processor.fingerprint != reference.fingerprint
+
+        # Test "getauxval" fallback
+        x86_32._linux_cpuinfo = dict
+        processor = Processor(current_machine=True)
+        processor["backend"] = "linux"
+        assert processor.vendor == ""
+        assert processor.brand == ""
+        assert processor.os_supports_xsave is False
+        assert processor.features == {
+            reg
+            for bit, reg in x86_32._FEATURE_BITS[(1, 0)]["edx"].items()
+            if (1 << bit) & RECORDED_CPUID[1][3]
+        } | {"FSGSBASE"}
+
+        # Test backend selection
+        x86_32.Cpuid = x86_cpuid
+
+        def no_cpuid():
+            """CPUID not available"""
+
+        x86_32._cpuid_function = no_cpuid
+        x86_32._cpuid_device_function = no_cpuid
+        assert Processor(current_machine=True).backend == "linux"
+        assert Processor().backend is None
+
+    finally:
+        x86_32.Cpuid = x86_cpuid
+        x86_32._linux_cpuinfo = x86_linux_cpuinfo
+        x86_32._linux_getauxval = x86_linux_getauxval
+        x86_32._cpuid_function = x86_cpuid_function
+        x86_32._cpuid_device_function = x86_cpuid_device_function
+
+
+def tests_processor_linux():
+    """Tests Processor Linux kernel backend with a real x86 CPU"""
+    from sys import platform
+    from compilertools.processors import get_arch
+
+    if get_arch().split("_")[0] != "x86" or not platform.startswith("linux"):
+        from pytest import skip
+
+        skip("Current processor is not x86 or current OS is not Linux")
+
+    from compilertools.processors.x86_32 import Processor
+
+    reference = Processor(current_machine=True)
+    processor = Processor(current_machine=True)
+    processor["backend"] = "linux"
+
+    assert processor.vendor == reference.vendor
+    assert processor.features <= reference.features
+    assert reference.features - processor.features <= KERNEL_HIDDEN_FEATURES
+
+
+def tests_processor_topology_nocpu():
+    """Tests Processor caches and cores"""
+    from compilertools.processors import x86_32, _core
+    from compilertools.processors.x86_32 import Processor
+
+    recorded = {(eax, 0): registers for eax, registers in RECORDED_CPUID.items()}
+    recorded.update(RECORDED_CPUID_SUBLEAVES)
+
+    class Cpuid(x86_32.Cpuid):
+        """Recorded CPUID function"""
+
+        @staticmethod
+        def _execute(leaves):
+            """Get registers values from recorded registers"""
+            return [reg for leaf in leaves for reg in recorded.get(leaf, (0,) * 4)]
+
+    x86_cpuid = x86_32.Cpuid
+    core_sysfs_caches = _core._sysfs_caches
+    core_sysfs_threads_per_core = _core._sysfs_threads_per_core
+    x86_32.Cpuid = Cpuid
+    sysfs_caches = {"L2": {"size": 1, "line_size": 1, "shared_threads": 1}}
+    _core._sysfs_caches = lambda: sysfs_caches
+    _core._sysfs_threads_per_core = lambda: 4
+
+    try:
+        # Not current machine
+        processor = Processor()
+        assert processor.cpuid_highest_function == 0
+        assert processor.caches == {}
+        assert processor.threads_per_core == 1
+
+        # Intel CPUID leaf 4 and 0xB
+        processor = Processor(current_machine=True)
+        assert processor.cpuid_highest_function == 0x20
+        assert processor.caches == {
+            "L1d": {"size": 48 << 10, "line_size": 64, "shared_threads": 1},
+            "L1i": {"size": 32 << 10, "line_size": 64, "shared_threads": 1},
+            "L2": {"size": 2 << 20, "line_size": 64, "shared_threads": 1},
+            "L3": {"size": 300 << 20, "line_size": 64, "shared_threads": 1},
+        }
+        assert processor.threads_per_core == 1
+
+        # SMT enabled
+        recorded[(0xB, 0)] = (1, 2, 0x100, 0)
+        recorded[(0x4, 2)] = (0x4143,) + recorded[(0x4, 2)][1:]
+        processor = Processor(current_machine=True)
+        processor["fingerprint"] = "smt"
+        assert processor.threads_per_core == 2
+        assert processor.caches["L2"]["shared_threads"] == 2
+
+        # AMD CPUID leaf 0x8000001D
+        recorded[(0x8000001D, 0)] = (0x4121, 0x01C0003F, 0x3F, 0)
+        recorded[(0x8000001D, 1)] = (0, 0, 0, 0)
+        processor = Processor(current_machine=True)
+        processor["fingerprint"] = "amd"
+        processor["vendor"] = "AuthenticAMD"
+        processor["features"] = {"TOPOEXT"}
+        assert processor.caches == {
+            "L1d": {"size": 32 << 10, "line_size": 64, "shared_threads": 2}
+        }
+
+        # Fallback to sysfs
+        processor = Processor(current_machine=True)
+        processor["fingerprint"] = "amd_no_topoext"
+        processor["vendor"] = "AuthenticAMD"
+        processor["features"] = set()
+        assert processor.caches == sysfs_caches
+
+        processor = Processor(current_machine=True)
+        processor["fingerprint"] = "old"
+        processor["cpuid_highest_function"] = 1
+        assert processor.caches == sysfs_caches
+        assert processor.threads_per_core == 4
+
+        processor = Processor(current_machine=True)
+        processor["fingerprint"] = "linux"
+        processor["backend"] = "linux"
+        assert processor.caches == sysfs_caches
+        assert processor.threads_per_core == 4
+
+    finally:
+        x86_32.Cpuid = x86_cpuid
+        _core._sysfs_caches = core_sysfs_caches
+        _core._sysfs_threads_per_core = core_sysfs_threads_per_core
+
+
+def tests_microarchitectures_tables():
+    """Tests microarchitectures tables consistency"""
+    from compilertools.processors.x86_32 import (
+        _FEATURE_BITS,
+        _MICROARCHITECTURES,
+        _MICROARCHITECTURES_MODELS,
+    )
+
+    known = {
+        name
+        for registers in _FEATURE_BITS.values()
+        for bits in registers.values()
+        for name in bits.values()
+    }
+    for name, (parent, features) in _MICROARCHITECTURES.items():
+        assert parent is None or parent in _MICROARCHITECTURES
+        assert features <= known, name
+
+    for models in _MICROARCHITECTURES_MODELS.values():
+        assert set(models.values()) <= set(_MICROARCHITECTURES)
+
+
+def tests_processor_microarchitecture_nocpu():
+    """Tests Processor microarchitecture identification"""
+    from compilertools.processors import x86_32
+    from compilertools.processors.x86_32 import Processor
+
+    recorded = {(eax, 0): registers for eax, registers in RECORDED_CPUID.items()}
+    recorded.update(RECORDED_CPUID_SUBLEAVES)
+
+    class Cpuid(x86_32.Cpuid):
+        """Recorded CPUID function"""
+
+        @staticmethod
+        def _execute(leaves):
+            """Get registers values from recorded registers"""
+            return [reg for leaf in leaves for reg in recorded.get(leaf, (0,) * 4)]
+
+    x86_cpuid = x86_32.Cpuid
+    x86_linux_cpuinfo = x86_32._linux_cpuinfo
+    x86_32.Cpuid = Cpuid
+    x86_32._linux_cpuinfo = lambda: x86_32._parse_cpuinfo(RECORDED_CPUINFO)
+
+    try:
+        # Not current machine
+        processor = Processor()
+        assert processor.family == processor.model == processor.stepping == 0
+        assert processor.microarchitecture == ""
+        assert processor.microarchitectures == []
+
+        # Signature
+        processor = Processor(current_machine=True)
+        assert processor.family == 6
+        assert processor.model == 0xCF
+        assert processor.stepping == 2
+        assert processor.microarchitecture == "emeraldrapids"
+        assert processor.microarchitectures[:4] == [
+            "emeraldrapids",
+            "sapphirerapids",
+            "icelake-server",
+            "icelake-client",
+        ]
+        assert processor.microarchitectures[-1] == "nehalem"
+
+        processor = Processor(current_machine=True)
+        processor["backend"] = "linux"
+        assert (processor.family, processor.model, processor.stepping) == (6, 207, 2)
+
+        # Extended family (AMD Zen 3)
+        recorded[(1, 0)] = (0x00A20F10,) + recorded[(1, 0)][1:]
+        processor = Processor(current_machine=True)
+        assert processor.family == 0x19
+        assert processor.model == 0x21
+        assert processor.stepping == 0
+        processor["vendor"] = "AuthenticAMD"
+        assert processor.microarchitecture == "znver3"
+
+        # Microarchitectures from features and OS support
+        for vendor, family, model, features, avx512, expected in (
+            (
+                "GenuineIntel",
+                6,
+                0x55,
+                {"AVX512_VNNI", "AVX512_BF16"},
+                True,
+                "cooperlake",
+            ),
+            ("GenuineIntel", 6, 0x55, {"AVX512_VNNI"}, True, "cascadelake"),
+            ("GenuineIntel", 6, 0x55, set(), True, "skylake-avx512"),
+            ("GenuineIntel", 6, 0x55, set(), False, "skylake"),
+            ("GenuineIntel", 6, 0x55, {"-AVX512F"}, True, "skylake"),
+            ("GenuineIntel", 6, 0x55, {"-AVX2"}, True, "ivybridge"),
+            ("GenuineIntel", 6, 0x55, {"-SSE4_2"}, True, None),
+            ("GenuineIntel", 6, 0xFF, set(), True, None),
+            ("AuthenticAMD", 6, 0x55, set(), True, None),
+        ):
+            processor = Processor(current_machine=True)
+            processor["vendor"] = vendor
+            processor["family"] = family
+            processor["model"] = model
+            processor["os_supports_avx"] = True
+            processor["os_supports_avx512"] = avx512
+            processor["features"] = {
+                "SSSE3",
+                "SSE4_1",
+                "SSE4_2",
+                "POPCNT",
+                "CX16",
+                "AES",
+                "PCLMULQDQ",
+                "AVX",
+                "F16C",
+                "RDRAND",
+                "FSGSBASE",
+                "AVX2",
+                "BMI1",
+                "BMI2",
+                "FMA",
+                "MOVBE",
+                "ADX",
+                "RDSEED",
+                "CLFLUSHOPT",
+                "AVX512F",
+                "AVX512CD",
+                "AVX512BW",
+                "AVX512DQ",
+                "AVX512VL",
+                "CLWB",
+                "PKU",
+            } - {feature[1:] for feature in features} | features
+            assert (processor.microarchitectures or [None])[0] == expected
+
+    finally:
+        x86_32.Cpuid = x86_cpuid
+        x86_32._linux_cpuinfo = x86_linux_cpuinfo
+
+
+def tests_processor_x86_64_level():
+    """Tests Processor x86-64 psABI microarchitecture level"""
+    from compilertools.processors.x86_32 import Processor, _X86_64_LEVELS
+
+    assert Processor().x86_64_level == 0
+
+    features = set()
+    for level, required in _X86_64_LEVELS.items():
+        features |= required
+        for avx, avx512, expected in (
+            (True, True, level),
+            (True, False, min(level, 3)),
+            (False, False, min(level, 2)),
+        ):
+            processor = Processor(current_machine=True)
+            processor["features"] = set(features)
+            processor["os_supports_avx"] = avx
+            processor["os_supports_avx512"] = avx512
+            assert processor.x86_64_level == expected
+
+    # Missing LZCNT
+    processor = Processor(current_machine=True)
+    processor["features"] = features - {"ABM"}
+    processor["os_supports_avx"] = processor["os_supports_avx512"] = True
+    assert processor.x86_64_level == 2
+
+    processor = Processor(current_machine=True)
+    processor["features"] = set()
+    assert processor.x86_64_level == 0
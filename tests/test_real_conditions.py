@@ -38,6 +38,7 @@ import sys
 sys.path.extend(%s)
 
 import compilertools
+compilertools.imports.register("ctsrcex")
 import ctsrcex
 
 from os.path import basename
@@ -57,7 +58,7 @@ def _build_and_import(
 
     # This import also enable compilertools build patches
     from compilertools.build import get_build_compile_args
-    from compilertools.imports import ARCH_SUFFIXES
+    from compilertools.imports import ARCH_SUFFIXES, _init_extensions_suffixes
     from compilertools._config_build import ConfigBuild
 
     # Compile all possibilities
@@ -112,6 +113,7 @@ def _build_and_import(
             file.write(TEST_SCRIPT % str([build, getcwd()]))
 
         # Test suffixes imports
+        _init_extensions_suffixes()
         if not ARCH_SUFFIXES:
             from pytest import xfail
 
@@ -186,3 +188,95 @@ def tests_build_cython():
         source_ext=".pyx",
         source_content=PYX_SOURCE,
     )
+
+
+PGO_TRAINING_SCRIPT = """
+import sys
+sys.path.append(%r)
+
+import compilertools
+import ctsrcex
+
+from os.path import basename
+with open(%r, "at") as file:
+    file.write(basename(ctsrcex.__file__) + "\\n")
+ctsrcex.test()
+"""
+
+
+def tests_build_pgo():
+    """Test profile-guided optimization build"""
+    from distutils.core import setup, Extension
+    from distutils.sysconfig import get_config_var
+    from glob import glob
+    from os.path import dirname, join
+    from sys import executable
+    from tempfile import TemporaryDirectory
+    import compilertools
+    from compilertools.build import get_compiler
+    from compilertools.imports import ARCH_SUFFIXES, _init_extensions_suffixes
+    from compilertools._config_build import ConfigBuild
+
+    compiler = get_compiler(current_compiler=True)
+    if compiler.name not in ("gcc", "llvm") or not compiler.version:
+        from pytest import skip
+
+        skip("GCC or Clang not available")
+
+    _init_extensions_suffixes()
+    ext_suffix = get_config_var("EXT_SUFFIX")
+    # Generic and the least optimized compatible variants
+    variants = [""] + [
+        variant
+        for variant in (
+            suffix[: -len(ext_suffix)]
+            for suffix in ARCH_SUFFIXES
+            if suffix.endswith(ext_suffix)
+        )
+        if variant and "-" not in variant
+    ][-1:]
+
+    with TemporaryDirectory() as tmp:
+        source = join(tmp, "ctsrcex.c")
+        with open(source, "wt") as file:
+            file.write(C_SOURCE)
+
+        log = join(tmp, "training.log")
+        script = join(tmp, "training.py")
+        with open(script, "wt") as file:
+            file.write(
+                PGO_TRAINING_SCRIPT % (dirname(dirname(compilertools.__file__)), log)
+            )
+
+        ConfigBuild.suffixes_includes.clear()
+        ConfigBuild.suffixes_includes.update(
+            variant.lstrip(".") for variant in variants
+        )
+        ConfigBuild.pgo_training = [executable, script]
+        ConfigBuild.pgo_profile_dir = join(tmp, "pgo")
+        try:
+            setup(
+                name="ctsrcex",
+                ext_modules=[Extension("ctsrcex", [source])],
+                script_args=[
+                    "build_ext",
+                    "-t",
+                    join(tmp, "build_temp"),
+                    "-b",
+                    join(tmp, "build_exts"),
+                ],
+            )
+        finally:
+            ConfigBuild.suffixes_includes.clear()
+            ConfigBuild.pgo_training = None
+            ConfigBuild.pgo_profile_dir = None
+
+        # Each variant is trained once, with its own profile directory
+        with open(log, "rt") as file:
+            assert sorted(file.read().splitlines()) == sorted(
+                f"ctsrcex{variant}{ext_suffix}" for variant in variants
+            )
+
+        profile = join("**", "*.gcda") if compiler.name == "gcc" else "default.profdata"
+        for variant in variants:
+            assert glob(join(tmp, "pgo", f"ctsrcex{variant}", profile), recursive=True)